@@ -1,20 +1,15 @@
-import json
+import argparse
 import os
 import sys
 import uuid
 import datetime
-from supabase import create_client, Client
 
-# ── Config ──────────────────────────────────────────────
-# Read credentials from environment to avoid committing secrets
-SUPABASE_URL = os.getenv("SUPABASE_URL", "")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Missing Supabase credentials. Please set SUPABASE_URL and SUPABASE_KEY in environment.")
-    sys.exit(1)
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper"))
+from crawl_delta import SNAPSHOT_FILE, commit, read_delta, write_snapshot
+from crawl_state import CrawlState, normalize_url
+from supabase_client import get_supabase
+from table_reader import iter_table
+from tool_record import InvalidRecords, Tool, from_dict, load_tools, to_dict
 
 # ── Category mapping ───────────────────────────────────
 CATEGORIES_MAP = {
@@ -40,79 +35,226 @@ def map_category(tags: list[str]) -> str:
                 return cat
     return "other"
 
-def transform_tool(raw: dict) -> dict:
-    """Transform a crawled tool dict into a Supabase row."""
+def transform_tool(tool: Tool) -> dict:
+    """Transform a crawled Tool into a Supabase row."""
     # Tag mapping if available (scraper leaves empty currently)
-    tags = raw.get("tags", [])
-    category = map_category(tags) if tags else "other"
-    
-    # Scraper provides: name, description, url, pricing, visits, logo...
-    # DB does not have 'slug' column based on error.
-    
-    name = raw.get("name")
-    if not name: return None
+    category = map_category(tool.tags) if tool.tags else "other"
 
+    # DB does not have 'slug' column based on error.
     return {
         "id": str(uuid.uuid4()),
-        "name": name,
-        "description": raw.get("description", ""),
-        "url": raw.get("url", ""),
+        "name": tool.name,
+        "description": tool.description,
+        "url": tool.url,
         "category": category,
         "category_label": category.capitalize() if category != "3d" else "3D",
-        "tags": tags,
-        "pricing": raw.get("pricing", "free"),
-        "pricing_label": raw.get("pricing_label", "Free"),
-        "visits": raw.get("visits", "0"),
-        "rating": raw.get("rating", 0),
-        "logo": raw.get("logo", ""),
-        "is_new": raw.get("is_new", False),
-        "is_trending": raw.get("is_trending", False),
+        "tags": tool.tags,
+        "pricing": tool.pricing,
+        "pricing_label": tool.pricing_label,
+        "visits": tool.visits,
+        "visits_count": tool.visits_count,
+        "rating": tool.rating,
+        "logo": tool.logo,
+        "is_new": tool.is_new,
+        "is_trending": tool.is_trending,
         "launch_date": datetime.datetime.now().isoformat(),
     }
 
+# ── Delta mode ─────────────────────────────────────────
+# Raw fields whose change touches more than the column of the same name
+DERIVED_COLUMNS = {
+    "tags": ("tags", "category", "category_label"),
+    "visits": ("visits", "visits_count"),
+}
+# Raw fields transform_tool doesn't copy (category comes from tags, launch_date is load time)
+NOT_COPIED = {"id", "category", "category_label", "launch_date"}
+
+def changed_columns(fields: dict) -> dict:
+    """DB column patch for a {field: [old, new]} diff, computed with transform_tool."""
+    new = {k: v[1] for k, v in fields.items() if v[1] is not None}
+    row = transform_tool(from_dict({"id": "-", "name": "-", **new}))
+    columns = set()
+    for field in new:
+        if field in DERIVED_COLUMNS:
+            columns.update(DERIVED_COLUMNS[field])
+        elif field in row and field not in NOT_COPIED:
+            columns.add(field)
+    return {c: row[c] for c in sorted(columns)}
+
+def lookup_ids(supabase, urls) -> dict:
+    """normalized URL -> tool id, only for these URLs (100 per query)."""
+    found = {}
+    urls = sorted(set(u for u in urls if u))
+    for i in range(0, len(urls), 100):
+        variants = set()
+        for u in urls[i : i + 100]:
+            # As loaded, and as scripts/clean_urls.py leaves it
+            variants.update({u, u.split("?")[0].split("#")[0].rstrip("/")})
+        rows = supabase.table("tools").select("id,url").in_("url", sorted(variants)).execute().data
+        for row in rows:
+            found[normalize_url(row["url"])] = row["id"]
+    return found
+
+def apply_delta(supabase, path: str, delete_removed: bool):
+    header, ops = read_delta(path)
+    c = header["counts"]
+    print(f"🔀 Delta {os.path.basename(path)} ({header['created_at']}): "
+          f"+{c['add']} added, -{c['remove']} removed, ~{c['change']} changed")
+
+    adds, removes, changes = [], [], []
+    for op in ops:
+        {"add": adds, "remove": removes, "change": changes}[op["op"]].append(op)
+
+    # A change op whose URL moved is matched by the URL the database still has
+    urls = ([op["record"].get("url") for op in adds] + [op.get("url") for op in removes + changes]
+            + [op.get("old_url") for op in changes])
+    url_to_id = lookup_ids(supabase, urls)
+    print(f"   Matched {len(url_to_id)} of {len(set(filter(None, urls)))} URLs in the database.")
+
+    # Added records: full rows, same rules as a full load
+    rows, loaded, skipped = [], [], 0
+    state = CrawlState()
+    for op in adds:
+        t = from_dict(op["record"])
+        known_slug = state.slug_for_url(t.url)
+        if known_slug and known_slug != t.id:
+            skipped += 1
+            continue
+        row = transform_tool(t)
+        if not row["url"]:
+            continue
+        row["id"] = url_to_id.get(normalize_url(row["url"]), row["id"])
+        rows.append(row)
+        loaded.append(t)
+
+    # Changed records: only the columns that changed
+    patches, missing = [], 0
+    for op in changes:
+        tool_id = (url_to_id.get(normalize_url(op["old_url"])) if op.get("old_url") else None) \
+            or url_to_id.get(normalize_url(op.get("url")))
+        patch = changed_columns(op["fields"])
+        if not tool_id:
+            missing += 1
+        elif patch:
+            patches.append({"id": tool_id, **patch})
+
+    # Tools missing from one crawl (a failed period, a pruned page) are only
+    # deleted when asked for
+    removed_ids = sorted(
+        {url_to_id[normalize_url(op.get("url"))] for op in removes if normalize_url(op.get("url")) in url_to_id}
+    )
+    remove_ids = removed_ids if delete_removed else []
+    if removed_ids and not delete_removed:
+        print(f"   {len(removed_ids)} removed tools kept in the database (pass --delete-removed to delete them).")
+    print(f"📦 {len(rows)} rows to upsert, {len(patches)} to patch, {len(remove_ids)} to delete"
+          f"{f', {skipped} cross-source duplicates skipped' if skipped else ''}"
+          f"{f', {missing} changed tools not in the database' if missing else ''}.")
+
+    BATCH_SIZE = 100
+    errors = 0
+    for i in range(0, len(rows), BATCH_SIZE):
+        try:
+            supabase.table("tools").upsert(rows[i : i + BATCH_SIZE]).execute()
+        except Exception as e:
+            errors += 1
+            print(f"  ❌ Error upserting batch {i // BATCH_SIZE + 1}: {e}")
+    for i in range(0, len(patches), BATCH_SIZE):
+        try:
+            supabase.rpc("apply_tool_patches", {"payload": patches[i : i + BATCH_SIZE]}).execute()
+        except Exception as e:
+            errors += 1
+            print(f"  ❌ Error patching batch {i // BATCH_SIZE + 1}: {e}")
+            print("👉 Run migrations/create_apply_tool_patches.sql in the Supabase SQL Editor first.")
+    for i in range(0, len(remove_ids), BATCH_SIZE):
+        try:
+            supabase.table("tools").delete().in_("id", remove_ids[i : i + BATCH_SIZE]).execute()
+        except Exception as e:
+            errors += 1
+            print(f"  ❌ Error deleting batch {i // BATCH_SIZE + 1}: {e}")
+
+    if errors:
+        state.close()
+        print(f"\n❌ {errors} batches failed; the delta stays pending.")
+        sys.exit(1)
+    # Loaded tools join the shared crawl state (changed ones refresh their URL and last_seen)
+    state.record_many([(t.id, t.url, "taaft", to_dict(t)) for t in loaded]
+                      + [(op["id"], op.get("url"), "taaft", None) for op in changes])
+    state.close()
+    commit(header)
+    print(f"\n🎉 Done! Applied {len(rows) + len(patches) + len(remove_ids)} changes.")
+
 # ── Main ───────────────────────────────────────────────
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delta", metavar="FILE", help="Apply a crawl delta (scraper/crawl_delta.py) instead of the full file")
+    parser.add_argument("--delete-removed", action="store_true", help="With --delta: delete tools the crawl no longer lists")
+    args = parser.parse_args()
+    supabase = get_supabase()
+
+    if args.delta:
+        apply_delta(supabase, args.delta, args.delete_removed)
+        return
+
     data_file = "scraper/crawled_tools.json"
     INPUT_FILE = "scraper/crawled_tools.json"
     if not os.path.exists(data_file):
         print(f"❌ {data_file} not found.")
         sys.exit(1)
 
-    with open(data_file, "r", encoding="utf-8") as f:
-        raw_tools = json.load(f)
+    try:
+        tools = load_tools(data_file)
+    except InvalidRecords as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
-    print(f"📦 Loaded {len(raw_tools)} tools from {data_file}")
+    print(f"📦 Loaded {len(tools)} tools from {data_file}")
     
     # 1. Fetch existing URLs+IDs for correct UPSERT
     print("🔍 Fetching existing URLs map from database...")
     # We need ID to update existing rows because 'slug' column is missing
     # and we can't upsert on 'url' (no unique constraint possibly).
     # So we map URL -> ID manually.
-    existing = supabase.table("tools").select("id,url").execute()
-    url_to_id = {row["url"]: row["id"] for row in (existing.data or [])}
+    url_to_id = {normalize_url(row["url"]): row["id"] for row in iter_table(supabase, "tools", "id,url")}
     print(f"   Found {len(url_to_id)} existing tools.")
 
     # 2. Prepare batch
-    processed_rows = []
+    processed_rows, loaded = [], []
+    seen_urls = set()
+    skipped = 0
+    state = CrawlState()
     
-    for t in raw_tools:
-        url = t.get("url")
+    for t in tools:
+        url = t.url
         if not url: continue
+        norm = normalize_url(url)
+        if norm in seen_urls: continue
+
+        # Same site already known under another slug (another source/crawl) → duplicate
+        known_slug = state.slug_for_url(url)
+        if known_slug and known_slug != t.id:
+            skipped += 1
+            continue
+        # Only once kept, so a later record with the known slug still loads
+        seen_urls.add(norm)
         
         row = transform_tool(t)
-        if not row: continue
 
         # If exists, use existing ID to force update
-        if url in url_to_id:
-            row["id"] = url_to_id[url]
+        if norm in url_to_id:
+            row["id"] = url_to_id[norm]
         
         processed_rows.append(row)
+        loaded.append(t)
+
+    if skipped:
+        print(f"   Skipped {skipped} cross-source duplicates (crawl state).")
 
     print(f"📦 Processing {len(processed_rows)} tools (Updates + Inserts)...")
 
     # 3. Upsert in batches
     BATCH_SIZE = 100
     total_upserted = 0
+    failed = 0
 
     print(f"🚀 Starting upsert...")
 
@@ -123,9 +265,17 @@ def main():
             supabase.table("tools").upsert(batch).execute()
             total_upserted += len(batch)
             print(f"  ✅ Upserted batch {i // BATCH_SIZE + 1}: {len(batch)} rows")
+            # Loaded tools join the shared crawl state, so scrapers skip them too
+            state.record_many((t.id, t.url, "taaft", to_dict(t)) for t in loaded[i : i + BATCH_SIZE])
         except Exception as e:
+            failed += 1
             print(f"  ❌ Error in batch {i // BATCH_SIZE + 1}: {e}")
 
+    state.close()
+
+    # The database now matches this file: later deltas are relative to it
+    if not failed:
+        write_snapshot(tools, SNAPSHOT_FILE)
     print(f"\n🎉 Done! {total_upserted} tools processed.")
 
 if __name__ == "__main__":
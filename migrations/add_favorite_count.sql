@@ -0,0 +1,156 @@
+-- Denormalized favorite counts.
+-- Statement-level triggers on favorites apply per-tool deltas from the
+-- statement's transition tables to tools.favorite_count, so ranking by user
+-- interest is a plain indexed column instead of a count(*) join per listing.
+-- Run after favorites_schema.sql and add_visits_count.sql.
+-- Check or repair drift with scripts/reconcile_favorite_counts.py.
+
+-- 1. Column and indexes for the popular sort tuple
+alter table tools add column if not exists favorite_count integer not null default 0;
+
+create index if not exists idx_tools_favorite_count on tools (favorite_count, visits_count, id);
+create index if not exists idx_tools_category_favorite_count on tools (category, favorite_count, visits_count, id);
+
+-- 2. Trigger functions (security definer: users may favorite, but have no
+--    update rights on tools)
+create or replace function favorite_count_apply_insert()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  update tools t
+  set favorite_count = t.favorite_count + d.n
+  from (select tool_id, count(*) as n from new_rows group by tool_id) d
+  where t.id = d.tool_id;
+  return null;
+end;
+$$;
+
+create or replace function favorite_count_apply_delete()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  -- Rows of tools deleted in the same statement (on delete cascade) just don't match
+  update tools t
+  set favorite_count = greatest(t.favorite_count - d.n, 0)
+  from (select tool_id, count(*) as n from old_rows group by tool_id) d
+  where t.id = d.tool_id;
+  return null;
+end;
+$$;
+
+create or replace function favorite_count_apply_update()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  -- Net change per tool; favorites whose tool_id didn't change cancel out
+  update tools t
+  set favorite_count = greatest(t.favorite_count + d.n, 0)
+  from (
+    select tool_id, sum(n) as n
+    from (
+      select tool_id, count(*) as n from new_rows group by tool_id
+      union all
+      select tool_id, -count(*) as n from old_rows group by tool_id
+    ) delta
+    group by tool_id
+    having sum(n) <> 0
+  ) d
+  where t.id = d.tool_id;
+  return null;
+end;
+$$;
+
+create or replace function favorite_count_apply_truncate()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  update tools set favorite_count = 0 where favorite_count <> 0;
+  return null;
+end;
+$$;
+
+-- 3. Statement-level triggers (one aggregate per statement, not per row)
+drop trigger if exists favorites_count_insert on favorites;
+create trigger favorites_count_insert
+  after insert on favorites
+  referencing new table as new_rows
+  for each statement execute function favorite_count_apply_insert();
+
+drop trigger if exists favorites_count_update on favorites;
+create trigger favorites_count_update
+  after update on favorites
+  referencing old table as old_rows new table as new_rows
+  for each statement execute function favorite_count_apply_update();
+
+drop trigger if exists favorites_count_delete on favorites;
+create trigger favorites_count_delete
+  after delete on favorites
+  referencing old table as old_rows
+  for each statement execute function favorite_count_apply_delete();
+
+drop trigger if exists favorites_count_truncate on favorites;
+create trigger favorites_count_truncate
+  after truncate on favorites
+  for each statement execute function favorite_count_apply_truncate();
+
+-- 4. Bulk rebuild, for the initial backfill and drift repair.
+--    Only rows whose count differs are written; returns how many.
+create or replace function refresh_favorite_counts()
+returns integer
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  fixed integer;
+begin
+  -- Block concurrent (un)favorites so the rebuild matches a single snapshot
+  lock table favorites in share mode;
+
+  update tools t
+  set favorite_count = coalesce(f.n, 0)
+  from tools t2
+  left join (select tool_id, count(*) as n from favorites group by tool_id) f
+    on f.tool_id = t2.id
+  where t.id = t2.id
+    and t.favorite_count is distinct from coalesce(f.n, 0);
+
+  get diagnostics fixed = row_count;
+  return fixed;
+end;
+$$;
+
+-- Security definer functions are executable by PUBLIC by default, which
+-- would let anon callers run the SHARE-locking rebuild through /rpc
+revoke execute on function refresh_favorite_counts() from public, anon, authenticated;
+grant execute on function refresh_favorite_counts() to service_role;
+revoke execute on function favorite_count_apply_insert(), favorite_count_apply_delete(),
+  favorite_count_apply_update(), favorite_count_apply_truncate() from public, anon, authenticated;
+
+select refresh_favorite_counts();
+
+-- 5. list_tools(): popular = most favorited, then most visited
+--    (keep in sync with SORT_KEYS in src/lib/cursor.ts)
+create or replace function tools_sort_keys(sort text)
+returns text[]
+language sql
+immutable
+as $$
+  select case sort
+    when 'newest'  then array['launch_date', 'id']
+    when 'popular' then array['favorite_count', 'visits_count', 'id']
+    else                array['is_trending', 'rating', 'id']
+  end;
+$$;
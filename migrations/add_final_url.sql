@@ -0,0 +1,29 @@
+-- Resolved destinations of tool URLs (scraper/resolve_urls.py).
+-- final_url is where tools.url ends up after redirects, without tracking
+-- parameters; final_domain is its host without www, for dedup.
+
+alter table tools add column if not exists final_url text;
+alter table tools add column if not exists final_domain text;
+
+create index if not exists idx_tools_final_domain on tools(final_domain);
+
+-- Bulk writer for the resolver: one statement per batch of
+-- [{"id": "...", "final_url": "https://...", "final_domain": "example.com"}, ...]
+create or replace function set_final_urls(payload jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+  written integer;
+begin
+  update tools t
+  set final_url = x.final_url,
+      final_domain = x.final_domain
+  from jsonb_to_recordset(payload) as x(id uuid, final_url text, final_domain text)
+  where t.id = x.id
+    and (t.final_url, t.final_domain) is distinct from (x.final_url, x.final_domain);
+
+  get diagnostics written = row_count;
+  return written;
+end;
+$$;
@@ -0,0 +1,34 @@
+-- Self-hosted logos (scraper/logo_mirror.py).
+-- Mirrored files live in the public `logos` Storage bucket under
+-- content-addressed paths, and tools.logo is rewritten to their public URL
+-- (.../storage/v1/object/public/logos/<h[:2]>/<h>-160.webp); the original
+-- third-party URL is kept in logo_source so the mirror can revalidate it
+-- with ETags on the next run.
+
+alter table tools add column if not exists logo_source text;
+
+-- Public read bucket; the mirror job uploads with the service role key
+insert into storage.buckets (id, name, public)
+values ('logos', 'logos', true)
+on conflict (id) do nothing;
+
+-- Bulk writer for the mirror job: one statement per batch of
+-- [{"id": "...", "logo": "https://<project>.supabase.co/storage/v1/object/public/logos/..", "logo_source": "https://..."}, ...]
+create or replace function set_tool_logos(payload jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+  written integer;
+begin
+  update tools t
+  set logo = x.logo,
+      logo_source = x.logo_source
+  from jsonb_to_recordset(payload) as x(id uuid, logo text, logo_source text)
+  where t.id = x.id
+    and (t.logo, t.logo_source) is distinct from (x.logo, x.logo_source);
+
+  get diagnostics written = row_count;
+  return written;
+end;
+$$;
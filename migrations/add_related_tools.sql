@@ -0,0 +1,29 @@
+-- Precomputed related tools.
+-- scripts/build_related_tools.py computes TF-IDF nearest neighbours offline
+-- and stores them, best first, in tools.related_tool_ids. A tool page then
+-- loads its related tools by primary key instead of re-ranking its category
+-- on every view.
+
+-- 1. Column (empty until the job has run; getRelatedTools falls back to the category)
+alter table tools add column if not exists related_tool_ids uuid[] not null default '{}';
+
+-- 2. Bulk writer for the job: one statement per batch of
+--    [{"id": "...", "related": ["...", ...]}, ...]
+--    Security invoker, so only the service role can actually update rows.
+create or replace function set_related_tools(payload jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+  written integer;
+begin
+  update tools t
+  set related_tool_ids = x.related
+  from jsonb_to_recordset(payload) as x(id uuid, related uuid[])
+  where t.id = x.id
+    and t.related_tool_ids is distinct from x.related;
+
+  get diagnostics written = row_count;
+  return written;
+end;
+$$;
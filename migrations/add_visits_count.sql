@@ -0,0 +1,28 @@
+-- Numeric popularity.
+-- `visits` is display text in whatever format the source used ("10.5K",
+-- "48k", "205,308"), so it can't be sorted or range-filtered. visits_count
+-- holds the parsed integer (scraper/visits.py parses it at ingest time);
+-- the "popular" listing sorts by it instead of rating.
+-- Backfill existing rows with scripts/backfill_visits_count.py.
+
+-- 1. Column
+alter table tools add column if not exists visits_count bigint not null default 0;
+
+-- 2. Indexes for the popular sort tuple (visits_count, id), with and without
+--    the category prefix; also serve visits_count range filters
+create index if not exists idx_tools_visits_count on tools (visits_count, id);
+create index if not exists idx_tools_category_visits_count on tools (category, visits_count, id);
+
+-- 3. list_tools(): popular now pages by (visits_count, id)
+--    (keep in sync with SORT_KEYS in src/lib/cursor.ts)
+create or replace function tools_sort_keys(sort text)
+returns text[]
+language sql
+immutable
+as $$
+  select case sort
+    when 'newest'  then array['launch_date', 'id']
+    when 'popular' then array['visits_count', 'id']
+    else                array['is_trending', 'rating', 'id']
+  end;
+$$;
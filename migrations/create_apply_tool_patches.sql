@@ -0,0 +1,37 @@
+-- Partial row updates for crawl deltas (convert_data.py --delta).
+-- Each element carries the tool id plus only the columns that changed, e.g.
+-- [{"id": "...", "visits": "2 k", "visits_count": 2000}, {"id": "...", "tags": [...], "category": "image", ...}]
+-- Columns missing from an element keep their current value. One statement
+-- per batch; PostgREST upserts can't do this because inserts need every
+-- NOT NULL column.
+
+create or replace function apply_tool_patches(payload jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+  written integer;
+begin
+  update tools t
+  set name           = case when x.p ? 'name'           then x.p->>'name'                   else t.name end,
+      description    = case when x.p ? 'description'    then x.p->>'description'            else t.description end,
+      url            = case when x.p ? 'url'            then x.p->>'url'                    else t.url end,
+      category       = case when x.p ? 'category'       then x.p->>'category'               else t.category end,
+      category_label = case when x.p ? 'category_label' then x.p->>'category_label'         else t.category_label end,
+      tags           = case when x.p ? 'tags'
+                            then array(select jsonb_array_elements_text(x.p->'tags'))      else t.tags end,
+      pricing        = case when x.p ? 'pricing'        then x.p->>'pricing'                else t.pricing end,
+      pricing_label  = case when x.p ? 'pricing_label'  then x.p->>'pricing_label'          else t.pricing_label end,
+      visits         = case when x.p ? 'visits'         then x.p->>'visits'                 else t.visits end,
+      visits_count   = case when x.p ? 'visits_count'   then (x.p->>'visits_count')::bigint else t.visits_count end,
+      rating         = case when x.p ? 'rating'         then (x.p->>'rating')::real         else t.rating end,
+      logo           = case when x.p ? 'logo'           then x.p->>'logo'                   else t.logo end,
+      is_new         = case when x.p ? 'is_new'         then (x.p->>'is_new')::boolean      else t.is_new end,
+      is_trending    = case when x.p ? 'is_trending'    then (x.p->>'is_trending')::boolean else t.is_trending end
+  from jsonb_array_elements(payload) as x(p)
+  where t.id = (x.p->>'id')::uuid;
+
+  get diagnostics written = row_count;
+  return written;
+end;
+$$;
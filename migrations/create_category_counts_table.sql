@@ -0,0 +1,151 @@
+-- Materialized tool counts per category.
+-- Statement-level triggers on tools apply per-category deltas from the
+-- statement's transition tables, so get_category_counts() reads one row per
+-- category instead of grouping the whole tools table on every sidebar render.
+-- Run after create_get_category_counts.sql (this replaces that function body).
+
+-- 1. Summary table
+create table if not exists category_counts (
+  category text primary key,
+  count    bigint not null default 0
+);
+
+alter table category_counts enable row level security;
+
+drop policy if exists "Public can read category counts" on category_counts;
+create policy "Public can read category counts"
+  on category_counts for select
+  using (true);
+
+-- 2. Trigger functions (security definer: writes bypass RLS whoever edits tools)
+create or replace function category_counts_apply_insert()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  insert into category_counts (category, count)
+  select category, count(*) from new_rows group by category
+  on conflict (category) do update
+    set count = category_counts.count + excluded.count;
+  return null;
+end;
+$$;
+
+create or replace function category_counts_apply_delete()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  update category_counts c
+  set count = c.count - d.n
+  from (select category, count(*) as n from old_rows group by category) d
+  where c.category = d.category;
+
+  delete from category_counts where count <= 0;
+  return null;
+end;
+$$;
+
+create or replace function category_counts_apply_update()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  -- Net change per category; rows whose category didn't change cancel out
+  insert into category_counts (category, count)
+  select category, sum(n)
+  from (
+    select category, count(*) as n from new_rows group by category
+    union all
+    select category, -count(*) as n from old_rows group by category
+  ) delta
+  group by category
+  having sum(n) <> 0
+  on conflict (category) do update
+    set count = category_counts.count + excluded.count;
+
+  delete from category_counts where count <= 0;
+  return null;
+end;
+$$;
+
+create or replace function category_counts_apply_truncate()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  delete from category_counts;
+  return null;
+end;
+$$;
+
+-- 3. Statement-level triggers (one aggregate per statement, not per row)
+drop trigger if exists tools_category_counts_insert on tools;
+create trigger tools_category_counts_insert
+  after insert on tools
+  referencing new table as new_rows
+  for each statement execute function category_counts_apply_insert();
+
+drop trigger if exists tools_category_counts_update on tools;
+create trigger tools_category_counts_update
+  after update on tools
+  referencing old table as old_rows new table as new_rows
+  for each statement execute function category_counts_apply_update();
+
+drop trigger if exists tools_category_counts_delete on tools;
+create trigger tools_category_counts_delete
+  after delete on tools
+  referencing old table as old_rows
+  for each statement execute function category_counts_apply_delete();
+
+drop trigger if exists tools_category_counts_truncate on tools;
+create trigger tools_category_counts_truncate
+  after truncate on tools
+  for each statement execute function category_counts_apply_truncate();
+
+-- 4. Full rebuild, for the initial backfill and drift repair
+--    (scripts/refresh_category_counts.py)
+create or replace function refresh_category_counts()
+returns void
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  -- Block concurrent writers to tools so the rebuild matches a single snapshot
+  lock table tools in share mode;
+  lock table category_counts in exclusive mode;
+  delete from category_counts;
+  insert into category_counts (category, count)
+  select category, count(*) from tools group by category;
+end;
+$$;
+
+-- Security definer functions are executable by PUBLIC by default, which
+-- would let anon callers run the SHARE-locking recount through /rpc
+revoke execute on function refresh_category_counts() from public, anon, authenticated;
+grant execute on function refresh_category_counts() to service_role;
+revoke execute on function category_counts_apply_insert(), category_counts_apply_delete(),
+  category_counts_apply_update(), category_counts_apply_truncate() from public, anon, authenticated;
+
+select refresh_category_counts();
+
+-- 5. The sidebar RPC now reads the summary table
+create or replace function get_category_counts()
+returns table (category text, count bigint)
+language sql
+stable
+as $$
+  select category, count
+  from category_counts
+  where count > 0
+  order by count desc;
+$$;
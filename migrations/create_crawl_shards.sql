@@ -0,0 +1,129 @@
+-- Lease table for distributed crawling (scrape.py --worker, scraper/shard_merge.py).
+-- One row per listing period. Workers on any host claim a period with a
+-- time-limited lease, extend it with heartbeats while they scroll, and
+-- store the period's records in `output` when done. A lease that isn't
+-- extended expires, and the period becomes claimable again: dead workers'
+-- shards are reclaimed without anyone noticing they died.
+-- scraper/shard_leases.py implements the same protocol on SQLite for tests.
+
+create table if not exists crawl_shards (
+  id            text primary key,            -- period URL
+  label         text not null,
+  slug_hint     text not null,
+  position      integer not null default 0,  -- crawl order (newest period first)
+  status        text not null default 'pending' check (status in ('pending','leased','done','failed')),
+  worker        text,
+  lease_expires timestamptz,                 -- leased: lease end; pending: retry not before
+  attempts      integer not null default 0,
+  last_error    text,
+  output        jsonb,                       -- the period's tool records, once done
+  record_count  integer,
+  updated_at    timestamptz not null default now()
+);
+
+create index if not exists idx_crawl_shards_claim on crawl_shards(status, position);
+
+-- Service role only
+alter table crawl_shards enable row level security;
+
+-- Add periods to crawl; reset => start a fresh round (everything pending again)
+create or replace function seed_crawl_shards(payload jsonb, reset boolean default false)
+returns integer
+language plpgsql
+as $$
+declare
+  written integer;
+begin
+  insert into crawl_shards (id, label, slug_hint, position)
+  select x.url, x.label, x.slug_hint, x.position
+  from jsonb_to_recordset(payload) as x(url text, label text, slug_hint text, position integer)
+  on conflict (id) do update
+  set position      = excluded.position,
+      status        = case when reset then 'pending' else crawl_shards.status end,
+      worker        = case when reset then null else crawl_shards.worker end,
+      lease_expires = case when reset then null else crawl_shards.lease_expires end,
+      attempts      = case when reset then 0 else crawl_shards.attempts end,
+      last_error    = case when reset then null else crawl_shards.last_error end,
+      output        = case when reset then null else crawl_shards.output end,
+      record_count  = case when reset then null else crawl_shards.record_count end,
+      updated_at    = now();
+
+  get diagnostics written = row_count;
+  return written;
+end;
+$$;
+
+-- Lease the next period: pending ones whose retry time has come, or leased
+-- ones whose lease ran out. SKIP LOCKED lets concurrent workers each take
+-- a different row without waiting on each other.
+create or replace function claim_crawl_shard(worker_id text, lease_seconds integer default 300,
+                                             max_attempts integer default 3)
+returns setof crawl_shards
+language plpgsql
+as $$
+begin
+  -- Expired leases that used up their attempts are given up on, not retried
+  update crawl_shards
+  set status = 'failed', last_error = coalesce(last_error, 'lease expired'), updated_at = now()
+  where status = 'leased' and lease_expires <= now() and attempts >= max_attempts;
+
+  return query
+  update crawl_shards s
+  set status = 'leased',
+      worker = worker_id,
+      lease_expires = now() + make_interval(secs => lease_seconds),
+      attempts = s.attempts + 1,
+      updated_at = now()
+  where s.id = (
+    select c.id
+    from crawl_shards c
+    where c.attempts < max_attempts
+      and ((c.status = 'pending' and (c.lease_expires is null or c.lease_expires <= now()))
+        or (c.status = 'leased' and c.lease_expires <= now()))
+    order by c.position
+    limit 1
+    for update skip locked
+  )
+  returning s.*;
+end;
+$$;
+
+-- Extend a lease; false if it expired and someone else took the period
+create or replace function heartbeat_crawl_shard(shard_id text, worker_id text, lease_seconds integer default 300)
+returns boolean
+language plpgsql
+as $$
+begin
+  update crawl_shards
+  set lease_expires = now() + make_interval(secs => lease_seconds),
+      updated_at = now()
+  where id = shard_id and worker = worker_id and status = 'leased';
+  return found;
+end;
+$$;
+
+-- Hand a period back: with its records, or with an error (retried after
+-- retry_seconds * 2^(attempts-1), given up on after max_attempts)
+create or replace function finish_crawl_shard(shard_id text, worker_id text, records jsonb default null,
+                                              error text default null, retry_seconds integer default 30,
+                                              max_attempts integer default 3)
+returns boolean
+language plpgsql
+as $$
+begin
+  if error is null then
+    update crawl_shards
+    set status = 'done', output = coalesce(records, '[]'::jsonb),
+        record_count = jsonb_array_length(coalesce(records, '[]'::jsonb)),
+        lease_expires = null, last_error = null, updated_at = now()
+    where id = shard_id and worker = worker_id and status = 'leased';
+  else
+    update crawl_shards
+    set status = case when attempts >= max_attempts then 'failed' else 'pending' end,
+        lease_expires = now() + make_interval(secs => retry_seconds * power(2, attempts - 1)),
+        last_error = error, updated_at = now()
+    where id = shard_id and worker = worker_id and status = 'leased';
+  end if;
+  return found;
+end;
+$$;
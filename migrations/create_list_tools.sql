@@ -0,0 +1,75 @@
+-- Keyset (cursor) pagination for the tool listing.
+-- OFFSET pages get linearly slower and skip/duplicate rows when tools change
+-- mid-scroll. list_tools() instead continues strictly after the sort tuple of
+-- the last row the client saw, using a row comparison that the composite
+-- indexes below answer with a single index range scan.
+--
+-- Sort tuples (all descending, id as tie-breaker):
+--   recommended: (is_trending, rating, id)
+--   newest:      (launch_date, id)
+--   popular:     (rating, id)
+
+-- 1. Composite indexes, with and without the category prefix
+create index if not exists idx_tools_recommended on tools (is_trending, rating, id);
+create index if not exists idx_tools_newest on tools (launch_date, id);
+create index if not exists idx_tools_popular on tools (rating, id);
+create index if not exists idx_tools_category_recommended on tools (category, is_trending, rating, id);
+create index if not exists idx_tools_category_newest on tools (category, launch_date, id);
+create index if not exists idx_tools_category_popular on tools (category, rating, id);
+
+-- 2. Sort key columns per sort mode (single source for list_tools)
+create or replace function tools_sort_keys(sort text)
+returns text[]
+language sql
+immutable
+as $$
+  select case sort
+    when 'newest'  then array['launch_date', 'id']
+    when 'popular' then array['rating', 'id']
+    else                array['is_trending', 'rating', 'id']
+  end;
+$$;
+
+-- 3. One page of tools.
+--    cursor: the previous page's last row, or at least its sort key columns,
+--    as a JSON object, e.g. {"is_trending": true, "rating": 4.5, "id": "..."}.
+--    Dynamic SQL so every call is planned with its real category and bounds.
+--    Rows are returned as JSON without search_vector (create_search_tools.sql),
+--    which clients never need; it was `setof tools` before, hence the drop.
+drop function if exists list_tools(text, text, int, jsonb);
+create function list_tools(
+  sort text default 'recommended',
+  category text default null,
+  result_limit int default 20,
+  cursor jsonb default null
+)
+returns setof jsonb
+language plpgsql
+stable
+as $$
+declare
+  keys text[] := tools_sort_keys(list_tools.sort);
+  last_row tools := jsonb_populate_record(null::tools, list_tools.cursor);
+  sql text := 'select to_jsonb(t) - ''search_vector'' from tools t where true';
+begin
+  if list_tools.category is not null and list_tools.category <> 'all' then
+    sql := sql || ' and category = $1';
+  end if;
+
+  if list_tools.cursor is not null then
+    sql := sql || format(
+      ' and (%s) < (%s)',
+      array_to_string(keys, ', '),
+      (select string_agg(format('($2).%I', k), ', ') from unnest(keys) k)
+    );
+  end if;
+
+  sql := sql || format(
+    ' order by %s limit $3',
+    (select string_agg(format('%I desc', k), ', ') from unnest(keys) k)
+  );
+
+  return query execute sql
+    using list_tools.category, last_row, least(greatest(list_tools.result_limit, 1), 100);
+end;
+$$;
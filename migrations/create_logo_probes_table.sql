@@ -0,0 +1,22 @@
+-- Logo probe results (scraper/logo_probe.py).
+-- One row per tool, keyed by the tool id: the logo URL that was probed, what
+-- its header says (format, dimensions, total size) and the issues found.
+-- Written in bulk by the service role; not exposed to the public API.
+
+create table if not exists logo_probes (
+  id         uuid primary key references tools(id) on delete cascade,
+  logo       text not null default '',
+  status     int,
+  format     text,
+  width      int,
+  height     int,
+  bytes      bigint,
+  issues     text[] not null default '{}',  -- missing | tiny | oversized | mislabelled
+  checked_at timestamptz not null default now()
+);
+
+alter table logo_probes enable row level security;
+
+-- Tools whose logo needs attention
+create index if not exists idx_logo_probes_issues on logo_probes using gin (issues)
+  where issues <> '{}';
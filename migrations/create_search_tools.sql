@@ -0,0 +1,67 @@
+-- Full-text search over tools.
+-- Replaces `name.ilike.%q%,description.ilike.%q%` (a sequential scan on
+-- description) with a stored tsvector over name, tags and description, a GIN
+-- index, and a ranked, cursor-paginated search_tools() RPC.
+-- Check coverage and timings with scripts/verify_search_index.py.
+
+-- 1. pg_trgm backs idx_tools_name in supabase_schema.sql
+create extension if not exists pg_trgm;
+
+-- 2. Search document: name > tags > description.
+--    array_to_string() is only STABLE, so the wrapper is declared IMMUTABLE to
+--    be usable in a generated column (it is, for a fixed text search config).
+create or replace function tools_search_document(name text, description text, tags text[])
+returns tsvector
+language sql
+immutable
+parallel safe
+as $$
+  select setweight(to_tsvector('english', coalesce(name, '')), 'A')
+      || setweight(to_tsvector('english', coalesce(array_to_string(tags, ' '), '')), 'B')
+      || setweight(to_tsvector('english', coalesce(description, '')), 'C');
+$$;
+
+--    Internal to search: search_tools() and list_tools() strip it from their
+--    rows, and src/lib/queries.ts selects explicit columns.
+alter table tools
+  add column if not exists search_vector tsvector
+  generated always as (tools_search_document(name, description, tags)) stored;
+
+create index if not exists idx_tools_search on tools using gin (search_vector);
+
+-- 3. Ranked search.
+--    Every word is prefix-matched ("transcri" finds "transcription") and all
+--    words must match. Results are ordered by (rank desc, id); pass the
+--    previous page's last "search_rank|id" as cursor to get the next page.
+create or replace function search_tools(
+  q text,
+  category text default null,
+  result_limit int default 20,
+  cursor text default null
+)
+returns setof jsonb
+language sql
+stable
+as $$
+  with query as (
+    select to_tsquery('english', string_agg(quote_literal(w) || ':*', ' & ')) as tsq
+    from regexp_split_to_table(lower(search_tools.q), '[^[:alnum:]]+') as w
+    where w <> ''
+  ),
+  ranked as (
+    select t.*, ts_rank(t.search_vector, query.tsq) as search_rank
+    from tools t, query
+    where t.search_vector @@ query.tsq
+      and (search_tools.category is null
+           or search_tools.category = 'all'
+           or t.category = search_tools.category)
+  )
+  select to_jsonb(r) - 'search_vector'
+  from ranked r
+  where search_tools.cursor is null
+     or r.search_rank < split_part(search_tools.cursor, '|', 1)::real
+     or (r.search_rank = split_part(search_tools.cursor, '|', 1)::real
+         and r.id > split_part(search_tools.cursor, '|', 2)::uuid)
+  order by r.search_rank desc, r.id
+  limit least(greatest(search_tools.result_limit, 1), 100);
+$$;
@@ -0,0 +1,26 @@
+-- Bulk writer for OpenGraph enrichment (scraper/enrich_og.py).
+-- Each element carries the tool id plus only the columns enrich_og changed:
+-- [{"id": "...", "screenshots": ["https://..."], "social_links": {...}, "description": "..."}, ...]
+-- Columns missing from an element keep their current value, so rows other
+-- stages are updating at the same time (resolve_urls, logo_mirror,
+-- clean_urls, favorite triggers) are never written back from a stale copy.
+
+create or replace function set_og_fields(payload jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+  written integer;
+begin
+  update tools t
+  set screenshots  = case when x.p ? 'screenshots'
+                          then array(select jsonb_array_elements_text(x.p->'screenshots')) else t.screenshots end,
+      social_links = case when x.p ? 'social_links' then x.p->'social_links'           else t.social_links end,
+      description  = case when x.p ? 'description'  then x.p->>'description'           else t.description end
+  from jsonb_array_elements(payload) as x(p)
+  where t.id = (x.p->>'id')::uuid;
+
+  get diagnostics written = row_count;
+  return written;
+end;
+$$;
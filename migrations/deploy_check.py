@@ -1,18 +1,12 @@
 import os
 import sys
-from supabase import create_client, Client
 
-# Check environment variables
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Error: SUPABASE_URL and SUPABASE_KEY environment variables are required.")
-    sys.exit(1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper"))
+from supabase_client import get_supabase
 
 def main():
     print("🚀 Connecting to Supabase...")
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    supabase = get_supabase()
     
     migration_file = "migrations/create_get_category_counts.sql"
     if not os.path.exists(migration_file):
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+PickAIHub — one entry point for the scraper and maintenance scripts.
+
+Each subcommand runs one of the existing scripts with the remaining
+arguments, exactly as `python3 <script> ...` would. Only the script that is
+asked for gets imported, so playwright, aiohttp, numpy, PIL or supabase are
+loaded by the commands that use them and not by `--help` or a light command
+like `tools check`. Scripts import them after argument parsing; only
+msgspec, which the tool record format is built on, comes with every command
+that reads tool files (`tools`, even for `--help`). Supabase credentials
+come from .env.local via scraper/supabase_client.py
+(NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY).
+
+Usage:
+  python3 pickaihub.py                          # list commands
+  python3 pickaihub.py crawl --headless
+  python3 pickaihub.py tools check scraper/crawled_tools.json
+  python3 pickaihub.py upsert --delta scraper/crawl_delta.jsonl
+  python3 pickaihub.py pipeline --dry-run
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (script, run from the repo root?, description). Scripts that open
+# hardcoded paths like "scraper/crawled_tools.json" run from the repo root,
+# the rest in the caller's directory so relative arguments keep working.
+COMMANDS = {
+    # Crawl
+    "crawl":            ("scraper/scrape.py", False, "Crawl the TAAFT listing periods (--seed/--worker: sharded)"),
+    "merge-shards":     ("scraper/shard_merge.py", False, "Merge a sharded crawl into crawled_tools.json"),
+    "crawl-feed":       ("scraper/taaft_scraper.py", True, "Scrape the TAAFT homepage feed into ai_tools_data.json"),
+    "dedupe":           ("scraper/near_dupes.py", False, "Find (and --auto-merge) near-duplicate tools"),
+    "delta":            ("scraper/crawl_delta.py", False, "Diff the crawl against the last loaded snapshot"),
+    "tools":            ("scraper/tool_record.py", False, "check / upgrade / bench tool record files"),
+    "bench-parsers":    ("scraper/bench_parsers.py", False, "Benchmark the card parser backends"),
+    # Clean up
+    "visual-scan":      ("scraper/scan_all_visuals.py", True, "Flag placeholder logos (SVG fingerprints, phash)"),
+    "svg-fingerprint":  ("scraper/svg_fingerprint.py", False, "show / add / scan placeholder SVG fingerprints"),
+    "check-logos":      ("scraper/check_logos.py", True, "Flag logos shared by many tools"),
+    "cleanup":          ("scraper/cleanup_bad_tools.py", True, "Remove flagged tools from the JSON and Supabase"),
+    "remove-bad-tools": ("scraper/remove_specific_bad_tools.py", True, "Remove a fixed list of bad tools"),
+    "check-links":      ("scraper/check_tools.py", False, "Check descriptions, links and logos in Supabase"),
+    "resolve-urls":     ("scraper/resolve_urls.py", False, "Follow tool URL redirects, store final_url"),
+    # Database
+    "upsert":           ("convert_data.py", True, "Load crawled_tools.json (or --delta) into Supabase"),
+    "seed":             ("seed_supabase.py", True, "Seed the tools table from the legacy crawled_tools.json"),
+    "import-ph":        ("scraper/import_ph.py", True, "Import ai_tools_data.json into Supabase"),
+    "clean-urls":       ("scripts/clean_urls.py", False, "Strip query strings from tool URLs"),
+    "enrich-og":        ("scraper/enrich_og.py", False, "Fill screenshots, social links and short descriptions from OpenGraph tags"),
+    "logo-probe":       ("scraper/logo_probe.py", False, "Check logo format, size and dimensions"),
+    "logo-mirror":      ("scraper/logo_mirror.py", False, "Mirror logos into public/logos"),
+    "related":          ("scripts/build_related_tools.py", False, "Rebuild the related tools lists"),
+    "backfill-visits":  ("scripts/backfill_visits_count.py", False, "Backfill tools.visits_count"),
+    "favorite-counts":  ("scripts/reconcile_favorite_counts.py", False, "Rebuild or --check tools.favorite_count"),
+    "category-counts":  ("scripts/refresh_category_counts.py", False, "Rebuild or --check category_counts"),
+    "verify-search":    ("scripts/verify_search_index.py", False, "Backfill and time the search index (DATABASE_URL)"),
+    "verify-favorites": ("verify_favorites.py", False, "Check the favorites table"),
+    "migrate":          ("scripts/run_migration.py", False, "Run a SQL file through the exec_sql RPC"),
+    "test-db":          ("scripts/test_db_connection.py", False, "Check the exec_sql RPC works"),
+    "deploy-check":     ("migrations/deploy_check.py", True, "Check get_category_counts can be deployed"),
+    # Everything above, in order
+    "pipeline":         ("pipeline.py", False, "Run the out-of-date pipeline stages"),
+}
+
+
+def usage():
+    lines = ["usage: pickaihub.py COMMAND [ARGS...]", "",
+             "Runs a scraper/maintenance script; `pickaihub.py COMMAND --help` shows its options.", "",
+             "commands:"]
+    for name, (script, _, description) in COMMANDS.items():
+        lines.append(f"  {name:<18} {description}  [{script}]")
+    return "\n".join(lines)
+
+
+def run(name, args):
+    """Run a command's script as __main__ with `args` (scripts that fail call sys.exit())."""
+    script, from_root, _ = COMMANDS[name]
+    path = os.path.join(ROOT_DIR, script)
+    if from_root:
+        os.chdir(ROOT_DIR)
+    # As `python3 <script>` would: the script's directory first on the path, its args in
+    # argv, and the script as the __main__ module (so worker processes can unpickle its
+    # functions). runpy.run_path does the same but imports pkgutil and importlib.util.
+    sys.path[0] = os.path.dirname(path)
+    sys.argv = [path, *args]
+    module = type(sys)("__main__")
+    module.__file__ = path
+    module.__builtins__ = __builtins__
+    sys.modules["__main__"] = module
+    with open(path, "rb") as f:
+        code = compile(f.read(), path, "exec")
+    exec(code, module.__dict__)
+    return 0
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help", "help"):
+        print(usage())
+        return 0
+    name = sys.argv[1]
+    if name not in COMMANDS:
+        print(f"❌ Unknown command: {name}\n\n{usage()}", file=sys.stderr)
+        return 2
+    return run(name, sys.argv[2:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+PickAIHub — Data pipeline runner.
+
+Runs the scraper/cleanup/load scripts as a DAG of stages instead of a fixed
+shell sequence. Every stage declares the files it reads and writes; its
+fingerprint is a hash of its command, its script, the contents of its input
+files and the fingerprints of the stages it depends on. A stage is skipped
+when its fingerprint matches the last successful run and its outputs are
+still the files that run produced, so a re-run only redoes what changed.
+Stages that edit a shared file in place (dedupe merges records, cleanup
+drops them, visual_scan learns placeholder fingerprints) declare it as
+`rewrites`; stages that already read the file in the same run are re-keyed
+to the edited version, so the edit alone doesn't make them look dirty next
+time.
+Stages whose dependencies are done run in parallel (--jobs).
+
+  crawl ─→ dedupe ─┬→ visual_scan ─┬→ cleanup ─→ delta ─→ upsert ─┬→ clean_urls ─→ resolve_urls
+                   └→ link_check ──┘                               ├→ enrich_og ─→ related
+                                                                   ├→ logo_probe
+                                                                   └→ logo_mirror
+
+The crawl has no input files: it reruns once its last run is older than
+--crawl-max-age hours. `upsert` only applies the crawl delta (added and
+changed tools since the last load; removed tools stay in the database
+unless convert_data.py --delete-removed is run by hand). Stages after it work on
+the database, so they only rerun when the upsert (or their own script)
+changed.
+
+State is kept in scraper/pipeline_state.json, per-stage timings of every
+run are appended to scraper/pipeline_runs.jsonl.
+
+Usage:
+  python3 pipeline.py                      # run what's out of date
+  python3 pipeline.py --dry-run            # show the plan
+  python3 pipeline.py --force dedupe       # rerun a stage (and everything after it)
+  python3 pipeline.py --only crawl dedupe  # run a subset, ignoring the rest
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.join(ROOT_DIR, "scraper")
+STATE_FILE = os.path.join(SCRAPER_DIR, "pipeline_state.json")
+RUNS_FILE = os.path.join(SCRAPER_DIR, "pipeline_runs.jsonl")
+CRAWL_MAX_AGE_HOURS = 24
+
+PY = sys.executable or "python3"
+
+
+class Stage:
+    def __init__(self, name, cmd, script, cwd=ROOT_DIR, inputs=(), outputs=(), after=(), rewrites=(),
+                 max_age_hours=None):
+        self.name = name
+        self.cmd = cmd
+        self.script = script              # hashed, so editing a script reruns its stage
+        self.cwd = cwd
+        self.inputs = list(inputs)        # paths relative to ROOT_DIR
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.rewrites = list(rewrites)    # inputs edited in place (records dropped/merged)
+        self.max_age_hours = max_age_hours
+
+
+STAGES = [
+    Stage("crawl", [PY, "scrape.py", "--headless"], "scraper/scrape.py", cwd=SCRAPER_DIR,
+          outputs=["scraper/crawled_tools.json"], max_age_hours=CRAWL_MAX_AGE_HOURS),
+    Stage("dedupe", [PY, "near_dupes.py", "--auto-merge", "0.9"], "scraper/near_dupes.py", cwd=SCRAPER_DIR,
+          inputs=["scraper/crawled_tools.json"], outputs=["scraper/near_dupes.json"], after=["crawl"],
+          rewrites=["scraper/crawled_tools.json"]),
+    Stage("visual_scan", [PY, "scraper/scan_all_visuals.py"], "scraper/scan_all_visuals.py",
+          inputs=["scraper/crawled_tools.json", "scraper/svg_fingerprints.json"],
+          outputs=["scraper/bad_ids_visual.json"], after=["dedupe"],
+          rewrites=["scraper/svg_fingerprints.json"]),   # seeds/learns placeholder fingerprints
+    Stage("link_check", [PY, "resolve_urls.py", "--input", "crawled_tools.json"], "scraper/resolve_urls.py",
+          cwd=SCRAPER_DIR, inputs=["scraper/crawled_tools.json"], after=["dedupe"]),
+    # After link_check too: it reads the file cleanup rewrites
+    Stage("cleanup", [PY, "scraper/cleanup_bad_tools.py", "scraper/bad_ids_visual.json"],
+          "scraper/cleanup_bad_tools.py", inputs=["scraper/bad_ids_visual.json"], after=["visual_scan", "link_check"],
+          rewrites=["scraper/crawled_tools.json"]),
+    # Diff against the snapshot last loaded into the database; upsert applies only that
+    Stage("delta", [PY, "crawl_delta.py"], "scraper/crawl_delta.py", cwd=SCRAPER_DIR,
+          inputs=["scraper/crawled_tools.json"], outputs=["scraper/crawl_delta.jsonl"], after=["cleanup"]),
+    Stage("upsert", [PY, "convert_data.py", "--delta", "scraper/crawl_delta.jsonl"], "convert_data.py",
+          inputs=["scraper/crawl_delta.jsonl"], after=["delta"]),
+    # Database stages
+    Stage("clean_urls", [PY, "scripts/clean_urls.py"], "scripts/clean_urls.py", after=["upsert"]),
+    Stage("resolve_urls", [PY, "resolve_urls.py"], "scraper/resolve_urls.py", cwd=SCRAPER_DIR,
+          after=["clean_urls"]),
+    Stage("enrich_og", [PY, "enrich_og.py"], "scraper/enrich_og.py", cwd=SCRAPER_DIR, after=["upsert"]),
+    Stage("logo_probe", [PY, "logo_probe.py"], "scraper/logo_probe.py", cwd=SCRAPER_DIR, after=["upsert"]),
+    Stage("logo_mirror", [PY, "logo_mirror.py"], "scraper/logo_mirror.py", cwd=SCRAPER_DIR, after=["upsert"]),
+    Stage("related", [PY, "scripts/build_related_tools.py"], "scripts/build_related_tools.py",
+          after=["enrich_og"]),
+]
+
+
+# ── Fingerprints ───────────────────────────────────────────
+def file_hash(rel):
+    path = os.path.join(ROOT_DIR, rel)
+    if not os.path.exists(path):
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def stage_key(stage, dep_keys):
+    """Fingerprint of everything a stage's result depends on."""
+    parts = {
+        "cmd": stage.cmd[1:],   # not the interpreter path
+        "script": file_hash(stage.script),
+        "inputs": {p: file_hash(p) for p in stage.inputs},
+        "after": {d: dep_keys.get(d) for d in stage.after},
+    }
+    return hashlib.blake2b(json.dumps(parts, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+def is_fresh(stage, key, record):
+    """True if the last successful run had this key and its outputs are untouched."""
+    if not record or record.get("key") != key:
+        return False
+    if any(file_hash(p) != record.get("outputs", {}).get(p) for p in stage.outputs):
+        return False
+    if stage.max_age_hours is not None:
+        return time.time() - record.get("finished_at", 0) < stage.max_age_hours * 3600
+    return True
+
+
+def load_state():
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(state):
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, STATE_FILE)
+
+
+# ── Run ────────────────────────────────────────────────────
+def run_stage(stage):
+    """(returncode, seconds). Output goes straight to the terminal, prefixed by the banner."""
+    print(f"▶️  [{stage.name}] {' '.join(stage.cmd[1:])}", flush=True)
+    t0 = time.time()
+    rc = subprocess.call(stage.cmd, cwd=stage.cwd)
+    return rc, time.time() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=4, help="Stages to run in parallel")
+    parser.add_argument("--force", nargs="+", default=[], metavar="STAGE", help="Rerun these stages regardless")
+    parser.add_argument("--only", nargs="+", default=None, metavar="STAGE", help="Consider only these stages")
+    parser.add_argument("--crawl-max-age", type=float, default=CRAWL_MAX_AGE_HOURS, metavar="HOURS")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would run")
+    args = parser.parse_args()
+
+    stages = {s.name: s for s in STAGES}
+    for name in args.force + (args.only or []):
+        if name not in stages:
+            print(f"❌ Unknown stage '{name}'. Stages: {', '.join(stages)}")
+            sys.exit(1)
+    stages["crawl"].max_age_hours = args.crawl_max_age
+    selected = set(args.only or stages)
+
+    state = load_state()
+    keys, status, timings = {}, {}, {}
+    forced = set(args.force)
+    pending = [s for s in STAGES if s.name in selected]
+    running = {}
+    run_started = datetime.now(timezone.utc).isoformat()
+    print(f"🚀 Pipeline: {len(pending)} stages, up to {args.jobs} in parallel")
+    t_run = time.time()
+
+    def selected_deps(stage):
+        """Selected stages `stage` depends on, looking through the ones --only leaves out."""
+        found, todo = set(), list(stage.after)
+        while todo:
+            d = todo.pop()
+            if d in selected:
+                found.add(d)
+            else:
+                todo.extend(stages[d].after)
+        return found
+
+    upstream = {name: selected_deps(stages[name]) for name in selected}
+
+    def deps_done(stage):
+        return all(status.get(d) in ("done", "skipped") for d in upstream[stage.name])
+
+    def rekey(paths, names):
+        """
+        Record the current fingerprint of `names` and of every finished stage
+        reading or producing one of `paths` (plus their finished dependents),
+        in DAG order.
+        """
+        touched = set(names)
+        for st in STAGES:
+            if st.name not in touched:
+                uses = any(p in st.inputs or p in st.outputs for p in paths)
+                if not (uses or any(d in touched for d in st.after)):
+                    continue
+                if status.get(st.name) not in ("done", "skipped"):
+                    continue
+                touched.add(st.name)
+            keys[st.name] = stage_key(st, {**{d: state.get(d, {}).get("key") for d in st.after}, **keys})
+            state.setdefault(st.name, {}).update(key=keys[st.name], outputs={p: file_hash(p) for p in st.outputs})
+
+    def deps_failed(stage):
+        return any(status.get(d) in ("failed", "blocked") for d in upstream[stage.name])
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        while pending or running:
+            for stage in list(pending):
+                if deps_failed(stage):
+                    status[stage.name] = "blocked"
+                    pending.remove(stage)
+                    print(f"⛔ [{stage.name}] blocked by a failed dependency")
+                    continue
+                if not deps_done(stage):
+                    continue
+                pending.remove(stage)
+                key = stage_key(stage, {**{d: state.get(d, {}).get("key") for d in stage.after}, **keys})
+                keys[stage.name] = key
+                if any(d in forced for d in stage.after):
+                    forced.add(stage.name)   # --force cascades to everything downstream
+                if stage.name not in forced and is_fresh(stage, key, state.get(stage.name)):
+                    status[stage.name] = "skipped"
+                    print(f"⏭  [{stage.name}] up to date")
+                elif args.dry_run:
+                    status[stage.name] = "done"   # so dependents show as "would run"
+                    print(f"📋 [{stage.name}] would run")
+                else:
+                    running[pool.submit(run_stage, stage)] = stage
+
+            if not running:
+                if pending:   # remaining stages wait on something outside --only
+                    for stage in pending:
+                        status[stage.name] = "skipped"
+                    pending = []
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                rc, seconds = future.result()
+                timings[stage.name] = seconds
+                if rc == 0:
+                    status[stage.name] = "done"
+                    state[stage.name] = {"finished_at": time.time(), "seconds": round(seconds, 1)}
+                    rekey(stage.rewrites, [stage.name])
+                    save_state(state)
+                    print(f"✅ [{stage.name}] done in {seconds:.1f}s")
+                else:
+                    status[stage.name] = "failed"
+                    print(f"❌ [{stage.name}] failed (exit {rc}) after {seconds:.1f}s")
+
+    if args.dry_run:
+        return
+
+    with open(RUNS_FILE, "a", encoding="utf-8") as f:
+        for name, st in status.items():
+            f.write(json.dumps({"run": run_started, "stage": name, "status": st,
+                                "seconds": round(timings.get(name, 0), 1)}) + "\n")
+
+    print(f"\n⏱  Stage timings (total {time.time() - t_run:.1f}s):")
+    for stage in STAGES:
+        if stage.name in status:
+            secs = f"{timings[stage.name]:7.1f}s" if stage.name in timings else "       -"
+            print(f"   {stage.name:<14}{secs}  {status[stage.name]}")
+    if any(st in ("failed", "blocked") for st in status.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,6 @@
 #!/bin/bash
+# Kept for muscle memory: the stages now live in pipeline.py
+# (crawl → dedupe → visual scan / link check → cleanup → upsert → enrich),
+# which skips whatever hasn't changed since the last run.
 echo "🚀 Starting Full Repair Scrape..."
-cd scraper
-python3 scrape.py --headless
-if [ $? -eq 0 ]; then
-    echo "✅ Scrape complete. Starting migration..."
-    cd ..
-    python3 convert_data.py
-else
-    echo "❌ Scrape failed."
-    exit 1
-fi
+exec python3 "$(dirname "$0")/pipeline.py" "$@"
@@ -1,8 +1,13 @@
 import asyncio
-import json
+import os
+import sys
 from playwright.async_api import async_playwright
 import random
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper"))
+from crawl_state import slugify
+from tool_record import PRICING_LABELS, Tool, normalize_pricing, save_tools
+
 async def scrape_tools():
     async with async_playwright() as p:
         # Launch browser
@@ -72,13 +77,7 @@ async def scrape_tools():
                         url = "https://theresanaiforthat.com" + path
                 
                 # Pricing
-                pricing = "Unknown"
-                if "Free" in (await el.inner_text()):
-                    pricing = "Free"
-                elif "Paid" in (await el.inner_text()):
-                    pricing = "Paid"
-                elif "Freemium" in (await el.inner_text()):
-                    pricing = "Freemium"
+                pricing = normalize_pricing(await el.inner_text())
                 
                 # Logo
                 logo_url = ""
@@ -97,19 +96,20 @@ async def scrape_tools():
                     tag_text = await tag_el.inner_text()
                     tags.append(tag_text)
                 
-                # Construct tool object
-                tool = {
-                    "name": name,
-                    "description": description.strip(),
-                    "url": url,
-                    "pricing": pricing,
-                    "logo_url": logo_url,
-                    "tags": tags[:3] # Limit to 3 tags
-                }
-                
                 # Simple validation
-                if tool["name"] and len(tool["name"]) < 50:
-                    tools_data.append(tool)
+                if not name or len(name) >= 50:
+                    continue
+
+                tools_data.append(Tool(
+                    id=slugify(name),
+                    name=name,
+                    description=description.strip(),
+                    url=url,
+                    pricing=pricing,
+                    pricing_label=PRICING_LABELS[pricing],
+                    logo=logo_url or "",
+                    tags=tags[:3] # Limit to 3 tags
+                ))
                 
             except Exception as e:
                 # print(f"Error scraping a tool: {e}") 
@@ -118,8 +118,7 @@ async def scrape_tools():
         print(f"Scraped {len(tools_data)} tools.")
         
         # Save to JSON
-        with open("crawled_tools.json", "w", encoding="utf-8") as f:
-            json.dump(tools_data, f, ensure_ascii=False, indent=2)
+        save_tools("crawled_tools.json", tools_data)
             
         print("Saved to crawled_tools.json")
         await browser.close()
@@ -2,9 +2,10 @@ import hashlib
 import imagehash
 import io
 import requests
-import xml.etree.ElementTree as ET
 from PIL import Image
 
+from svg_fingerprint import canonical_shapes, fingerprint
+
 def analyze_svg(url):
     print(f"\nAnalyzing SVG: {url}")
     try:
@@ -16,22 +17,13 @@ def analyze_svg(url):
         print(f"  Length: {len(content)}")
         print(f"  MD5: {md5}")
         
-        # XML paths
+        # Canonical geometry (transforms, viewBox, number formatting normalised)
         try:
-            root = ET.fromstring(content)
-            # Find all path 'd' attributes
-            paths = []
-            for elem in root.iter():
-                # Remove namespace
-                tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-                if tag in ['path', 'polygon', 'rect']:
-                    d = elem.attrib.get('d')
-                    if d: paths.append(d)
-                    
-            print(f"  Found {len(paths)} paths.")
+            paths = canonical_shapes(content)
+            print(f"  Found {len(paths)} shapes.")
+            print(f"  Fingerprint: {fingerprint(content)}")
             if paths:
-                # Use first path as signature
-                print(f"  Signature Path[0]: {paths[0][:50]}...")
+                print(f"  Shape[0]: {paths[0][:50]}...")
                 return paths
         except Exception as e:
             print(f"  XML Error: {e}")
@@ -72,6 +64,7 @@ if __name__ == "__main__":
         print(f"\nCommon Paths: {len(common)}")
         if common:
             print(f"Signature Path: {list(common)[0][:100]}...")
+        print("👉 To flag a placeholder: python3 scraper/svg_fingerprint.py add URL --label \"...\"")
             
     print("\n--- PNG (Everlyn) ---")
     analyze_png(ref_png)
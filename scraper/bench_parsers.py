@@ -0,0 +1,70 @@
+"""
+Benchmark card_parser backends on a saved listing page.
+
+Replicates the cards of a saved period page (card_dump_0.html by default)
+into a multi-thousand-card document and times each installed backend.
+
+Usage:
+  python3 bench_parsers.py [--cards 5000] [--runs 3] [--page card_dump_0.html]
+"""
+
+import argparse
+import os
+import re
+import time
+
+from card_parser import BACKENDS, get_backend
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PAGE = os.path.join(SCRIPT_DIR, "card_dump_0.html")
+
+
+def build_page(path, n_cards):
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+    # Cards are top-level <li class="li ..."> blocks; split on their opening tags
+    starts = [m.start() for m in re.finditer(r'<li class="li[ "]', html)]
+    if not starts:
+        raise SystemExit(f"No cards found in {path}")
+    cards = [html[a:b] for a, b in zip(starts, starts[1:] + [html.rfind("</ul>", starts[-1])])]
+    cards = [c for c in cards if c.rstrip().endswith("</li>")] or cards
+
+    body = "".join(cards[i % len(cards)] for i in range(n_cards))
+    return f'<html><body><ul class="ai_tools">{body}</ul></body></html>'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page", default=DEFAULT_PAGE)
+    parser.add_argument("--cards", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    html = build_page(args.page, args.cards)
+    print(f"📄 Synthetic page: {args.cards:,d} cards, {len(html) / 1e6:.1f} MB\n")
+
+    results = {}
+    for name in BACKENDS:
+        try:
+            backend = get_backend(name)
+        except ImportError:
+            print(f"  {name:<11} not installed, skipped")
+            continue
+
+        best = float("inf")
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            parsed = backend.parse(html)
+            best = min(best, time.perf_counter() - t0)
+        results[name] = best
+        print(f"  {name:<11} {best:7.3f}s  ({len(parsed):,d} cards, {len(parsed) / best:,.0f} cards/s)")
+
+    if "bs4" in results:
+        print()
+        for name, t in results.items():
+            if name != "bs4":
+                print(f"  {name} is {results['bs4'] / t:.1f}x faster than bs4/html.parser")
+
+
+if __name__ == "__main__":
+    main()
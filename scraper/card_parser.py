@@ -0,0 +1,251 @@
+"""
+Card parsing backends for TAAFT listing pages.
+
+Every backend turns listing HTML (a full page or just a fragment of
+`<li>` cards) into plain dicts of raw card fields. Building the final tool
+record (pricing, visits, rating...) stays in the scraper.
+
+Backends, fastest first:
+  selectolax  — Lexbor C parser
+  lxml        — libxml2 with CSS selectors precompiled to XPath
+  bs4         — BeautifulSoup + html.parser (legacy, pure Python)
+
+`parse_cards()` is a plain module-level function so it can be shipped to a
+ProcessPoolExecutor while the browser keeps scrolling.
+"""
+
+import re
+
+BASE_URL = "https://theresanaiforthat.com"
+_SLUG_RE = re.compile(r'/ai/([^/?#]+)')
+
+# Container selectors, tried in order
+CARD_SELECTORS = ("ul.ai_tools > li", "li.li")
+
+# Per-field selectors, tried in order (first hit wins)
+NAME_SELECTORS = (".ai_link_wrap a span", ".ai_link_name")
+DESC_SELECTORS = (".short_desc", "p")
+LINK_SELECTORS = ("a.ai_link",)
+LOGO_SELECTORS = ("img.taaft_icon", "img.ai_img")
+PRICE_SELECTORS = (".price_span",)
+SAVES_SELECTORS = (".save_count",)
+
+BACKENDS = ("selectolax", "lxml", "bs4")
+
+
+def _absolute(path):
+    if path and not path.startswith("http"):
+        return f"{BASE_URL}{path}"
+    return path or ""
+
+
+def _slug(link):
+    match = _SLUG_RE.search(link or "")
+    return match.group(1) if match else ""
+
+
+def _fields(name, description, url, link, logo, task, price_text, saves_text):
+    return {
+        "slug": _slug(link),
+        "name": name or "",
+        "description": description or "",
+        "url": url or _absolute(link),
+        "logo": _absolute(logo),
+        "task": task or "",
+        "price_text": price_text or "",
+        "saves_text": saves_text or "",
+    }
+
+
+# ── selectolax ─────────────────────────────────────────────
+class SelectolaxBackend:
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    @staticmethod
+    def _first(node, selectors):
+        for sel in selectors:
+            hit = node.css_first(sel)
+            if hit is not None:
+                return hit
+        return None
+
+    def _text(self, node, selectors):
+        hit = self._first(node, selectors)
+        return hit.text(strip=True) if hit is not None else ""
+
+    def parse(self, html):
+        tree = self._parser(html)
+        cards = []
+        for sel in CARD_SELECTORS:
+            cards = tree.css(sel)
+            if cards:
+                break
+
+        results = []
+        for card in cards:
+            attrs = card.attributes
+            link = self._first(card, LINK_SELECTORS)
+            img = self._first(card, LOGO_SELECTORS)
+            logo = ""
+            if img is not None:
+                logo = img.attributes.get("src") or img.attributes.get("data-src") or ""
+            results.append(_fields(
+                self._text(card, NAME_SELECTORS) or attrs.get("data-name"),
+                self._text(card, DESC_SELECTORS),
+                attrs.get("data-url"),
+                link.attributes.get("href") if link is not None else "",
+                logo,
+                attrs.get("data-task"),
+                self._text(card, PRICE_SELECTORS),
+                self._text(card, SAVES_SELECTORS),
+            ))
+        return results
+
+
+# ── lxml ───────────────────────────────────────────────────
+class LxmlBackend:
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import html as lxml_html
+        from lxml.cssselect import CSSSelector
+        self._fromstring = lxml_html.fromstring
+        # Compile every CSS selector to XPath once, not once per card
+        compile_all = lambda sels: tuple(CSSSelector(s) for s in sels)
+        self._cards = compile_all(CARD_SELECTORS)
+        self._name = compile_all(NAME_SELECTORS)
+        self._desc = compile_all(DESC_SELECTORS)
+        self._link = compile_all(LINK_SELECTORS)
+        self._logo = compile_all(LOGO_SELECTORS)
+        self._price = compile_all(PRICE_SELECTORS)
+        self._saves = compile_all(SAVES_SELECTORS)
+
+    @staticmethod
+    def _first(node, selectors):
+        for sel in selectors:
+            hits = sel(node)
+            if hits:
+                return hits[0]
+        return None
+
+    def _text(self, node, selectors):
+        hit = self._first(node, selectors)
+        return hit.text_content().strip() if hit is not None else ""
+
+    def parse(self, html):
+        if not html.strip():
+            return []
+        tree = self._fromstring(html)
+        cards = []
+        for sel in self._cards:
+            cards = sel(tree)
+            if cards:
+                break
+
+        results = []
+        for card in cards:
+            link = self._first(card, self._link)
+            img = self._first(card, self._logo)
+            logo = ""
+            if img is not None:
+                logo = img.get("src") or img.get("data-src") or ""
+            results.append(_fields(
+                self._text(card, self._name) or card.get("data-name"),
+                self._text(card, self._desc),
+                card.get("data-url"),
+                link.get("href") if link is not None else "",
+                logo,
+                card.get("data-task"),
+                self._text(card, self._price),
+                self._text(card, self._saves),
+            ))
+        return results
+
+
+# ── BeautifulSoup (legacy) ─────────────────────────────────
+class SoupBackend:
+    name = "bs4"
+
+    def __init__(self, features="html.parser"):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+        self._features = features
+
+    @staticmethod
+    def _first(node, selectors):
+        for sel in selectors:
+            hit = node.select_one(sel)
+            if hit:
+                return hit
+        return None
+
+    def _text(self, node, selectors):
+        hit = self._first(node, selectors)
+        return hit.get_text(strip=True) if hit else ""
+
+    def parse(self, html):
+        soup = self._soup(html, self._features)
+        cards = []
+        for sel in CARD_SELECTORS:
+            cards = soup.select(sel)
+            if cards:
+                break
+
+        results = []
+        for card in cards:
+            link = self._first(card, LINK_SELECTORS)
+            img = self._first(card, LOGO_SELECTORS)
+            logo = ""
+            if img:
+                logo = img.get("src") or img.get("data-src") or ""
+            results.append(_fields(
+                self._text(card, NAME_SELECTORS) or card.get("data-name"),
+                self._text(card, DESC_SELECTORS),
+                card.get("data-url"),
+                link.get("href") if link else "",
+                logo,
+                card.get("data-task"),
+                self._text(card, PRICE_SELECTORS),
+                self._text(card, SAVES_SELECTORS),
+            ))
+        return results
+
+
+_BACKEND_CLASSES = {
+    "selectolax": SelectolaxBackend,
+    "lxml": LxmlBackend,
+    "bs4": SoupBackend,
+}
+
+# One instance per process (worker processes build their own on first use)
+_instances = {}
+
+
+def get_backend(name="auto"):
+    """Return a parser backend; "auto" picks the fastest one installed."""
+    if name in _instances:
+        return _instances[name]
+
+    candidates = BACKENDS if name == "auto" else (name,)
+    for candidate in candidates:
+        if candidate not in _BACKEND_CLASSES:
+            raise ValueError(f"Unknown parser backend: {candidate}")
+        try:
+            backend = _BACKEND_CLASSES[candidate]()
+        except ImportError:
+            if name != "auto":
+                raise
+            continue
+        _instances[name] = backend
+        return backend
+
+    raise ImportError("No HTML parser available. Run: pip install selectolax (or lxml cssselect)")
+
+
+def parse_cards(html, backend="auto"):
+    """Parse listing HTML into raw card field dicts."""
+    return get_backend(backend).parse(html)
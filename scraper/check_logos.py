@@ -4,6 +4,8 @@ import urllib.request
 import urllib.error
 from collections import defaultdict
 
+from tool_record import load_tools
+
 def fetch_head(url):
     try:
         req = urllib.request.Request(url, method='HEAD')
@@ -16,17 +18,16 @@ def fetch_head(url):
 
 def main():
     print("Loading tools...")
-    with open("scraper/crawled_tools.json", "r") as f:
-        tools = json.load(f)
+    tools = load_tools("scraper/crawled_tools.json")
     
     # Check Clever AI Humanizer first
-    clever = next((t for t in tools if t["name"] == "Clever AI Humanizer"), None)
+    clever = next((t for t in tools if t.name == "Clever AI Humanizer"), None)
     if not clever:
         print("❌ Clever AI Humanizer not found?")
         return
         
-    print(f"Checking reference logo: {clever['logo']}")
-    bad_etag, bad_len = fetch_head(clever["logo"])
+    print(f"Checking reference logo: {clever.logo}")
+    bad_etag, bad_len = fetch_head(clever.logo)
     print(f"🎯 Reference BAD Logo (Clever AI): ETag={bad_etag}, Len={bad_len}")
     
     if not bad_etag:
@@ -37,7 +38,7 @@ def main():
     bad_tools = []
     
     with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(fetch_head, t["logo"]): t for t in tools}
+        futures = {executor.submit(fetch_head, t.logo): t for t in tools}
         
         count = 0
         total = len(tools)
@@ -48,7 +49,7 @@ def main():
             try:
                 etag, clen = future.result()
                 if etag == bad_etag:
-                    bad_tools.append((t["id"], t["name"]))
+                    bad_tools.append((t.id, t.name))
                 etags[etag] += 1
             except Exception as e:
                 pass
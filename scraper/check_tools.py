@@ -1,27 +1,27 @@
 import asyncio
-import os
 import requests
-from supabase import create_client, Client
-from dotenv import load_dotenv
 
-# Load env
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env.local"))
+from supabase_client import get_supabase
+from table_reader import iter_table
+from resolve_urls import HEAD_UNSUPPORTED, RedirectCache, resolution
 
-SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-# Use service role key to have write access
-SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-if not SUPABASE_URL or not SERVICE_KEY:
-    print("❌ Error: Missing Supabase credentials")
-    exit(1)
-
-supabase: Client = create_client(SUPABASE_URL, SERVICE_KEY)
+# Redirect chains resolved by this script or resolve_urls.py, reused until the TTL runs out
+redirects = RedirectCache()
 
 def check_link(url):
     """Check if a URL is accessible"""
     if not url: return False
+    cached = redirects.get(url)
+    if cached:
+        return not cached["error"] and cached["status"] < 400
     try:
         response = requests.head(url, timeout=5, allow_redirects=True)
+        if response.status_code in HEAD_UNSUPPORTED:
+            # Some servers refuse HEAD outright: ask again with GET, as resolve_urls does
+            response = requests.get(url, timeout=5, allow_redirects=True, stream=True)
+            response.close()   # body is never read
+        chain = [[r.url, r.status_code] for r in response.history] + [[response.url, response.status_code]]
+        redirects.put_many({url: resolution(chain)})
         return response.status_code < 400
     except:
         return False
@@ -37,16 +37,16 @@ def check_image(url):
 
 def main():
     print("🔍 Starting data quality check...")
+    supabase = get_supabase()
     
-    # 1. Fetch all tools
-    response = supabase.table("tools").select("id, name, url, logo, description").execute()
-    tools = response.data
-    
-    print(f"📦 Checking {len(tools)} tools...")
+    # 1. Stream all tools (keyset pages, no PostgREST row cap)
+    tools = iter_table(supabase, "tools", "id, name, url, logo, description")
     
     issues_found = 0
+    checked = 0
     
     for tool in tools:
+        checked += 1
         updates = {}
         
         # Check 1: Description length
@@ -64,12 +64,13 @@ def main():
             
         # Check 3: Logo
         # TAAFT logos are often valid, but let's check basic format
+        # (format/dimensions/size are checked by logo_probe.py from the first few KB)
         if not tool['logo'] or not tool['logo'].startswith('http'):
             print(f"⚠️ [{tool['name']}] Invalid logo URL")
             issues_found += 1
             # Fallback: We could set a flag here or use a default logo
             
-    print(f"\n✅ Check complete. Found {issues_found} potential issues.")
+    print(f"\n✅ Check complete. Checked {checked} tools, found {issues_found} potential issues.")
 
 if __name__ == "__main__":
     main()
@@ -1,21 +1,18 @@
 import json
 import os
 import sys
-from supabase import create_client, Client
 
-SUPABASE_URL = os.getenv("SUPABASE_URL", "")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Missing Supabase credentials. Please set SUPABASE_URL and SUPABASE_KEY in environment.")
-    sys.exit(1)
+from supabase_client import get_supabase
+from tool_record import load_tools, save_tools
 
 def main():
-    if not os.path.exists("scraper/bad_ids.json"):
-        print("scraper/bad_ids.json not found")
+    # Optional path, e.g. scraper/bad_ids_visual.json from scan_all_visuals.py
+    ids_file = sys.argv[1] if len(sys.argv) > 1 else "scraper/bad_ids.json"
+    if not os.path.exists(ids_file):
+        print(f"{ids_file} not found")
         return
         
-    with open("scraper/bad_ids.json") as f:
+    with open(ids_file) as f:
         bad_ids = json.load(f)
         
     if not bad_ids:
@@ -25,18 +22,16 @@ def main():
     print(f"🗑 Removing {len(bad_ids)} tools from JSON and Supabase...")
     
     # 1. Update JSON
-    with open("scraper/crawled_tools.json") as f:
-        tools = json.load(f)
+    tools = load_tools("scraper/crawled_tools.json")
     
-    new_tools = [t for t in tools if t['id'] not in bad_ids]
+    new_tools = [t for t in tools if t.id not in bad_ids]
     removed_count = len(tools) - len(new_tools)
     
-    with open("scraper/crawled_tools.json", "w") as f:
-        json.dump(new_tools, f, indent=2)
+    save_tools("scraper/crawled_tools.json", new_tools)
     print(f"✅ Removed {removed_count} from JSON.")
     
     # 2. Delete from Supabase
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    supabase = get_supabase()
     
     for tid in bad_ids:
         try:
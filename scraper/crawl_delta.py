@@ -0,0 +1,190 @@
+"""
+Crawl Delta — what changed between the last synced crawl and this one.
+
+The last snapshot loaded into Supabase is kept as JSONL sorted by slug
+(crawl_snapshot.jsonl). The current crawled_tools.json is written the same
+way (crawl_snapshot.next.jsonl), and the two files are walked together in
+one streaming merge-join, so only one record of each side is in memory at a
+time. The result is a compact JSONL delta:
+
+  {"from": "<hash>", "to": "<hash>", "created_at": ..., "counts": {...}}   header
+  {"op": "add", "id": "slug", "record": {...}}
+  {"op": "remove", "id": "slug", "url": "..."}
+  {"op": "change", "id": "slug", "url": "...", "fields": {"visits": ["1 k", "2 k"], ...}}
+  {"op": "change", "id": "slug", "url": "<new>", "old_url": "<as loaded>", "fields": {"url": [...], ...}}
+
+Change ops whose URL moved also carry the URL the database still has
+(old_url), since tools are matched to their rows by URL.
+
+`convert_data.py --delta FILE` applies it and then calls commit(), which
+moves the next snapshot into place. Until a delta is applied the snapshot
+stays where the database is, so a newer crawl just produces a bigger delta
+instead of losing the unapplied one.
+
+Usage:
+  python3 crawl_delta.py [crawled_tools.json]     # writes crawl_delta.jsonl (+ deltas/ archive)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+# msgspec and tool_record are imported where they are used, so `--help`
+# doesn't load them
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INPUT = os.path.join(SCRIPT_DIR, "crawled_tools.json")
+SNAPSHOT_FILE = os.path.join(SCRIPT_DIR, "crawl_snapshot.jsonl")
+NEXT_SNAPSHOT_FILE = os.path.join(SCRIPT_DIR, "crawl_snapshot.next.jsonl")
+DELTA_FILE = os.path.join(SCRIPT_DIR, "crawl_delta.jsonl")
+ARCHIVE_DIR = os.path.join(SCRIPT_DIR, "deltas")
+
+# Fields that change on every crawl without the tool changing
+IGNORED_FIELDS = {"launch_date"}
+
+
+def file_hash(path):
+    if not os.path.exists(path):
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_snapshot(tools, path):
+    """Write Tools as JSONL sorted by slug (first record wins on duplicate slugs)."""
+    from tool_record import encode
+
+    seen = set()
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        for t in sorted(tools, key=lambda t: t.id):
+            if t.id in seen:
+                continue
+            seen.add(t.id)
+            f.write(encode(t, sort_keys=True) + b"\n")
+    os.replace(tmp, path)
+
+
+def iter_snapshot(path):
+    """Snapshot records as plain dicts (the diff compares them field by field)."""
+    import msgspec
+
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield msgspec.json.decode(line)
+
+
+def field_diff(old, new):
+    """{field: [old, new]} for every differing field (missing fields count as None)."""
+    return {
+        k: [old.get(k), new.get(k)]
+        for k in sorted(old.keys() | new.keys())
+        if k not in IGNORED_FIELDS and old.get(k) != new.get(k)
+    }
+
+
+def merge_join(old_records, new_records):
+    """Yield delta ops from two iterators sorted by slug."""
+    _end = object()
+    old, new = next(old_records, _end), next(new_records, _end)
+    while old is not _end or new is not _end:
+        if new is _end or (old is not _end and old["id"] < new["id"]):
+            yield {"op": "remove", "id": old["id"], "url": old.get("url")}
+            old = next(old_records, _end)
+        elif old is _end or new["id"] < old["id"]:
+            yield {"op": "add", "id": new["id"], "record": new}
+            new = next(new_records, _end)
+        else:
+            fields = field_diff(old, new)
+            if fields:
+                op = {"op": "change", "id": new["id"], "url": new.get("url"), "fields": fields}
+                if "url" in fields:
+                    op["old_url"] = old.get("url")
+                yield op
+            old, new = next(old_records, _end), next(new_records, _end)
+
+
+def build_delta(tools, delta_path=DELTA_FILE):
+    """Diff `tools` against the synced snapshot; write the delta. Returns its header."""
+    write_snapshot(tools, NEXT_SNAPSHOT_FILE)
+    counts = {"add": 0, "remove": 0, "change": 0}
+    body = f"{delta_path}.body.tmp"
+    with open(body, "w", encoding="utf-8") as f:
+        for op in merge_join(iter_snapshot(SNAPSHOT_FILE), iter_snapshot(NEXT_SNAPSHOT_FILE)):
+            counts[op["op"]] += 1
+            f.write(json.dumps(op, ensure_ascii=False) + "\n")
+
+    header = {"from": file_hash(SNAPSHOT_FILE), "to": file_hash(NEXT_SNAPSHOT_FILE),
+              "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "counts": counts}
+    tmp = f"{delta_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as out, open(body, "r", encoding="utf-8") as f:
+        out.write(json.dumps(header) + "\n")
+        for line in f:
+            out.write(line)
+    os.remove(body)
+    os.replace(tmp, delta_path)
+    return header
+
+
+def read_delta(path):
+    """(header, iterator of ops)."""
+    f = open(path, "r", encoding="utf-8")
+    header = json.loads(f.readline())
+
+    def ops():
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    return header, ops()
+
+
+def commit(header):
+    """Mark a delta as applied: the next snapshot becomes the synced one."""
+    if file_hash(NEXT_SNAPSHOT_FILE) != header["to"]:
+        print("⚠️  Snapshot moved on since this delta was built; not advancing it (re-run crawl_delta.py).")
+        return False
+    os.replace(NEXT_SNAPSHOT_FILE, SNAPSHOT_FILE)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input", nargs="?", default=DEFAULT_INPUT)
+    parser.add_argument("--output", default=DELTA_FILE)
+    args = parser.parse_args()
+    from tool_record import InvalidRecords, load_tools
+
+    try:
+        tools = load_tools(args.input)
+    except InvalidRecords as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    t0 = time.time()
+    header = build_delta(tools, args.output)
+    c = header["counts"]
+    size = os.path.getsize(args.output)
+    print(f"🔀 Delta vs last sync: +{c['add']} added, -{c['remove']} removed, ~{c['change']} changed "
+          f"({size / 1024:.1f} KB, {time.time() - t0:.1f}s)")
+
+    if any(c.values()):
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        stamp = header["created_at"].replace("-", "").replace(":", "")
+        archived = os.path.join(ARCHIVE_DIR, f"delta-{stamp}.jsonl")
+        with open(args.output, "rb") as src, open(archived, "wb") as dst:
+            dst.write(src.read())
+    print(f"💾 Saved to {os.path.relpath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
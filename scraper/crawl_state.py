@@ -0,0 +1,190 @@
+"""
+Crawl State — one persistent dedup index shared by every scraper and loader.
+
+A local SQLite database (WAL mode, so several processes can read while one
+writes) with one row per tool ever seen:
+
+  slug | norm_url | source | first_seen | last_seen | content_hash
+
+plus a `periods` table that checkpoints which listing periods scrape.py
+finished or gave up on. Lookups by slug or normalized URL are indexed, so
+dedup no longer needs each script to rebuild its own set from JSON or query
+Supabase row by row.
+
+Usage:
+  from crawl_state import CrawlState, normalize_url
+  with CrawlState() as state:
+      if not state.seen(slug=slug, url=url):
+          ...
+      state.record_many([(slug, url, "taaft", record_dict)])
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from urllib.parse import urlparse, urlunparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(SCRIPT_DIR, "crawl_state.sqlite")
+
+SCHEMA = """
+create table if not exists tools (
+  slug         text primary key,
+  norm_url     text,
+  source       text not null,
+  first_seen   real not null,
+  last_seen    real not null,
+  content_hash text
+);
+create index if not exists idx_tools_norm_url on tools(norm_url);
+
+-- Crawl checkpoint: listing periods that failed (retried first next run) or finished
+create table if not exists periods (
+  url        text primary key,
+  label      text not null,
+  slug_hint  text not null,
+  status     text not null,            -- 'failed' | 'done'
+  attempts   integer not null default 0,
+  last_error text,
+  updated_at real not null
+);
+"""
+
+
+def normalize_url(url):
+    """Canonical form for dedup: lowercase host without www, no query/fragment/trailing slash."""
+    if not url:
+        return ""
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower().removeprefix("www.")
+    scheme = parsed.scheme.lower() or "https"
+    return urlunparse((scheme, host, parsed.path, '', '', '')).rstrip('/')
+
+
+def slugify(name):
+    """Slug for sources that don't provide one (ProductHunt, homepage cards)."""
+    return re.sub(r'[^a-z0-9]+', '-', (name or "").lower()).strip('-')
+
+
+def content_hash(record):
+    """Stable hash of a record dict, used to tell changed tools from re-sightings."""
+    if record is None:
+        return None
+    blob = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CrawlState:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("pragma journal_mode=wal")
+        self.db.execute("pragma synchronous=normal")
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute("select count(*) from tools").fetchone()[0]
+
+    def seen(self, slug=None, url=None):
+        """True if a tool with this slug or normalized URL is already known."""
+        if slug and self.db.execute("select 1 from tools where slug = ?", (slug,)).fetchone():
+            return True
+        norm = normalize_url(url)
+        if norm and self.db.execute("select 1 from tools where norm_url = ?", (norm,)).fetchone():
+            return True
+        return False
+
+    def get(self, slug):
+        row = self.db.execute(
+            "select slug, norm_url, source, first_seen, last_seen, content_hash from tools where slug = ?",
+            (slug,),
+        ).fetchone()
+        if not row:
+            return None
+        return dict(zip(("slug", "norm_url", "source", "first_seen", "last_seen", "content_hash"), row))
+
+    def slug_for_url(self, url):
+        row = self.db.execute("select slug from tools where norm_url = ?", (normalize_url(url),)).fetchone()
+        return row[0] if row else None
+
+    def record_many(self, items):
+        """
+        Upsert (slug, url, source, record) tuples in one transaction.
+
+        `source` and `first_seen` keep the first sighting; `last_seen` and
+        `content_hash` follow the latest one. Returns {"new", "changed",
+        "unchanged"} counts.
+        """
+        now = time.time()
+        counts = {"new": 0, "changed": 0, "unchanged": 0}
+        with self.db:
+            for slug, url, source, record in items:
+                h = content_hash(record)
+                prev = self.db.execute("select content_hash from tools where slug = ?", (slug,)).fetchone()
+                if prev is None:
+                    counts["new"] += 1
+                elif h is not None and prev[0] != h:
+                    counts["changed"] += 1
+                else:
+                    counts["unchanged"] += 1
+                self.db.execute(
+                    "insert into tools (slug, norm_url, source, first_seen, last_seen, content_hash)"
+                    " values (?, ?, ?, ?, ?, ?)"
+                    " on conflict(slug) do update set"
+                    "   norm_url = coalesce(excluded.norm_url, tools.norm_url),"
+                    "   last_seen = excluded.last_seen,"
+                    "   content_hash = coalesce(excluded.content_hash, tools.content_hash)",
+                    (slug, normalize_url(url) or None, source, now, now, h),
+                )
+        return counts
+
+    # ── Period checkpoint ──────────────────────────────────
+    def failed_periods(self):
+        """Periods a previous run gave up on, oldest failure first."""
+        rows = self.db.execute(
+            "select url, label, slug_hint, attempts, last_error from periods"
+            " where status = 'failed' order by updated_at"
+        ).fetchall()
+        return [dict(zip(("url", "label", "slug_hint", "attempts", "last_error"), r)) for r in rows]
+
+    def period_failed(self, period, attempts, error):
+        self._set_period(period, "failed", attempts, error)
+
+    def period_done(self, period, attempts):
+        self._set_period(period, "done", attempts, None)
+
+    def _set_period(self, period, status, attempts, error):
+        with self.db:
+            self.db.execute(
+                "insert or replace into periods (url, label, slug_hint, status, attempts, last_error, updated_at)"
+                " values (?, ?, ?, ?, ?, ?, ?)",
+                (period["url"], period["label"], period["slug_hint"], status, attempts, error, time.time()),
+            )
+
+    def record(self, slug, url, source, record=None):
+        counts = self.record_many([(slug, url, source, record)])
+        return next(k for k, v in counts.items() if v)
+
+    def prune(self, source, before):
+        """
+        Forget tools first recorded by `source` and not seen since `before`.
+        A writer that re-records its output file and then prunes drops the
+        tools that file no longer holds (reset or edited by hand), so they
+        are picked up again instead of being skipped as known.
+        """
+        with self.db:
+            return self.db.execute(
+                "delete from tools where source = ? and last_seen < ?", (source, before)
+            ).rowcount
@@ -0,0 +1,262 @@
+"""
+OpenGraph Enrichment — fills screenshots / social_links for every tool.
+
+Fetches each tool homepage with one pooled aiohttp session, streams the
+response only until </head>, and extracts og:image, og:description and
+social profile links (twitter:site, <link rel="me">, JSON-LD sameAs).
+Results are cached per URL in a local SQLite file with a TTL, and only the
+changed columns are written back, in batches through set_og_fields()
+(migrations/create_set_og_fields.sql).
+
+Usage:
+  python3 scraper/enrich_og.py [--limit N] [--concurrency 50] [--ttl-days 7] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import codecs
+import json
+import os
+import sqlite3
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+from supabase_client import get_supabase
+from table_reader import iter_table
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(SCRIPT_DIR, "og_cache.sqlite")
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+MAX_HEAD_BYTES = 256 * 1024   # give up if </head> hasn't shown up by then
+FETCH_TIMEOUT = 15
+ERROR_TTL = 24 * 3600         # retry failed fetches sooner than successes
+BATCH_SIZE = 100
+# Everything enrich_og reads; it never writes back columns other stages own
+COLUMNS = "id, url, final_url, description, screenshots, social_links"
+
+# social_links keys match src/lib/types.ts
+SOCIAL_DOMAINS = {
+    "twitter.com": "twitter",
+    "x.com": "twitter",
+    "discord.gg": "discord",
+    "discord.com": "discord",
+    "linkedin.com": "linkedin",
+    "github.com": "github",
+}
+
+
+# ── Head parsing ───────────────────────────────────────────
+class HeadParser(HTMLParser):
+    """Collects OpenGraph / social metadata; `done` flips at </head> or <body>."""
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.done = False
+        self.og = {}
+        self.social = {}
+        self._in_ld_json = False
+        self._ld_chunks = []
+
+    def _add_social(self, link):
+        if not link:
+            return
+        if link.startswith("@"):
+            link = f"https://twitter.com/{link[1:]}"
+        host = urlparse(link).netloc.lower().removeprefix("www.")
+        key = SOCIAL_DOMAINS.get(host)
+        if key and key not in self.social:
+            self.social[key] = link
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+            return
+        a = dict(attrs)
+        if tag == "meta":
+            prop = (a.get("property") or a.get("name") or "").lower()
+            content = (a.get("content") or "").strip()
+            if not content:
+                return
+            if prop in ("og:image", "og:image:url", "og:image:secure_url", "twitter:image"):
+                self.og.setdefault("image", urljoin(self.base_url, content))
+            elif prop in ("og:description", "description", "twitter:description"):
+                # og:description wins over the plain meta description
+                if prop == "og:description" or "description" not in self.og:
+                    self.og["description"] = content
+            elif prop in ("twitter:site", "twitter:creator"):
+                self._add_social(content)
+        elif tag == "link" and "me" in (a.get("rel") or "").lower().split():
+            self._add_social(a.get("href"))
+        elif tag == "script" and (a.get("type") or "").lower() == "application/ld+json":
+            self._in_ld_json = True
+            self._ld_chunks = []
+
+    def handle_data(self, data):
+        if self._in_ld_json:
+            self._ld_chunks.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+        elif tag == "script" and self._in_ld_json:
+            self._in_ld_json = False
+            try:
+                ld = json.loads("".join(self._ld_chunks))
+            except ValueError:
+                return
+            for node in ld if isinstance(ld, list) else [ld]:
+                same_as = node.get("sameAs", []) if isinstance(node, dict) else []
+                for link in [same_as] if isinstance(same_as, str) else same_as:
+                    self._add_social(link)
+
+
+# ── Cache ──────────────────────────────────────────────────
+class OgCache:
+    def __init__(self, path, ttl):
+        self.ttl = ttl
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "create table if not exists og_cache ("
+            " url text primary key, fetched_at real not null, ok integer not null, data text not null)"
+        )
+
+    def get(self, url):
+        row = self.db.execute("select fetched_at, ok, data from og_cache where url = ?", (url,)).fetchone()
+        if not row:
+            return None
+        fetched_at, ok, data = row
+        if time.time() - fetched_at > (self.ttl if ok else min(self.ttl, ERROR_TTL)):
+            return None
+        return json.loads(data)
+
+    def put_many(self, results):
+        now = time.time()
+        self.db.executemany(
+            "insert or replace into og_cache (url, fetched_at, ok, data) values (?, ?, ?, ?)",
+            [(url, now, int("error" not in meta), json.dumps(meta)) for url, meta in results],
+        )
+        self.db.commit()
+
+
+# ── Fetch ──────────────────────────────────────────────────
+async def fetch_head(session, url):
+    """Stream a page until </head> and return its metadata dict."""
+    import aiohttp
+
+    try:
+        async with session.get(url, allow_redirects=True) as resp:
+            if resp.status >= 400:
+                return {"error": f"HTTP {resp.status}"}
+            if "html" not in resp.headers.get("content-type", "text/html"):
+                return {"error": "not html"}
+
+            parser = HeadParser(str(resp.url))
+            decoder = codecs.getincrementaldecoder(resp.charset or "utf-8")(errors="replace")
+            read = 0
+            async for chunk in resp.content.iter_chunked(8192):
+                read += len(chunk)
+                parser.feed(decoder.decode(chunk))
+                if parser.done or read >= MAX_HEAD_BYTES:
+                    break
+            # Leaving the context early closes the connection; the body is never downloaded
+            return {**parser.og, "social": parser.social}
+    except (aiohttp.ClientError, asyncio.TimeoutError, LookupError, ValueError) as e:
+        return {"error": str(e) or type(e).__name__}
+
+
+async def enrich_urls(urls, concurrency):
+    # Imported here, after argument parsing: `--help` doesn't load aiohttp
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=4, ttl_dns_cache=600)
+    timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+    sem = asyncio.Semaphore(concurrency)
+    results = []
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={"User-Agent": USER_AGENT}) as session:
+        async def one(url):
+            async with sem:
+                results.append((url, await fetch_head(session, url)))
+                if len(results) % 100 == 0:
+                    print(f"  Fetched {len(results)}/{len(urls)}...")
+
+        await asyncio.gather(*(one(u) for u in urls))
+    return results
+
+
+# ── Main ───────────────────────────────────────────────────
+def merge_row(row, meta):
+    """{"id", <changed OG columns>} for row, or None if nothing changed."""
+    if not meta or "error" in meta:
+        return None
+    patch = {}
+    if meta.get("image") and row.get("screenshots") != [meta["image"]]:
+        patch["screenshots"] = [meta["image"]]
+    if meta.get("social"):
+        social = {**(row.get("social_links") or {}), **meta["social"]}
+        if social != row.get("social_links"):
+            patch["social_links"] = social
+    # Only backfill descriptions the data-quality check flags as too short
+    if meta.get("description") and len(row.get("description") or "") < 20:
+        description = meta["description"][:500]
+        if description != row.get("description"):
+            patch["description"] = description
+    return {"id": row["id"], **patch} if patch else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--ttl-days", type=float, default=7)
+    parser.add_argument("--dry-run", action="store_true", help="Fetch and cache, but don't write to the DB")
+    args = parser.parse_args()
+
+    supabase = get_supabase()
+    rows = [r for r in iter_table(supabase, "tools", COLUMNS) if (r.get("url") or "").startswith("http")]
+    if args.limit:
+        rows = rows[:args.limit]
+
+    # Fetch the resolved destination (resolve_urls.py) when known: no redirect hops,
+    # and referral URLs that land on the same page are fetched once
+    def page_url(row):
+        return row.get("final_url") or row["url"]
+
+    cache = OgCache(CACHE_FILE, args.ttl_days * 86400)
+    meta_by_url = {}
+    to_fetch = []
+    for url in {page_url(r) for r in rows}:
+        cached = cache.get(url)
+        if cached is None:
+            to_fetch.append(url)
+        else:
+            meta_by_url[url] = cached
+
+    print(f"🔍 {len(rows)} tools, {len(meta_by_url)} cached, fetching {len(to_fetch)} homepages...")
+    t0 = time.time()
+    fetched = asyncio.run(enrich_urls(to_fetch, args.concurrency))
+    cache.put_many(fetched)
+    meta_by_url.update(fetched)
+    errors = sum(1 for _, m in fetched if "error" in m)
+    print(f"   Done in {time.time() - t0:.1f}s ({errors} failed)")
+
+    updates = [u for u in (merge_row(r, meta_by_url.get(page_url(r))) for r in rows) if u]
+    print(f"📦 {len(updates)} tools gained OpenGraph data.")
+    if args.dry_run:
+        return
+
+    for i in range(0, len(updates), BATCH_SIZE):
+        batch = updates[i : i + BATCH_SIZE]
+        try:
+            written = supabase.rpc("set_og_fields", {"payload": batch}).execute().data or 0
+            print(f"  ✅ Updated batch {i // BATCH_SIZE + 1}: {written} rows")
+        except Exception as e:
+            print(f"  ❌ Error in batch {i // BATCH_SIZE + 1}: {e}")
+            print("👉 Run migrations/create_set_og_fields.sql in the Supabase SQL Editor first.")
+
+
+if __name__ == "__main__":
+    main()
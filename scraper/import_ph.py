@@ -1,26 +1,9 @@
-import json
 import os
 import random
-from supabase import create_client, Client
-from dotenv import load_dotenv
 
-# 加载环境变量
-# dotenv_path 需要指向 .env.local 的绝对路径或正确相对路径
-# 假设脚本在 pickaihub/scraper/ 下，.env.local 在 pickaihub/ 下
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env.local"))
-
-SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-SUPABASE_KEY = os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-# 如果有 Service Role Key，优先使用它以绕过 RLS
-client_key = SERVICE_KEY if SERVICE_KEY else SUPABASE_KEY
-
-if not SUPABASE_URL or not client_key:
-    print("❌ Error: Missing Supabase credentials in .env.local")
-    exit(1)
-
-supabase: Client = create_client(SUPABASE_URL, client_key)
+from crawl_state import CrawlState
+from supabase_client import get_supabase
+from tool_record import InvalidRecords, load_tools as load_tool_file, to_dict
 
 # 映射 ProductHunt Topics 到我们自己的 Categories
 CATEGORY_MAPPING = {
@@ -44,48 +27,67 @@ def map_category(ph_category):
             return value
     return "other"
 
+def load_tools():
+    """Read the scraper output: ai_tools_data.json, or the --stream JSONL file."""
+    if os.path.exists("ai_tools_data.json"):
+        return load_tool_file("ai_tools_data.json")
+    return load_tool_file("ai_tools_data.jsonl")
+
 def import_tools():
     try:
-        with open("ai_tools_data.json", "r") as f:
-            tools = json.load(f)
+        tools = load_tools()
     except FileNotFoundError:
-        print("❌ Error: ai_tools_data.json not found. Run the scraper first.")
+        print("❌ Error: ai_tools_data.json(l) not found. Run the scraper first.")
+        return
+    except InvalidRecords as e:
+        print(f"❌ Error: {e}")
         return
 
     print(f"📦 Importing {len(tools)} tools into Supabase...")
+    # 如果有 Service Role Key，优先使用它以绕过 RLS，否则退回 anon key
+    supabase = get_supabase(allow_anon=True)
 
     success_count = 0
     skip_count = 0
+    state = CrawlState()
 
     for tool in tools:
         # 1. 数据清洗与映射
         db_tool = {
-            "name": tool["name"],
-            "description": tool["description"],
-            "url": tool["url"],
-            "logo": tool["logo"],
-            "category": map_category(tool["category"]),
-            "tags": tool["tags"],
-            "pricing": tool["pricing"],
-            "visits": tool["visits"],
-            "rating": tool["rating"],
-            "is_new": tool["is_new"],
-            "is_trending": tool["is_trending"],
+            "name": tool.name,
+            "description": tool.description,
+            "url": tool.url,
+            "logo": tool.logo,
+            "category": map_category(tool.category),
+            "tags": tool.tags,
+            "pricing": tool.pricing,
+            "visits": tool.visits,
+            "visits_count": tool.visits_count,
+            "rating": tool.rating,
+            "is_new": tool.is_new,
+            "is_trending": tool.is_trending,
             "launch_date": "now()",
             # New fields
-            "features": tool.get("features", []),
-            "screenshots": tool.get("screenshots", []),
-            "price_detail": tool.get("price_detail", "")
+            "features": tool.features or [],
+            "screenshots": tool.screenshots or [],
+            "price_detail": tool.price_detail or ""
         }
 
         # 2. 插入数据库 (Upsert based on name or url to avoid duplicates)
-        # 注意：这里我们简单地用 name 作为唯一键检查，实际生产环境可能需要更复杂的去重逻辑
+        # 先查本地 crawl state（slug / 规范化 URL 索引），再用 name 查数据库兜底
+        slug = tool.id
+        if state.seen(slug=slug, url=db_tool["url"]):
+            print(f"⚠️ Skipping duplicate: {db_tool['name']}")
+            skip_count += 1
+            continue
+
         try:
             # 检查是否已存在
             existing = supabase.table("tools").select("id").eq("name", db_tool["name"]).execute()
             
             if existing.data:
                 print(f"⚠️ Skipping duplicate: {db_tool['name']}")
+                state.record(slug, db_tool["url"], "taaft-home", to_dict(tool))
                 skip_count += 1
                 continue
             
@@ -93,11 +95,13 @@ def import_tools():
             result = supabase.table("tools").insert(db_tool).execute()
             if result.data:
                 print(f"✅ Imported: {db_tool['name']}")
+                state.record(slug, db_tool["url"], "taaft-home", to_dict(tool))
                 success_count += 1
                 
         except Exception as e:
             print(f"❌ Error importing {db_tool['name']}: {e}")
 
+    state.close()
     print(f"\n🎉 Import Complete!")
     print(f"✅ Success: {success_count}")
     print(f"⚠️ Skipped: {skip_count}")
@@ -0,0 +1,325 @@
+"""
+Logo Mirror — serve logos from our own content-addressed WebP store.
+
+Every tool logo is downloaded once with a pooled aiohttp session, named by
+the hash of its bytes (identical placeholder images collapse to one file),
+transcoded to WebP at the card sizes in a process pool, uploaded to the
+public `logos` Supabase Storage bucket, and `tools.logo` is rewritten to the
+file's public Storage URL in bulk (the original URL is kept in `logo_source`):
+
+  <h[:2]>/<h>-96.webp     48px card logo @2x
+  <h[:2]>/<h>-160.webp    80px tool page logo @2x  ← tools.logo
+
+SVG logos stay hot-linked: a third-party SVG can carry scripts, and served
+from our own storage it would run there when opened directly. Rows an
+earlier run pointed at a mirrored SVG are pointed back at the source URL.
+
+public/logos (gitignored) is only the local working copy. A tool is pointed
+at the mirror only once every variant of its logo is in the bucket, so a
+deployed app never links to a file that exists on one machine alone.
+
+Re-runs are incremental: ETag / Last-Modified of every source URL, and the
+files already uploaded, are kept in scraper/logo_mirror.sqlite. Unchanged
+logos cost a 304 and no transcode or upload.
+
+Usage:
+  python3 scraper/logo_mirror.py [--concurrency 50] [--workers N] [--dry-run]
+  (needs migrations/add_logo_mirror.sql)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from supabase_client import get_supabase
+from table_reader import iter_table
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+MIRROR_DIR = os.path.join(ROOT_DIR, "public", "logos")
+BUCKET = "logos"
+INDEX_FILE = os.path.join(SCRIPT_DIR, "logo_mirror.sqlite")
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+FETCH_TIMEOUT = 15
+MAX_LOGO_BYTES = 5 * 1024 * 1024
+BATCH_SIZE = 500
+
+# Square card sizes (px); the last one is what tools.logo points at.
+# Keep in sync with LOGO_SIZES in src/lib/logo.ts.
+SIZES = (96, 160)
+WEBP_QUALITY = 82
+
+
+# ── Content-addressed store ────────────────────────────────
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def variant_path(h, size=None, ext="webp"):
+    """Path relative to MIRROR_DIR and the bucket."""
+    name = f"{h}-{size}.{ext}" if size else f"{h}.{ext}"
+    return f"{h[:2]}/{name}"
+
+
+def variants(rel):
+    """Every file behind the path tools.logo points at."""
+    h = rel.split("/")[1].split("-")[0]
+    return [variant_path(h, size) for size in SIZES]
+
+
+def is_svg(data):
+    head = data[:512].lstrip().lower()
+    return head.startswith((b"<svg", b"<?xml", b"<!--")) and b"<svg" in data[:4096].lower()
+
+
+def store(h, data):
+    """
+    Write the variants for one image (runs in a worker process).
+    Returns the path tools.logo should point at, or None if it isn't a
+    raster image (SVGs are never mirrored, see the module docstring).
+    Files that already exist are never rewritten: same hash, same bytes.
+    """
+    if is_svg(data):
+        return None
+
+    from PIL import Image, ImageOps
+
+    try:
+        img = Image.open(io.BytesIO(data))
+        img.load()
+    except Exception:
+        return None
+    img = img.convert("RGBA")
+    for size in SIZES:
+        rel = variant_path(h, size)
+
+        def encode(size=size):
+            # Fit inside the square, keep aspect ratio, transparent padding
+            fitted = ImageOps.contain(img, (size, size), Image.LANCZOS)
+            canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+            canvas.paste(fitted, ((size - fitted.width) // 2, (size - fitted.height) // 2))
+            buf = io.BytesIO()
+            canvas.save(buf, "WEBP", quality=WEBP_QUALITY, method=6)
+            return buf.getvalue()
+
+        _write_once(rel, encode)
+    return variant_path(h, SIZES[-1])
+
+
+def _write_once(rel, produce):
+    path = os.path.join(MIRROR_DIR, rel)
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(produce())
+    os.replace(tmp, path)
+
+
+# ── Source index (ETag / Last-Modified per URL) ────────────
+class MirrorIndex:
+    def __init__(self, path=INDEX_FILE):
+        self.db = sqlite3.connect(path)
+        self.db.execute("pragma journal_mode=wal")
+        self.db.execute(
+            "create table if not exists sources ("
+            " url text primary key, etag text, last_modified text, path text, fetched_at real)"
+        )
+        self.db.execute("create table if not exists uploads (path text primary key, uploaded_at real)")
+
+    def get(self, url):
+        row = self.db.execute("select etag, last_modified, path from sources where url = ?", (url,)).fetchone()
+        return dict(zip(("etag", "last_modified", "path"), row)) if row else None
+
+    def put_many(self, rows):
+        now = time.time()
+        self.db.executemany(
+            "insert or replace into sources (url, etag, last_modified, path, fetched_at) values (?, ?, ?, ?, ?)",
+            [(url, etag, lm, path, now) for url, etag, lm, path in rows],
+        )
+        self.db.commit()
+
+    def uploaded(self, path):
+        return self.db.execute("select 1 from uploads where path = ?", (path,)).fetchone() is not None
+
+    def mark_uploaded(self, path):
+        self.db.execute("insert or replace into uploads (path, uploaded_at) values (?, ?)", (path, time.time()))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+# ── Upload ─────────────────────────────────────────────────
+def upload_files(supabase, index, rels):
+    """Upload the files of `rels` the bucket doesn't have yet; returns the set that failed."""
+    bucket = supabase.storage.from_(BUCKET)
+    failed, sent = set(), 0
+    for rel in sorted(rels):
+        if index.uploaded(rel):
+            continue
+        try:
+            with open(os.path.join(MIRROR_DIR, rel), "rb") as f:
+                data = f.read()
+            # Content-addressed: the same path always holds the same bytes
+            bucket.upload(rel, data, {"content-type": "image/webp", "cache-control": "31536000", "upsert": "true"})
+        except Exception as e:
+            failed.add(rel)
+            print(f"  ❌ Upload {rel}: {e}")
+            continue
+        index.mark_uploaded(rel)
+        sent += 1
+        if sent % 200 == 0:
+            print(f"  Uploaded {sent} files...")
+    return failed
+
+
+# ── Fetch ──────────────────────────────────────────────────
+async def fetch_logo(session, url, known):
+    """("new", bytes, etag, last_modified) | ("unchanged",) | ("error", reason)."""
+    import aiohttp
+
+    headers = {}
+    if known and known["path"] and os.path.exists(os.path.join(MIRROR_DIR, known["path"])):
+        if known["etag"]:
+            headers["If-None-Match"] = known["etag"]
+        if known["last_modified"]:
+            headers["If-Modified-Since"] = known["last_modified"]
+    try:
+        async with session.get(url, headers=headers, allow_redirects=True) as resp:
+            if resp.status == 304:
+                return ("unchanged",)
+            if resp.status >= 400:
+                return ("error", f"HTTP {resp.status}")
+            data = bytearray()
+            async for chunk in resp.content.iter_chunked(65536):
+                data += chunk
+                if len(data) > MAX_LOGO_BYTES:
+                    return ("error", "too large")
+            return ("new", bytes(data), resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        return ("error", str(e) or type(e).__name__)
+
+
+async def mirror_urls(urls, index, concurrency, pool):
+    """{url: mirrored path} for every URL that is (or already was) mirrored."""
+    # Imported here, after argument parsing: `--help` doesn't load aiohttp
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=8, ttl_dns_cache=600)
+    timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+    sem = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    stats = {"new": 0, "unchanged": 0, "error": 0, "deduped": 0}
+    paths, updates, hashes_seen = {}, [], set()
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={"User-Agent": USER_AGENT}) as session:
+        async def one(url):
+            known = index.get(url)
+            async with sem:
+                result = await fetch_logo(session, url, known)
+            stats[result[0]] += 1
+            if result[0] == "unchanged":
+                if not known["path"].endswith(".svg"):   # SVGs an older run mirrored stay hot-linked
+                    paths[url] = known["path"]
+            elif result[0] == "new":
+                _, data, etag, last_modified = result
+                h = content_hash(data)
+                if h in hashes_seen:
+                    stats["deduped"] += 1
+                hashes_seen.add(h)
+                # Decode/resize/encode is CPU-bound: keep it off the event loop
+                path = await loop.run_in_executor(pool, store, h, data)
+                if path:
+                    paths[url] = path
+                    updates.append((url, etag, last_modified, path))
+            done = sum(stats[k] for k in ("new", "unchanged", "error"))
+            if done % 200 == 0:
+                print(f"  Mirrored {done}/{len(urls)}...")
+
+        await asyncio.gather(*(one(u) for u in urls))
+
+    index.put_many(updates)
+    return paths, stats
+
+
+# ── Main ───────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None, help="Transcode processes (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="Mirror files locally; don't upload or rewrite tools.logo")
+    args = parser.parse_args()
+
+    supabase = get_supabase()
+    try:
+        tools = list(iter_table(supabase, "tools", "id, logo, logo_source"))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        print("👉 Run migrations/add_logo_mirror.sql in the Supabase SQL Editor first.")
+        exit(1)
+
+    # A third-party `logo` is the latest source (loaders write those); a
+    # mirrored one (Storage URL, or an older /logos/ path) has it in logo_source
+    public_base = f"{supabase.supabase_url.rstrip('/')}/storage/v1/object/public/{BUCKET}"
+
+    def mirrored(logo):
+        return logo.startswith((public_base + "/", "/logos/"))
+
+    source_of = {
+        t["id"]: (t.get("logo_source") if mirrored(t.get("logo") or "") else t.get("logo")) or ""
+        for t in tools
+    }
+    urls = sorted({u for u in source_of.values() if u.startswith("http")})
+    print(f"🖼  {len(tools)} tools, {len(urls)} distinct logo URLs")
+
+    index = MirrorIndex()
+    t0 = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        paths, stats = asyncio.run(mirror_urls(urls, index, args.concurrency, pool))
+    files = len({p for p in paths.values()})
+    print(f"   Done in {time.time() - t0:.1f}s: {stats['new']} downloaded, {stats['unchanged']} unchanged (304), "
+          f"{stats['error']} failed; {files} distinct images ({stats['deduped']} duplicates stored once)")
+    if args.dry_run:
+        index.close()
+        print("📋 Dry run: nothing uploaded, tools.logo unchanged")
+        return
+
+    # Upload before any row points at a file, and skip tools whose files didn't make it
+    try:
+        failed = upload_files(supabase, index, {f for p in paths.values() for f in variants(p)})
+    finally:
+        index.close()
+    if failed:
+        print(f"⚠️  {len(failed)} files failed to upload; their tools keep their current logo")
+
+    payload = []
+    for t in tools:
+        src = source_of[t["id"]]
+        if src in paths and not failed.intersection(variants(paths[src])):
+            logo = f"{public_base}/{paths[src]}"
+            if t.get("logo") != logo or t.get("logo_source") != src:
+                payload.append({"id": t["id"], "logo": logo, "logo_source": src})
+        elif src and mirrored(t.get("logo") or "") and t["logo"].endswith(".svg"):
+            payload.append({"id": t["id"], "logo": src, "logo_source": None})   # back to hot-linking
+    print(f"📝 {len(payload)} tools to point at the mirror (or back at an SVG source)")
+
+    for i in range(0, len(payload), BATCH_SIZE):
+        batch = payload[i:i + BATCH_SIZE]
+        try:
+            supabase.rpc("set_tool_logos", {"payload": batch}).execute()
+            print(f"  ✅ Batch {i // BATCH_SIZE + 1}: {len(batch)} tools")
+        except Exception as e:
+            print(f"  ❌ Error in batch {i // BATCH_SIZE + 1}: {e}")
+            exit(1)
+
+
+if __name__ == "__main__":
+    main()
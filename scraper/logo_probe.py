@@ -0,0 +1,307 @@
+"""
+Logo Probe — validate every logo from its first few KB.
+
+Instead of downloading whole images (scan_all_visuals.py), each logo is
+fetched with a ranged GET (`Range: bytes=0-4095`) and the format header is
+parsed for type and dimensions: PNG IHDR, JPEG SOFn, WebP VP8/VP8L/VP8X,
+GIF, ICO and the <svg> root element. The full size comes from
+Content-Range. JPEGs whose SOF marker sits behind a large EXIF block get
+a second range starting at the next segment marker; servers that ignore
+Range are read only up to the bytes needed and then disconnected.
+
+Flags per logo:
+  missing      no URL, HTTP error, or the body isn't an image
+  tiny         raster smaller than MIN_SIDE px
+  oversized    more than MAX_BYTES, or wider/taller than MAX_SIDE px
+  mislabelled  Content-Type says one format, the bytes say another
+
+Results go to the logo_probes table (migrations/create_logo_probes_table.sql)
+in bulk upserts; logos already probed at the same URL within --max-age-days
+are skipped.
+
+Usage:
+  python3 scraper/logo_probe.py [--concurrency 50] [--max-age-days 7] [--dry-run]
+  python3 scraper/logo_probe.py --input scraper/crawled_tools.json   # offline check, no DB
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import struct
+import time
+from datetime import datetime, timedelta, timezone
+
+from supabase_client import get_supabase
+from table_reader import iter_table
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+PROBE_BYTES = 4096
+MAX_PROBE_BYTES = 64 * 1024   # give up on a header after this many bytes
+FETCH_TIMEOUT = 10
+BATCH_SIZE = 500
+
+MIN_SIDE = 32
+MAX_SIDE = 4096
+MAX_BYTES = 512 * 1024
+
+# Content-Type subtype -> sniffed format
+MIME_FORMATS = {
+    "png": "png", "jpeg": "jpeg", "jpg": "jpeg", "pjpeg": "jpeg", "webp": "webp", "gif": "gif",
+    "svg+xml": "svg", "x-icon": "ico", "vnd.microsoft.icon": "ico",
+}
+
+
+# ── Header parsing ─────────────────────────────────────────
+class NeedMore(Exception):
+    """
+    The header is valid so far, but the dimensions lie beyond the bytes we
+    have. args: (format, offset) — offset is where to read next when the
+    format lets us skip ahead (JPEG segments), None for "the bytes that follow".
+    """
+
+
+def _jpeg_size(data, i=2, base=0):
+    """(width, height) from the SOFn segment; `data` starts at absolute offset `base`."""
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker in (0xD8, 0x01, 0xFF) or 0xD0 <= marker <= 0xD7:
+            i += 1 if marker == 0xFF else 2
+            continue
+        length = struct.unpack(">H", data[i + 2:i + 4])[0]
+        # SOF0..SOF15 except DHT (C4), JPG (C8), DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            h, w = struct.unpack(">HH", data[i + 5:i + 9])
+            return w, h
+        i += 2 + length
+    # Segment lengths are explicit: jump straight to the next marker (skips EXIF/ICC blobs)
+    raise NeedMore("jpeg", base + i)
+
+
+_SVG_TAG_RE = re.compile(rb'<svg\b[^>]*>', re.I | re.S)
+_SVG_ATTR_RE = re.compile(rb'\b(width|height|viewBox)\s*=\s*["\']([^"\']*)["\']', re.I)
+
+
+def _svg_size(data):
+    m = _SVG_TAG_RE.search(data)
+    if not m:
+        raise NeedMore("svg", None)
+    attrs = {k.decode().lower(): v.decode(errors="replace") for k, v in _SVG_ATTR_RE.findall(m.group(0))}
+
+    def num(v):
+        n = re.match(r'\s*([\d.]+)\s*(px)?\s*$', v or "")
+        return int(float(n.group(1))) if n else None
+
+    w, h = num(attrs.get("width")), num(attrs.get("height"))
+    if (w is None or h is None) and attrs.get("viewbox"):
+        parts = re.split(r'[\s,]+', attrs["viewbox"].strip())
+        if len(parts) == 4:
+            w, h = int(float(parts[2])), int(float(parts[3]))
+    return w, h
+
+
+def sniff(data):
+    """(format, width, height) from the leading bytes; format None if not an image."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(data) < 24:
+            raise NeedMore("png", None)
+        w, h = struct.unpack(">II", data[16:24])
+        return "png", w, h
+    if data[:3] == b"\xff\xd8\xff":
+        return ("jpeg", *_jpeg_size(data))
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        if len(data) < 30:
+            raise NeedMore("webp", None)
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            w, h = struct.unpack("<HH", data[26:30])
+            return "webp", w & 0x3FFF, h & 0x3FFF
+        if chunk == b"VP8L":
+            b = int.from_bytes(data[21:25], "little")
+            return "webp", (b & 0x3FFF) + 1, ((b >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return "webp", int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+        return "webp", None, None
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        w, h = struct.unpack("<HH", data[6:10])
+        return "gif", w, h
+    if data[:4] == b"\x00\x00\x01\x00" and len(data) >= 8:
+        # ICO: first directory entry, 0 means 256
+        return "ico", data[6] or 256, data[7] or 256
+    head = data[:512].lstrip().lower()
+    if head.startswith((b"<svg", b"<?xml", b"<!--", b"<!doctype svg")) and b"<html" not in head:
+        return ("svg", *_svg_size(data))
+    return None, None, None
+
+
+def classify(probe):
+    """List of issue flags for a probe result."""
+    if probe.get("error") or not probe.get("format"):
+        return ["missing"]
+    issues = []
+    w, h, size = probe.get("width"), probe.get("height"), probe.get("bytes")
+    if probe["format"] != "svg" and w and h and min(w, h) < MIN_SIDE:
+        issues.append("tiny")
+    if (size and size > MAX_BYTES) or (w and h and max(w, h) > MAX_SIDE):
+        issues.append("oversized")
+    declared = MIME_FORMATS.get((probe.get("content_type") or "").split(";")[0].strip().lower().split("/")[-1])
+    if declared and declared != probe["format"]:
+        issues.append("mislabelled")
+    return issues
+
+
+# ── Fetch ──────────────────────────────────────────────────
+async def _read_range(session, url, start, end):
+    """(status, headers, data, bytes read) for [start, end]; stops reading at `end` if Range is ignored."""
+    async with session.get(url, headers={"Range": f"bytes={start}-{end}"}, allow_redirects=True) as resp:
+        if resp.status >= 400:
+            return resp.status, resp.headers, b"", 0
+        want = end - start + 1 if resp.status == 206 else end + 1
+        buf = bytearray()
+        async for chunk in resp.content.iter_chunked(4096):
+            buf += chunk
+            if len(buf) >= want:
+                break
+        # Range ignored (200): the body starts at 0, drop what we already have
+        data = bytes(buf[:want]) if resp.status == 206 else bytes(buf[start:want])
+        return resp.status, resp.headers, data, len(buf)
+
+
+def _total_size(status, headers, received):
+    if status == 206:
+        m = re.search(r'/(\d+)$', headers.get("Content-Range", ""))
+        return int(m.group(1)) if m else None
+    if headers.get("Content-Length"):
+        return int(headers["Content-Length"])
+    return received
+
+
+async def probe_logo(session, url):
+    """Probe dict: format, width, height, bytes, content_type, status, received (+ error)."""
+    import aiohttp
+
+    if not url or not url.startswith("http"):
+        return {"error": "no url", "received": 0}
+    try:
+        status, headers, data, received = await _read_range(session, url, 0, PROBE_BYTES - 1)
+        probe = {"status": status, "content_type": headers.get("Content-Type", ""),
+                 "bytes": _total_size(status, headers, received)}
+        if status >= 400:
+            return {**probe, "error": f"HTTP {status}", "received": received}
+
+        base = 0   # absolute offset of data[0]
+        while True:
+            try:
+                fmt, w, h = sniff(data) if base == 0 else ("jpeg", *_jpeg_size(data, 0, base))
+                break
+            except NeedMore as e:
+                fmt, w, h = e.args[0], None, None
+                start = e.args[1] if e.args[1] is not None else base + len(data)
+                if received >= MAX_PROBE_BYTES or (probe["bytes"] and start >= probe["bytes"]):
+                    break
+                _, _, more, read = await _read_range(session, url, start, start + PROBE_BYTES - 1)
+                received += read
+                if not more:
+                    break
+                if e.args[1] is not None:
+                    data, base = more, start
+                else:
+                    data += more
+        return {**probe, "format": fmt, "width": w, "height": h, "received": received}
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, struct.error) as e:
+        return {"error": str(e) or type(e).__name__, "received": 0}
+
+
+async def probe_logos(urls, concurrency):
+    # Imported here, after argument parsing: `--help` doesn't load aiohttp
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=8, ttl_dns_cache=600)
+    timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+    sem = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={"User-Agent": USER_AGENT}) as session:
+        async def one(url):
+            async with sem:
+                results[url] = await probe_logo(session, url)
+                if len(results) % 200 == 0:
+                    print(f"  Probed {len(results)}/{len(urls)}...")
+
+        await asyncio.gather(*(one(u) for u in urls))
+    return results
+
+
+# ── Main ───────────────────────────────────────────────────
+def probe_row(tool_id, logo, probe):
+    return {
+        "id": tool_id,
+        "logo": logo or "",
+        "status": probe.get("status"),
+        "format": probe.get("format"),
+        "width": probe.get("width"),
+        "height": probe.get("height"),
+        "bytes": probe.get("bytes"),
+        "issues": classify(probe),
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--max-age-days", type=float, default=7, help="Re-probe logos checked longer ago")
+    parser.add_argument("--dry-run", action="store_true", help="Probe, but don't write to the DB")
+    parser.add_argument("--input", help="Read tools from a JSON file instead of Supabase (implies --dry-run)")
+    args = parser.parse_args()
+
+    if args.input:
+        from tool_record import load_records
+
+        tools = load_records(args.input)
+        supabase = None
+    else:
+        supabase = get_supabase()
+        tools = list(iter_table(supabase, "tools", "id, name, logo"))
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=args.max_age_days)).isoformat()
+        fresh = {p["id"]: p["logo"] for p in iter_table(supabase, "logo_probes", "id, logo, checked_at")
+                 if p["checked_at"] >= cutoff}
+        tools = [t for t in tools if fresh.get(t["id"]) != t.get("logo")]
+
+    urls = sorted({t.get("logo") for t in tools if t.get("logo")})
+    print(f"🔍 Probing {len(urls)} logos for {len(tools)} tools...")
+    t0 = time.time()
+    probes = asyncio.run(probe_logos(urls, args.concurrency))
+    received = sum(p.get("received", 0) for p in probes.values())
+    full = sum(p.get("bytes") or 0 for p in probes.values())
+    saved = f", {100 - received / full * 100:.1f}% less than full downloads" if full else ""
+    print(f"   Done in {time.time() - t0:.1f}s: {received / 1024:.0f} KB received of {full / 1024:.0f} KB{saved}")
+
+    rows = [probe_row(t.get("id"), t.get("logo"), probes.get(t.get("logo"), {"error": "no url"})) for t in tools]
+    counts = {}
+    for row in rows:
+        for issue in row["issues"]:
+            counts[issue] = counts.get(issue, 0) + 1
+    print(f"📊 {sum(1 for r in rows if not r['issues'])} OK, issues: {counts or 'none'}")
+
+    if args.dry_run or supabase is None:
+        return
+
+    for i in range(0, len(rows), BATCH_SIZE):
+        batch = rows[i:i + BATCH_SIZE]
+        try:
+            supabase.table("logo_probes").upsert(batch).execute()
+            print(f"  ✅ Saved batch {i // BATCH_SIZE + 1}: {len(batch)} probes")
+        except Exception as e:
+            print(f"  ❌ Error in batch {i // BATCH_SIZE + 1}: {e}")
+            print("👉 Run migrations/create_logo_probes_table.sql in the Supabase SQL Editor first.")
+            exit(1)
+
+
+if __name__ == "__main__":
+    main()
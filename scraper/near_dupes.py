@@ -0,0 +1,271 @@
+"""
+Near-duplicate detection — MinHash signatures + LSH banding.
+
+Exact slug/name/URL dedup misses re-listings ("img2img-ai" vs
+"img2img-ai-1767617240"), versioned names ("KreadoAI v4.0") and the same
+tool coming from two sources. Each record is shingled (name character
+3-grams, description word pairs, homepage domain), reduced to a NUM_PERM
+MinHash signature, and the signature is cut into BANDS bands. Records that
+share any band bucket become candidates, so work grows with the number of
+records, not pairs; candidates are then scored by signature agreement
+(an estimate of shingle Jaccard similarity).
+
+Pairs at or above --threshold are reported as merge suggestions
+(near_dupes.json); pairs at or above --auto-merge are merged into the
+first input file, the keeper inheriting any fields it was missing.
+
+Usage:
+  python3 near_dupes.py                                   # crawled_tools.json
+  python3 near_dupes.py crawled_tools.json ../ai_tools_data.json
+  python3 near_dupes.py --auto-merge 0.85                 # rewrite crawled_tools.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from collections import defaultdict
+
+from crawl_state import normalize_url
+
+# numpy, msgspec and tool_record are imported where they are used, after
+# argument parsing, so `near_dupes.py --help` doesn't load them
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INPUT = os.path.join(SCRIPT_DIR, "crawled_tools.json")
+REPORT_FILE = os.path.join(SCRIPT_DIR, "near_dupes.json")
+
+NUM_PERM = 128
+BANDS = 32                  # 32 bands x 4 rows: pairs around 0.45 Jaccard start to collide
+THRESHOLD = 0.5
+MAX_BUCKET = 50             # larger buckets are boilerplate ("Waitlist"), not duplicates
+SEED = 1
+
+# Directory/aggregator hosts say nothing about which tool a record is
+AGGREGATOR_HOSTS = {"theresanaiforthat.com", "producthunt.com"}
+
+_MERSENNE = (1 << 61) - 1
+_VERSION_RE = re.compile(r'\s+v?\d+(\.\d+)+$|\s+v\d+$', re.I)
+_TLD_RE = re.compile(r'\.(ai|com|io|app|co|net|org|so|dev)$', re.I)
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def canonical_name(name):
+    """Lowercase name without version or domain suffix: "KreadoAI v4.0" -> "kreadoai"."""
+    name = _VERSION_RE.sub("", (name or "").strip())
+    return _TLD_RE.sub("", name).lower().strip()
+
+
+def shingles(tool):
+    """Set of shingle hashes (uint32) for one record."""
+    import numpy as np
+
+    out = set()
+    name = canonical_name(tool.name)
+    padded = f" {name} "
+    out.update("n:" + padded[i:i + 3] for i in range(max(len(padded) - 2, 1)))
+
+    words = _WORD_RE.findall(tool.description.lower())
+    out.update(f"d:{a} {b}" for a, b in zip(words, words[1:]))
+
+    # Prefer where the URL ends up (resolve_urls.py): referral links share the final host
+    url = tool.final_url or tool.url
+    host = normalize_url(url).split("/")[2] if url else ""
+    if host and host not in AGGREGATOR_HOSTS:
+        # Weight the domain like a few name shingles: same homepage is strong evidence
+        out.update(f"h{i}:{host}" for i in range(4))
+
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in out), dtype=np.uint64, count=len(out))
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _MERSENNE, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _MERSENNE, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, shingle_sets):
+        """(records x num_perm) uint32 signature matrix."""
+        import numpy as np
+
+        mersenne = np.uint64(_MERSENNE)
+        sig = np.full((len(shingle_sets), len(self.a)), 0xFFFFFFFF, dtype=np.uint32)
+        for i, hv in enumerate(shingle_sets):
+            if len(hv):
+                # (a*x + b) mod p, truncated to 32 bits; uint64 overflow is part of the hash
+                h = ((np.outer(hv, self.a) + self.b) % mersenne) & np.uint64(0xFFFFFFFF)
+                sig[i] = h.min(axis=0)
+        return sig
+
+
+def candidate_pairs(sig, bands=BANDS, max_bucket=MAX_BUCKET):
+    """(k x 2) int array of pairs (i < j) sharing at least one band bucket."""
+    import numpy as np
+
+    n, num_perm = sig.shape
+    rows = num_perm // bands
+    mult = np.random.default_rng(SEED).integers(1, 1 << 62, size=rows, dtype=np.uint64) | np.uint64(1)
+    codes = []
+    for b in range(bands):
+        # One 64-bit key per record and band; group equal keys by sorting
+        keys = (sig[:, b * rows:(b + 1) * rows].astype(np.uint64) * mult).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, n])
+
+        # Buckets of two are the common case: vectorised
+        two = starts[sizes == 2]
+        codes.append(_pair_codes(order[two], order[two + 1], n))
+        larger = (sizes > 2) & (sizes <= max_bucket)
+        for start, size in zip(starts[larger], sizes[larger]):
+            members = order[start:start + size]
+            i, j = np.triu_indices(size, k=1)
+            codes.append(_pair_codes(members[i], members[j], n))
+
+    codes = np.unique(np.concatenate(codes)) if codes else np.empty(0, dtype=np.int64)
+    return np.stack([codes // n, codes % n], axis=1)
+
+
+def _pair_codes(a, b, n):
+    import numpy as np
+
+    return np.minimum(a, b).astype(np.int64) * n + np.maximum(a, b)
+
+
+def find_near_duplicates(tools, threshold=THRESHOLD, bands=BANDS, num_perm=NUM_PERM):
+    """[(i, j, score)] for record pairs with estimated Jaccard >= threshold, best first."""
+    import numpy as np
+
+    sig = MinHasher(num_perm).signatures([shingles(t) for t in tools])
+    pairs = candidate_pairs(sig, bands)
+    scores = np.concatenate([
+        (sig[pairs[k:k + 100_000, 0]] == sig[pairs[k:k + 100_000, 1]]).mean(axis=1)
+        for k in range(0, len(pairs), 100_000)
+    ]) if len(pairs) else np.empty(0)
+    keep = np.flatnonzero(scores >= threshold)
+    keep = keep[np.argsort(-scores[keep], kind="stable")]
+    return [(int(pairs[k, 0]), int(pairs[k, 1]), float(scores[k])) for k in keep]
+
+
+def clusters(n, pairs):
+    """Union-find over pairs -> list of index groups with more than one member."""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j, _ in pairs:
+        parent[find(i)] = find(j)
+
+    groups = defaultdict(list)
+    for i in range(n):
+        groups[find(i)].append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def _empty(v):
+    from msgspec import UNSET
+
+    return v is UNSET or v in (None, "", [], {})
+
+
+def pick_keeper(tools, group):
+    """Most complete record wins; ties go to the cleanest name (no version/suffix)."""
+    import msgspec
+
+    def rank(i):
+        t = tools[i]
+        filled = sum(1 for v in msgspec.structs.astuple(t) if not _empty(v) and v not in (0, "0"))
+        return (filled, len(t.description), -len(t.name))
+    return max(group, key=rank)
+
+
+def merge_into(keeper, dupe):
+    """Fill the keeper's empty fields from a duplicate."""
+    for k in keeper.__struct_fields__:
+        v = getattr(dupe, k)
+        if _empty(getattr(keeper, k)) and not _empty(v):
+            setattr(keeper, k, v)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("inputs", nargs="*", default=[DEFAULT_INPUT], help="JSON/JSONL tool files (sources)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Report pairs at or above this score")
+    parser.add_argument("--auto-merge", type=float, default=None, metavar="SCORE",
+                        help="Merge pairs at or above SCORE into the first input file")
+    parser.add_argument("--bands", type=int, default=BANDS)
+    args = parser.parse_args()
+    from tool_record import InvalidRecords, load_tools, save_tools
+
+    tools, origin, sizes = [], [], []
+    for path in args.inputs:
+        try:
+            records = load_tools(path)
+        except InvalidRecords as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        sizes.append(len(records))
+        tools.extend(records)
+        origin.extend([os.path.basename(path)] * len(records))
+    print(f"📦 Loaded {len(tools)} records from {len(args.inputs)} file(s)")
+
+    t0 = time.time()
+    pairs = find_near_duplicates(tools, args.threshold, args.bands)
+    groups = clusters(len(tools), pairs)
+    print(f"🔍 {len(pairs)} near-duplicate pairs in {len(groups)} clusters ({time.time() - t0:.1f}s)")
+
+    best_score = defaultdict(float)
+    for i, j, s in pairs:
+        best_score[i] = max(best_score[i], s)
+        best_score[j] = max(best_score[j], s)
+    report = []
+    for group in sorted(groups, key=len, reverse=True):
+        keep = pick_keeper(tools, group)
+        report.append({
+            "keep": {"id": tools[keep].id, "name": tools[keep].name, "source": origin[keep]},
+            "duplicates": [
+                {"id": tools[i].id, "name": tools[i].name, "source": origin[i], "score": round(best_score[i], 3)}
+                for i in group if i != keep
+            ],
+        })
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    for entry in report[:10]:
+        dupes = ", ".join(f"{d['name']} ({d['score']})" for d in entry["duplicates"])
+        print(f"   {entry['keep']['name']} ⇐ {dupes}")
+    print(f"💾 Suggestions saved to {os.path.relpath(REPORT_FILE)}")
+
+    if args.auto_merge is None:
+        return
+
+    # Only merge records of the first file; suggestions across sources stay suggestions
+    n_first = sizes[0]
+    strong = [(i, j, s) for i, j, s in pairs if s >= args.auto_merge and i < n_first and j < n_first]
+    drop = set()
+    for group in clusters(n_first, strong):
+        keep = pick_keeper(tools, group)
+        for i in group:
+            if i != keep:
+                merge_into(tools[keep], tools[i])
+                drop.add(i)
+
+    if not drop:
+        print("✅ Nothing above the auto-merge threshold.")
+        return
+    kept = [t for i, t in enumerate(tools[:n_first]) if i not in drop]
+    save_tools(args.inputs[0], kept)
+    print(f"✅ Auto-merged {len(drop)} duplicates into {os.path.basename(args.inputs[0])} ({len(kept)} records left)")
+
+
+if __name__ == "__main__":
+    main()
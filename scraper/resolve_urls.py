@@ -0,0 +1,266 @@
+"""
+Resolve URLs — follow every tool URL's redirects once and remember where it ends.
+
+Many listing URLs are referral hops (?ref=taaft, /go/..., link shorteners)
+that land on the same site. Each URL is followed hop by hop (HEAD, falling
+back to GET for servers that refuse HEAD), and the whole chain plus the
+final URL is kept in a local cache (scraper/redirect_cache.sqlite). Entries
+are reused until they are older than --ttl-days (failures and 4xx/5xx
+endings: ERROR_TTL_DAYS), so link checks and later runs don't repeat the hops.
+
+The final URL is canonicalised (tracking parameters and fragment dropped)
+and written to tools.final_url / tools.final_domain in bulk
+(migrations/add_final_url.sql). Tools whose URLs resolve to the same
+final_domain are reported as duplicate candidates.
+
+Usage:
+  python3 scraper/resolve_urls.py [--concurrency 50] [--ttl-days 14] [--dry-run]
+  python3 scraper/resolve_urls.py --input scraper/crawled_tools.json [--write]   # no DB
+
+  from resolve_urls import RedirectCache
+  with RedirectCache() as cache:
+      hit = cache.get(url)    # {"chain", "final_url", "final_domain", "status", "error"} or None
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from supabase_client import get_supabase
+from table_reader import iter_table
+from tool_record import from_dict, load_records, save_tools
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(SCRIPT_DIR, "redirect_cache.sqlite")
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+FETCH_TIMEOUT = 10
+MAX_HOPS = 10
+TTL_DAYS = 14
+ERROR_TTL_DAYS = 1
+BATCH_SIZE = 500
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Some servers answer HEAD with these but serve GET fine
+HEAD_UNSUPPORTED = {400, 403, 404, 405, 501}
+TRACKING_PARAMS = {"ref", "ref_src", "via", "source", "fbclid", "gclid", "mc_cid", "mc_eid", "_ga"}
+# Directory hosts: many unrelated tools share them, so they never mark duplicates
+AGGREGATOR_HOSTS = {"theresanaiforthat.com", "producthunt.com"}
+
+SCHEMA = """
+create table if not exists redirects (
+  url          text primary key,
+  chain        text not null,
+  final_url    text,
+  final_domain text,
+  status       integer,
+  error        text,
+  resolved_at  real not null
+);
+"""
+
+
+def canonical_url(url):
+    """Final URL without fragment and tracking parameters (utm_*, ref, ...); host lowercased."""
+    parsed = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS]
+    path = parsed.path if parsed.path not in ("", "/") else "/"
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, "", urlencode(query), ""))
+
+
+def domain_of(url):
+    return urlparse(url).netloc.lower().split(":")[0].removeprefix("www.") if url else ""
+
+
+# ── Cache ──────────────────────────────────────────────────
+class RedirectCache:
+    def __init__(self, path=CACHE_FILE, ttl_days=TTL_DAYS):
+        self.ttl = ttl_days * 86400
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("pragma journal_mode=wal")
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, url):
+        """Cached resolution for url, or None if missing or expired."""
+        row = self.db.execute(
+            "select chain, final_url, final_domain, status, error, resolved_at from redirects where url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        # Failures and error statuses are retried sooner than good chains
+        ttl = ERROR_TTL_DAYS * 86400 if row[4] or (row[3] or 0) >= 400 else self.ttl
+        if time.time() - row[5] > ttl:
+            return None
+        return {"chain": json.loads(row[0]), "final_url": row[1], "final_domain": row[2],
+                "status": row[3], "error": row[4]}
+
+    def put_many(self, results):
+        """results: {url: resolution dict}."""
+        now = time.time()
+        self.db.executemany(
+            "insert or replace into redirects (url, chain, final_url, final_domain, status, error, resolved_at)"
+            " values (?, ?, ?, ?, ?, ?, ?)",
+            [(url, json.dumps(r["chain"]), r["final_url"], r["final_domain"], r["status"], r["error"], now)
+             for url, r in results.items()],
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def resolution(chain, error=None):
+    """Resolution dict from a [[url, status], ...] chain (last hop = final)."""
+    final_url, status = chain[-1] if chain else (None, None)
+    if error or not final_url or (status in REDIRECT_STATUSES):
+        return {"chain": chain, "final_url": None, "final_domain": None, "status": status,
+                "error": error or "no final URL"}
+    final_url = canonical_url(final_url)
+    return {"chain": chain, "final_url": final_url, "final_domain": domain_of(final_url),
+            "status": status, "error": None}
+
+
+# ── Resolve ────────────────────────────────────────────────
+async def _hop(session, url):
+    """(status, Location) for one request, without following redirects."""
+    async with session.head(url, allow_redirects=False) as resp:
+        if resp.status not in HEAD_UNSUPPORTED:
+            return resp.status, resp.headers.get("Location")
+    async with session.get(url, allow_redirects=False) as resp:
+        return resp.status, resp.headers.get("Location")   # body is never read
+
+
+async def resolve(session, url):
+    import aiohttp
+
+    chain, seen = [], set()
+    try:
+        while len(chain) < MAX_HOPS:
+            if url in seen:
+                return resolution(chain, "redirect loop")
+            seen.add(url)
+            status, location = await _hop(session, url)
+            chain.append([url, status])
+            if status not in REDIRECT_STATUSES or not location:
+                return resolution(chain)
+            url = urljoin(url, location)
+        return resolution(chain, "too many redirects")
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        chain.append([url, None])
+        return resolution(chain, str(e) or type(e).__name__)
+
+
+async def resolve_urls(urls, concurrency):
+    # Imported here: RedirectCache users (check_tools.py) never resolve anything
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=8, ttl_dns_cache=600)
+    timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+    sem = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={"User-Agent": USER_AGENT}) as session:
+        async def one(url):
+            async with sem:
+                results[url] = await resolve(session, url)
+            if len(results) % 200 == 0:
+                print(f"  Resolved {len(results)}/{len(urls)}...")
+
+        await asyncio.gather(*(one(u) for u in urls))
+    return results
+
+
+# ── Main ───────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--ttl-days", type=float, default=TTL_DAYS, help="Re-resolve cached URLs older than this")
+    parser.add_argument("--dry-run", action="store_true", help="Resolve and cache, but don't write to the DB")
+    parser.add_argument("--input", help="Read tools from a JSON file instead of Supabase (implies --dry-run)")
+    parser.add_argument("--write", action="store_true", help="With --input: add final_url/final_domain to the file")
+    args = parser.parse_args()
+
+    if args.input:
+        tools = load_records(args.input)
+        supabase = None
+    else:
+        supabase = get_supabase()
+        tools = list(iter_table(supabase, "tools", "id, name, url, final_url, final_domain"))
+
+    cache = RedirectCache(ttl_days=args.ttl_days)
+    urls = sorted({t["url"] for t in tools if (t.get("url") or "").startswith("http")})
+    resolved = {}
+    for url in urls:
+        hit = cache.get(url)
+        if hit:
+            resolved[url] = hit
+    todo = [u for u in urls if u not in resolved]
+    print(f"🔗 {len(urls)} distinct URLs: {len(resolved)} cached, {len(todo)} to resolve")
+
+    t0 = time.time()
+    fresh = asyncio.run(resolve_urls(todo, args.concurrency)) if todo else {}
+    cache.put_many(fresh)
+    cache.close()
+    resolved.update(fresh)
+    hops = sum(len(r["chain"]) - 1 for r in fresh.values())
+    failed = sum(1 for r in resolved.values() if r["error"])
+    print(f"   Done in {time.time() - t0:.1f}s: {hops} redirect hops followed, {failed} failed")
+
+    by_domain = defaultdict(list)
+    for t in tools:
+        r = resolved.get(t.get("url"))
+        if r and r["final_domain"] and r["final_domain"] not in AGGREGATOR_HOSTS:
+            by_domain[r["final_domain"]].append(t.get("name"))
+    shared = sorted(((d, names) for d, names in by_domain.items() if len(names) > 1), key=lambda x: -len(x[1]))
+    print(f"🔍 {len(shared)} final domains shared by more than one tool")
+    for domain, names in shared[:10]:
+        print(f"   {domain}: {', '.join(names[:5])}{' ...' if len(names) > 5 else ''}")
+
+    def final_of(t):
+        r = resolved.get(t.get("url")) or {}
+        return r.get("final_url"), r.get("final_domain")
+
+    if args.input:
+        if args.write:
+            for t in tools:
+                t["final_url"], t["final_domain"] = final_of(t)
+            save_tools(args.input, [from_dict(t) for t in tools])
+            print(f"💾 Added final_url/final_domain to {os.path.basename(args.input)}")
+        return
+
+    payload = []
+    for t in tools:
+        final_url, final_domain = final_of(t)
+        if final_url and (final_url, final_domain) != (t.get("final_url"), t.get("final_domain")):
+            payload.append({"id": t["id"], "final_url": final_url, "final_domain": final_domain})
+    print(f"📝 {len(payload)} tools changed")
+    if args.dry_run:
+        return
+
+    written = 0
+    for i in range(0, len(payload), BATCH_SIZE):
+        batch = payload[i:i + BATCH_SIZE]
+        try:
+            written += supabase.rpc("set_final_urls", {"payload": batch}).execute().data or 0
+            print(f"  ✅ Batch {i // BATCH_SIZE + 1}: {len(batch)} tools")
+        except Exception as e:
+            print(f"  ❌ Error in batch {i // BATCH_SIZE + 1}: {e}")
+            print("👉 Run migrations/add_final_url.sql in the Supabase SQL Editor first.")
+            exit(1)
+    print(f"\n✅ Updated final URLs for {written} tools.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,40 @@ import concurrent.futures
 import hashlib
 import io
 import json
+from typing import NamedTuple, Optional
+
 import requests
-import xml.etree.ElementTree as ET
 from PIL import Image
 import imagehash
 
-# Vector Signature (Google Imagen)
+from svg_fingerprint import FingerprintIndex
+from tool_record import load_tools
+
+# Vector signatures: structural fingerprints of known placeholder SVGs
+# (svg_fingerprints.json, managed with svg_fingerprint.py add/show/seed)
+SVG_INDEX = FingerprintIndex()
+
+# Legacy byte-level signatures, kept to seed the index: any SVG they catch
+# gets its fingerprint added, so re-exported copies match from then on
 BAD_PATH_START = "M 12.43 12.08 C 11.03 13.45 10.19 16.20 11.22"
+BAD_SVG_MD5 = {"6d3fcd35ceeeb1e0c043f00a09bd9ced": "Clever AI placeholder"}
 
 # Raster Signature (Everlyn)
 BAD_PHASH = imagehash.hex_to_hash("c0193fe6c0193fe6")
 
+
+class Match(NamedTuple):
+    id: str
+    name: str
+    reason: str
+    # Set when a legacy signature caught an SVG the index doesn't know yet
+    fingerprint: Optional[str] = None
+    label: Optional[str] = None
+
+
 def check_logo(tool):
-    tid = tool["id"]
-    url = tool["logo"]
+    tid = tool.id
+    url = tool.logo
     if not url: return None
     
     try:
@@ -23,20 +43,19 @@ def check_logo(tool):
         resp = requests.get(url, timeout=5, headers={"User-Agent": "Mozilla/5.0"})
         content = resp.content
         
-        # Check SVG
+        # Check SVG: one index lookup on the canonical geometry
         if b"<svg" in content[:100].lower() or url.lower().endswith(".svg"):
-            try:
-                content_str = content.decode("utf-8", errors="ignore")
-                if BAD_PATH_START in content_str:
-                    return (tid, tool["name"], "SVG_PATH_MATCH")
-                    
-                # Also check MD5 for exact dupes
+            fp, label = SVG_INDEX.lookup(content)
+            if label:
+                return Match(tid, tool.name, f"SVG_FINGERPRINT_MATCH ({label})")
+
+            if fp:
                 md5 = hashlib.md5(content).hexdigest()
-                # Known bad MD5s from previous scan (Clever AI)
-                if md5 == "6d3fcd35ceeeb1e0c043f00a09bd9ced":
-                    return (tid, tool["name"], "SVG_MD5_MATCH")
-            except:
-                pass
+                if md5 in BAD_SVG_MD5:
+                    return Match(tid, tool.name, "SVG_MD5_MATCH", fp, BAD_SVG_MD5[md5])
+                if BAD_PATH_START in content.decode("utf-8", errors="ignore"):
+                    return Match(tid, tool.name, "SVG_PATH_MATCH", fp, "Google Imagen placeholder")
+            return None
                 
         # Check Raster (PNG/JPG/WEBP)
         try:
@@ -45,7 +64,7 @@ def check_logo(tool):
             # Threshold for similarity (0 = identical, < 5 quite similar)
             diff = phash - BAD_PHASH
             if diff < 10: # Allow slight variations
-                return (tid, tool["name"], f"RASTER_PHASH_MATCH (diff={diff})")
+                return Match(tid, tool.name, f"RASTER_PHASH_MATCH (diff={diff})")
         except:
             pass
 
@@ -56,9 +75,11 @@ def check_logo(tool):
     return None
 
 def main():
-    with open("scraper/crawled_tools.json") as f:
-        tools = json.load(f)
+    tools = load_tools("scraper/crawled_tools.json")
         
+    # Fetch any reference placeholder the index doesn't know yet
+    SVG_INDEX.seed()
+
     print(f"Scanning {len(tools)} tools visually...")
     bad_tools = []
     
@@ -70,8 +91,12 @@ def main():
         for future in concurrent.futures.as_completed(futures):
             res = future.result()
             if res:
+                if res.fingerprint and res.fingerprint not in SVG_INDEX.labels:
+                    # Caught by a legacy signature: learn its fingerprint
+                    SVG_INDEX.add(res.fingerprint, res.label)
+                    print(f"  📌 Added fingerprint {res.fingerprint} ({res.label})")
                 bad_tools.append(res)
-                print(f"🚨 MATCH found: {res[1]} ({res[2]})")
+                print(f"🚨 MATCH found: {res.name} ({res.reason})")
             
             count += 1
             if count % 100 == 0:
@@ -80,7 +105,7 @@ def main():
     print(f"\n✅ Scan complete. Found {len(bad_tools)} matches.")
     
     with open("scraper/bad_ids_visual.json", "w") as f:
-        json.dump([t[0] for t in bad_tools], f)
+        json.dump([t.id for t in bad_tools], f)
     print("Saved to scraper/bad_ids_visual.json")
 
 if __name__ == "__main__":
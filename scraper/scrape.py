@@ -7,17 +7,30 @@ v4 enforces navigation success by checking URL/Title and retrying.
 
 Usage:
   python3 scrape.py
+
+Distributed (shards leased from a shared table, see shard_leases.py):
+  python3 scrape.py --seed [--reset] --leases supabase     # once, from any host
+  python3 scrape.py --worker --leases supabase --headless  # on every host
+  python3 shard_merge.py --leases supabase                 # afterwards
 """
 
 import asyncio
 import argparse
-import json
+import heapq
 import os
 import re
+import resource
+import socket
 import sys
+import textwrap
 import time
+from collections import deque
 from urllib.parse import urljoin
-from playwright.async_api import async_playwright
+
+from crawl_state import CrawlState
+from shard_leases import LEASE_SECONDS, open_leases
+from tool_record import InvalidRecords, Tool, encode_pretty, load_tools, to_dict
+from visits import parse_visits
 
 BASE_URL = "https://theresanaiforthat.com"
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -25,7 +38,18 @@ OUTPUT_FILE = os.path.join(SCRIPT_DIR, "crawled_tools.json")
 SCROLL_PAUSE = 2.0
 CF_WAIT = 6
 MAX_STALE_SCROLLS = 10
-MAX_RETRIES = 3
+MAX_RETRIES = 3            # attempts per period and run
+RETRY_BASE_DELAY = 5       # seconds; doubles with every failed attempt
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+# Page lifecycle: a fresh tab every RECYCLE_EVERY periods, or as soon as the
+# renderer's JS heap passes HEAP_WATERMARK_MB; a fresh context every
+# CONTEXT_EVERY page recycles (or if a new tab is still over the watermark)
+RECYCLE_EVERY = 10
+HEAP_WATERMARK_MB = 768
+CONTEXT_EVERY = 5
+
+POLL_INTERVAL = 15         # seconds; idle workers re-check for expired leases and due retries
 
 MONTHS = [
     "january", "february", "march", "april", "may", "june",
@@ -56,7 +80,13 @@ def generate_period_urls():
 
 
 # ── JS Extractor ───────────────────────────────────────────
-EXTRACT_JS = """() => {
+# With prune=true, every card returned is emptied in place: the <li> and its
+# attributes stay (the site's load-more logic still sees the same items) and
+# its height is pinned (scroll position and the infinite-scroll sentinel
+# don't move), but its subtree, images included, is dropped. Later calls only
+# see cards that are still full, so each evaluate costs the same however
+# long the list gets.
+EXTRACT_JS = """(prune = false) => {
     const results = [];
     // SCOPED: only select links inside main tool list items (class="li")
     const links = document.querySelectorAll('li.li a[href*="/ai/"]');
@@ -83,10 +113,22 @@ EXTRACT_JS = """() => {
         const img = card.querySelector('img');
         const logo = img ? (img.src || img.getAttribute('data-src') || '') : '';
         
-        results.push({ slug, raw_text: text, logo, url: href });
+        results.push({ slug, raw_text: text, logo, url: href, card });
         if (results.length >= 2000) break; 
     }
-    return results;
+    if (prune) {
+        // Measure everything first, then write: no layout thrash per card
+        const cards = [...new Set(results.map(r => r.card))];
+        const heights = cards.map(c => c.getBoundingClientRect().height);
+        cards.forEach((c, i) => {
+            c.style.boxSizing = 'border-box';
+            c.style.height = heights[i] + 'px';
+            c.style.contain = 'strict';
+            c.replaceChildren();
+            c.dataset.pruned = '1';
+        });
+    }
+    return results.map(({ card, ...r }) => r);
 }"""
 
 
@@ -101,20 +143,22 @@ class Progress:
         self.start = time.time()
         self.period_start_time = 0
 
-    def begin(self, label):
-        self.current += 1
+    def begin(self, label, attempt=1):
+        if attempt == 1:
+            self.current += 1
         self.period_start_time = time.time()
         # Calculate pct based on total original periods
-        pct = self.current / self.total * 100
+        pct = min(self.current / self.total, 1) * 100
         bar = "█" * int(pct / 100 * 30) + "░" * (30 - int(pct / 100 * 30))
-        print(f"\n  [{bar}] {pct:5.1f}%  Period {self.current}/{self.total}: {label}")
+        retry = f" (attempt {attempt})" if attempt > 1 else ""
+        print(f"\n  [{bar}] {pct:5.1f}%  Period {self.current}/{self.total}: {label}{retry}")
 
-    def scroll(self, n, count, stale):
+    def scroll(self, n, count, stale, eval_ms=0):
         spin = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
         sys.stdout.write(
             f"\r    {spin[n % 10]} scroll #{n:<4d} │ "
             f"page: {count:>5,d} │ total: {self.tools + count:>7,d} │ "
-            f"stale: {stale}/{MAX_STALE_SCROLLS}  "
+            f"stale: {stale}/{MAX_STALE_SCROLLS} │ eval: {eval_ms:>4.0f}ms  "
         )
         sys.stdout.flush()
 
@@ -143,44 +187,194 @@ class Progress:
         print(f"  🎉 SCRAPING COMPLETE!")
         print(f"  📊 Total tools captured (this session): {self.tools:,d}")
         print(f"  ⏱  Time: {e/60:.1f} min")
+        print(f"  🧠 Peak RSS (crawler process): {peak_rss_mb():.0f} MB")
         print(f"{'='*60}\n")
 
 
-# ── Navigation & Scraping ──────────────────────────────────
-async def safe_goto(page, url, slug_hint, progress):
-    """Navigate with retry and validation."""
-    for attempt in range(MAX_RETRIES):
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ── Page Lifecycle ─────────────────────────────────────────
+class PageLifecycle:
+    """
+    Owns the browser context and the crawling tab, and replaces them before
+    they get slow. Renderer memory is read through CDP Performance.getMetrics
+    after every period. A page recycle is a new tab in the same context
+    (cookies untouched); a context recycle carries the cookies and local
+    storage over with storage_state(), so the Cloudflare clearance survives
+    and neither needs the session warm-up again.
+    """
+
+    def __init__(self, browser, recycle_every=RECYCLE_EVERY, heap_watermark_mb=HEAP_WATERMARK_MB,
+                 context_every=CONTEXT_EVERY):
+        self.browser = browser
+        self.recycle_every = recycle_every
+        self.watermark = heap_watermark_mb * 1024 * 1024
+        self.context_every = context_every
+        self.context = None
+        self.page = None
+        self.cdp = None
+        self.periods = 0          # periods on the current page
+        self.page_recycles = 0    # page recycles in the current context
+
+    async def start(self, storage_state=None):
+        self.context = await self.browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={"width": 1440, "height": 900},
+            storage_state=storage_state,
+        )
+        # Block visible tracking pixels to save resources
+        await self.context.route("**/*", lambda route: route.abort() 
+            if route.request.resource_type in ["image", "media", "font"] 
+            and "logo" not in route.request.url and "icon" not in route.request.url 
+            else route.continue_())
+        await self._new_page()
+        self.page_recycles = 0
+
+    async def _new_page(self):
+        self.page = await self.context.new_page()
+        self.cdp = await self.context.new_cdp_session(self.page)
+        await self.cdp.send("Performance.enable")
+        self.periods = 0
+
+    async def metrics(self):
+        """{"JSHeapUsedSize": bytes, "Nodes": n, ...} for the current tab ({} if CDP fails)."""
         try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=25000)
-            await asyncio.sleep(2)
-            
-            # Validation
-            curr_url = page.url
-            title = await page.title()
-            
-            # Simple check: does title or URL contain our month/year?
-            # e.g. "september" or "2024"
-            if slug_hint.lower() in curr_url.lower() or slug_hint.lower() in title.lower():
-                return True
-                
-            progress.msg(f"Nav verification failed (Attempt {attempt+1}): {curr_url}")
-            
-        except Exception as e:
-            progress.msg(f"Nav failed (Attempt {attempt+1}): {e}")
+            result = await self.cdp.send("Performance.getMetrics")
+            return {m["name"]: m["value"] for m in result["metrics"]}
+        except Exception:
+            return {}
+
+    async def recycle_page(self):
+        await self.page.close()   # also detaches its CDP session
+        await self._new_page()
+        self.page_recycles += 1
+
+    async def recycle_context(self):
+        storage = await self.context.storage_state()
+        await self.context.close()
+        await self.start(storage_state=storage)
+
+    async def after_period(self):
+        """Check the watermarks; returns a note on what was recycled, or None."""
+        self.periods += 1
+        m = await self.metrics()
+        heap = m.get("JSHeapUsedSize", 0)
+        over = heap > self.watermark
+        if not over and self.periods < self.recycle_every:
+            return None
+
+        reason = f"heap {heap / 2**20:.0f} MB" if over else f"{self.periods} periods"
+        if self.page_recycles + 1 >= self.context_every or (over and self.periods == 1):
+            # A brand-new tab over the watermark means the context itself is heavy
+            await self.recycle_context()
+            return f"new context ({reason}, {int(m.get('Nodes', 0)):,d} nodes)"
+        await self.recycle_page()
+        return f"new page ({reason}, {int(m.get('Nodes', 0)):,d} nodes)"
+
+    async def close(self):
+        if self.context:
+            await self.context.close()
+
+
+# ── Period Scheduling ──────────────────────────────────────
+class PeriodFailed(Exception):
+    pass
+
+
+class PeriodScheduler:
+    """
+    Hands out periods: the ones a previous run gave up on first (from the
+    crawl state checkpoint), then the requested range. A failed attempt is
+    checkpointed and parked in a retry queue with exponential backoff
+    instead of sleeping inline, so the crawl carries on with other periods;
+    it only waits when every remaining period is backing off.
+    """
+
+    def __init__(self, periods, state, max_attempts=MAX_RETRIES, base_delay=RETRY_BASE_DELAY):
+        self.state = state
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        carried = [{k: p[k] for k in ("url", "label", "slug_hint")} for p in state.failed_periods()]
+        self.carried = len(carried)
+        carried_urls = {p["url"] for p in carried}
+        self.queue = deque(carried + [p for p in periods if p["url"] not in carried_urls])
+        self.retries = []          # heap of (due, seq, period)
+        self.attempts = {}         # url -> attempts this run
+        self.errors = {}           # url -> last error
+        self.incomplete = []       # periods given up on this run
+        self._seq = 0
+
+    async def next(self):
+        """(period, attempt number), or None when every period is done or given up."""
+        now = time.monotonic()
+        if self.retries and (self.retries[0][0] <= now or not self.queue):
+            due, _, period = heapq.heappop(self.retries)
+            if due > now:
+                await asyncio.sleep(due - now)
+        elif self.queue:
+            period = self.queue.popleft()
+        else:
+            return None
+        return period, self.attempts.get(period["url"], 0) + 1
+
+    def succeeded(self, period):
+        self.state.period_done(period, self.attempts.get(period["url"], 0) + 1)
+
+    def failed(self, period, error):
+        """Checkpoint the failure; returns the retry delay, or None if out of attempts."""
+        n = self.attempts[period["url"]] = self.attempts.get(period["url"], 0) + 1
+        self.errors[period["url"]] = error
+        self.state.period_failed(period, n, error)
+        if n < self.max_attempts:
+            delay = self.base_delay * 2 ** (n - 1)
+            self._seq += 1
+            heapq.heappush(self.retries, (time.monotonic() + delay, self._seq, period))
+            return delay
+        self.incomplete.append(period)
+        return None
+
+    def report(self):
+        if not self.incomplete:
+            print("  ✅ All periods complete.")
+            return
+        print(f"  ❌ {len(self.incomplete)} incomplete periods (retried first on the next run):")
+        for p in self.incomplete:
+            print(f"     - {p['label']:<16} {p['url']}  ({self.attempts[p['url']]} attempts: {self.errors[p['url']]})")
+
+
+# ── Navigation & Scraping ──────────────────────────────────
+async def safe_goto(page, url, slug_hint):
+    """Navigate once and validate. Returns None on success, else the reason (PeriodScheduler retries)."""
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=25000)
+        await asyncio.sleep(2)
         
-        await asyncio.sleep(3 + attempt * 2)
-    
-    return False
+        # Validation
+        curr_url = page.url
+        title = await page.title()
+        
+        # Simple check: does title or URL contain our month/year?
+        # e.g. "september" or "2024"
+        if slug_hint.lower() in curr_url.lower() or slug_hint.lower() in title.lower():
+            return None
+        return f"nav verification failed: {curr_url}"
+    except Exception as e:
+        return f"nav failed: {e}"
 
 
-async def scrape_period(page, period_data, progress):
+async def scrape_period(page, period_data, progress, prune=False):
     url = period_data["url"]
     
-    if not await safe_goto(page, url, period_data["slug_hint"], progress):
-        progress.msg(f"Skipping {period_data['label']} due to nav failure.")
-        return []
+    error = await safe_goto(page, url, period_data["slug_hint"])
+    if error:
+        raise PeriodFailed(error)
 
     # Infinite scroll loop
+    captured = {}  # slug -> Tool, in page order; pruned cards only exist here
     prev_total = 0
     stale = 0
     
@@ -208,9 +402,14 @@ async def scrape_period(page, period_data, progress):
                 stale = 0 # Reset stale if we clicked a button
         except: pass
 
-        # 3. Extract
-        tools = await page.evaluate(EXTRACT_JS)
-        current = len(tools)
+        # 3. Extract (and with prune, empty what was just captured). Each new
+        # card is parsed right away, so its raw innerText goes with the batch
+        t0 = time.perf_counter()
+        for card in await page.evaluate(EXTRACT_JS, prune):
+            if card["slug"] not in captured:
+                captured[card["slug"]] = parse_card(card)
+        eval_ms = (time.perf_counter() - t0) * 1000
+        current = len(captured)
         
         if current > prev_total:
             stale = 0
@@ -218,85 +417,254 @@ async def scrape_period(page, period_data, progress):
         else:
             stale += 1
             
-        progress.scroll(scroll, current, stale)
+        progress.scroll(scroll, current, stale, eval_ms)
         
         # INCREASED STALE THRESHOLD
         if stale >= 20: 
             break
             
-    return tools
+    return list(captured.values())
+
+
+# ── Distributed Crawl ──────────────────────────────────────
+async def keep_lease(leases, shard, worker, lease_seconds, scrape):
+    """Heartbeat every third of the lease. If the lease is lost, cancel `scrape` and return True."""
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        try:
+            held = await asyncio.to_thread(leases.heartbeat, shard["url"], worker, lease_seconds)
+        except Exception:
+            continue  # a missed beat still leaves two thirds of the lease
+        if not held:
+            scrape.cancel()
+            return True
+
+
+async def run_worker(pages, leases, worker, progress, args):
+    """
+    Claim shards until none are left anywhere. A shard's records go back to
+    the lease table (merged later by shard_merge.py); dedup against earlier
+    crawls happens at merge time, so workers need no shared local state.
+    """
+    shards_done = 0
+    while True:
+        shard = await asyncio.to_thread(leases.claim, worker, args.lease_seconds, MAX_RETRIES)
+        if shard is None:
+            counts = await asyncio.to_thread(leases.status)
+            if not counts["pending"] and not counts["leased"]:
+                return shards_done
+            # The rest is leased by other workers or backing off: wait for a
+            # lease to expire (dead worker) or a retry to come due
+            await asyncio.sleep(POLL_INTERVAL)
+            continue
+
+        progress.begin(shard["label"], shard["attempts"])
+        scrape = asyncio.create_task(scrape_period(pages.page, shard, progress, args.prune_dom))
+        heartbeat = asyncio.create_task(keep_lease(leases, shard, worker, args.lease_seconds, scrape))
+        error = None
+        try:
+            tools = await scrape
+        except asyncio.CancelledError:
+            if not (heartbeat.done() and heartbeat.result()):
+                raise
+            progress.msg(f"{shard['label']}: lease lost to another worker, dropping it")
+            await pages.recycle_page()
+            continue
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        finally:
+            heartbeat.cancel()
+
+        if error:
+            await asyncio.to_thread(leases.finish, shard["url"], worker, None, error)
+            progress.msg(f"{shard['label']}: {error} → handed back for retry")
+            await pages.recycle_page()
+            continue
+
+        records = [to_dict(t) for t in tools]
+        del tools
+        if await asyncio.to_thread(leases.finish, shard["url"], worker, records):
+            shards_done += 1
+            progress.done(len(records))
+        else:
+            progress.msg(f"{shard['label']}: lease expired before the hand-back, output dropped")
+
+        recycled = await pages.after_period()
+        if recycled:
+            print(f"    ♻️  {recycled}")
 
 
 # ── Parse ──────────────────────────────────────────────────
-def parse_tools(raw_tools):
-    parsed = []
-    for t in raw_tools:
-        raw = t.get("raw_text", "")
-        # Strip Unicode line/paragraph separators (U+2028, U+2029)
-        raw = raw.replace('\u2028', ' ').replace('\u2029', ' ')
-        # Split and clean lines from raw_text
-        lines = [l.strip() for l in raw.split('\n') if l.strip()]
-        
-        # Default name from slug
-        name = t.get("slug").replace("-", " ").title()
-        desc = ""
-        stats_visits = "0"
-        
-        candidate_name = None
-        
-        for i, line in enumerate(lines):
-            # Skip noise
-            if re.match(r'^(Featured|Sponsored|Verified|New|Trending|Free|Paid|Freemium)$', line, re.I): continue
-            if re.match(r'^#\d+', line): continue # Ranking
-            
-            if not candidate_name:
-                candidate_name = line
-                continue
-                
-            # If we have a name, next long line is likely description
-            if not desc and len(line) > 20 and "AI tools" not in line and not re.match(r'^[\d,.+]+$', line):
-                desc = line
-                break
-        
-        if candidate_name:
-            name = candidate_name
-
-        # Pricing logic
-        pricing, pricing_label = "free", "Free"
-        rl = raw.lower()
-        if "freemium" in rl: pricing, pricing_label = "freemium", "Freemium"
-        elif "paid" in rl or "$" in raw: pricing = "paid"; pricing_label = "Paid" 
-        elif "free trial" in rl: pricing, pricing_label = "freemium", "Free Trial"
-
-        # Visits extraction
-        vm = re.search(r'([\d,.]+)\s*[KkMmBb]', raw)
-        if vm: stats_visits = vm.group(0).strip()
-        
-        logo = t.get("logo", "")
-        if logo and not logo.startswith("http"): logo = ""
-
-        # Validate name
-        if len(name) > 50: name = t["slug"].replace("-", " ").title()
-
-        parsed.append({
-            "id": t["slug"],
-            "name": name, 
-            "description": desc,
-            "url": urljoin(BASE_URL, t["url"]),
-            "category": "other", "category_label": "Other", "tags": [],
-            "pricing": pricing, "pricing_label": pricing_label,
-            "visits": stats_visits, "rating": 0, "logo": logo,
-            "is_new": False, "is_trending": False, "launch_date": "",
-        })
-    return parsed
+def parse_card(t):
+    """Raw card from EXTRACT_JS -> Tool (the card's raw innerText is not kept)."""
+    raw = t.get("raw_text", "")
+    # Strip Unicode line/paragraph separators (U+2028, U+2029)
+    raw = raw.replace('\u2028', ' ').replace('\u2029', ' ')
+    # Split and clean lines from raw_text
+    lines = [l.strip() for l in raw.split('\n') if l.strip()]
+
+    # Default name from slug
+    name = t.get("slug").replace("-", " ").title()
+    desc = ""
+    stats_visits = "0"
+
+    candidate_name = None
+
+    for i, line in enumerate(lines):
+        # Skip noise
+        if re.match(r'^(Featured|Sponsored|Verified|New|Trending|Free|Paid|Freemium)$', line, re.I): continue
+        if re.match(r'^#\d+', line): continue # Ranking
+
+        if not candidate_name:
+            candidate_name = line
+            continue
+
+        # If we have a name, next long line is likely description
+        if not desc and len(line) > 20 and "AI tools" not in line and not re.match(r'^[\d,.+]+$', line):
+            desc = line
+            break
+
+    if candidate_name:
+        name = candidate_name
+
+    # Pricing logic
+    pricing, pricing_label = "free", "Free"
+    rl = raw.lower()
+    if "freemium" in rl: pricing, pricing_label = "freemium", "Freemium"
+    elif "paid" in rl or "$" in raw: pricing = "paid"; pricing_label = "Paid" 
+    elif "free trial" in rl: pricing, pricing_label = "freemium", "Free Trial"
+
+    # Visits extraction: the first stats line on its own ("205,308", "10.5K"),
+    # never part of "2mo ago" or a "/mo" price
+    for line in lines:
+        if re.match(r'^\d{1,3}(,\d{3})*(\.\d+)?\s*[KkMmBb]?$', line):
+            stats_visits = line
+            break
+
+    logo = t.get("logo", "")
+    if logo and not logo.startswith("http"): logo = ""
+
+    # Validate name
+    if len(name) > 50: name = t["slug"].replace("-", " ").title()
+
+    return Tool(
+        id=t["slug"], name=name, description=desc, url=urljoin(BASE_URL, t["url"]),
+        pricing=pricing, pricing_label=pricing_label,
+        visits=stats_visits, visits_count=parse_visits(stats_visits), logo=logo,
+    )
+
+
+# ── Output ─────────────────────────────────────────────────
+def encode_record(tool):
+    """One list element exactly as json.dump(..., indent=2) writes it."""
+    return textwrap.indent(encode_pretty(tool), "  ")
+
+
+def array_head(path):
+    """
+    Length of a JSON array file up to the end of its last element (the
+    closing bracket and the whitespace before it excluded); 0 if it has none.
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 4096))
+        tail = f.read()
+    head = tail[:tail.rfind(b"]")].rstrip()
+    if head.endswith(b"["):
+        return 0
+    return size - len(tail) + len(head)
+
+
+def save_output(existing_bytes, new_tools):
+    """
+    Write existing + new records. The existing records are the first
+    `existing_bytes` of the current output file, copied over unchanged in
+    chunks (earlier saves kept them byte for byte), so they are never held
+    in memory; new records are written one element at a time.
+    """
+    tmp = OUTPUT_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        if existing_bytes:
+            with open(OUTPUT_FILE, "rb") as src:
+                left = existing_bytes
+                while left:
+                    chunk = src.read(min(left, 1 << 20))
+                    f.write(chunk)
+                    left -= len(chunk)
+            sep = b",\n"
+        else:
+            f.write(b"[")
+            sep = b"\n"
+        for card in new_tools:
+            f.write(sep + encode_record(card).encode("utf-8"))
+            sep = b",\n"
+        f.write(b"\n]" if sep == b",\n" else b"]")
+    os.replace(tmp, OUTPUT_FILE)
 
 
 # ── Main ───────────────────────────────────────────────────
+async def open_session(p, args):
+    browser = await p.chromium.launch(
+        headless=args.headless,
+        args=["--disable-blink-features=AutomationControlled"],
+    )
+    pages = PageLifecycle(browser, args.recycle_every, args.heap_watermark, args.context_every)
+    await pages.start()
+
+    print(f"\n  🌐 Session setup ...")
+    try:
+        await pages.page.goto(BASE_URL, wait_until="domcontentloaded", timeout=30000)
+    except: pass
+    await asyncio.sleep(CF_WAIT)
+    return browser, pages
+
+
+async def main_distributed(args, periods):
+    leases = open_leases(args.leases)
+    if args.seed:
+        leases.seed(periods, reset=args.reset)
+        print(f"  🧩 Seeded {len(periods)} shards ({'fresh round' if args.reset else 'existing progress kept'})")
+    counts = leases.status()
+    print(f"  🧩 Shards: {counts['done']} done, {counts['pending']} pending, "
+          f"{counts['leased']} leased, {counts['failed']} failed")
+    if not args.worker:
+        return
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"  👷 Worker {worker}")
+    progress = Progress(sum(counts.values()), start_offset=counts["done"])
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser, pages = await open_session(p, args)
+        shards_done = await run_worker(pages, leases, worker, progress, args)
+        await pages.close()
+        await browser.close()
+    progress.finish()
+    print(f"  🧩 {shards_done} shards crawled by this worker; merge with shard_merge.py --leases {args.leases}")
+
+
 async def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--max-periods", type=int, default=None)
     parser.add_argument("--start-period", type=int, default=1, help="Start from this period number (1-indexed)")
     parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--recycle-every", type=int, default=RECYCLE_EVERY, help="Fresh tab every N periods")
+    parser.add_argument("--heap-watermark", type=int, default=HEAP_WATERMARK_MB, metavar="MB",
+                        help="Fresh tab once the renderer JS heap passes this")
+    parser.add_argument("--context-every", type=int, default=CONTEXT_EVERY,
+                        help="Fresh browser context (cookies kept) every N tab recycles")
+    parser.add_argument("--prune-dom", action="store_true",
+                        help="Empty cards in the page once captured (constant DOM size while scrolling)")
+    parser.add_argument("--leases", default="supabase", metavar="BACKEND",
+                        help="Shard lease table for --seed/--worker: supabase or sqlite:PATH")
+    parser.add_argument("--seed", action="store_true",
+                        help="Put the selected periods into the lease table as shards")
+    parser.add_argument("--reset", action="store_true", help="With --seed: start a fresh round")
+    parser.add_argument("--worker", action="store_true",
+                        help="Crawl shards claimed from the lease table until none are left")
+    parser.add_argument("--lease-seconds", type=int, default=LEASE_SECONDS,
+                        help="Lease length; heartbeats renew it every third of that")
     args = parser.parse_args()
 
     all_periods = generate_period_urls()
@@ -307,66 +675,86 @@ async def main():
     periods = all_periods[start_idx:]
     if args.max_periods: periods = periods[:args.max_periods]
 
+    if args.seed or args.worker:
+        return await main_distributed(args, periods)
+
     # Load existing data to preserve it
     existing_data = []
-    seen_slugs = set()
     if os.path.exists(OUTPUT_FILE):
         try:
-            with open(OUTPUT_FILE, 'r') as f:
-                existing_data = json.load(f)
-                seen_slugs = {t['id'] for t in existing_data}
+            existing_data = load_tools(OUTPUT_FILE)
             print(f"  📂 Loaded {len(existing_data)} existing tools from {OUTPUT_FILE}")
+        except InvalidRecords as e:
+            # Saving would drop the file's records: stop instead
+            print(f"  ❌ {e}")
+            sys.exit(1)
         except Exception as e:
             print(f"  ⚠️ Could not load existing file: {e}")
 
+    # Dedup against the shared crawl state. It outlives the output file, so
+    # re-record what the file holds and forget crawled tools it no longer has
+    # (a reset or edited file) before trusting it
+    state = CrawlState()
+    t_sync = time.time()
+    state.record_many((t.id, t.url, "taaft", to_dict(t)) for t in existing_data)
+    pruned = state.prune("taaft", before=t_sync)
+    if pruned:
+        print(f"  🗂  {pruned} crawled tools missing from {os.path.basename(OUTPUT_FILE)} dropped from the crawl state")
+
+    # Existing records are only ever written back unchanged: saves copy them
+    # straight from the file instead of keeping them in memory
+    existing_bytes = array_head(OUTPUT_FILE) if existing_data else 0
+    del existing_data
+
     progress = Progress(total_periods, start_offset=start_idx)
-    global_tools = {} # Stores NEW tools only
+    new_tools = []  # Tools first seen in this run; recorded into the crawl state after each save
+    from playwright.async_api import async_playwright
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=args.headless,
-            args=["--disable-blink-features=AutomationControlled"],
-        )
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            viewport={"width": 1440, "height": 900},
-        )
-        # Block visible tracking pixels to save resources
-        await context.route("**/*", lambda route: route.abort() 
-            if route.request.resource_type in ["image", "media", "font"] 
-            and "logo" not in route.request.url and "icon" not in route.request.url 
-            else route.continue_())
-
-        page = await context.new_page()
-
-        print(f"\n  🌐 Session setup ...")
-        try:
-            await page.goto(BASE_URL, wait_until="domcontentloaded", timeout=30000)
-        except: pass
-        await asyncio.sleep(CF_WAIT)
+        browser, pages = await open_session(p, args)
+
+        scheduler = PeriodScheduler(periods, state)
+        if scheduler.carried:
+            print(f"  🔁 Retrying {scheduler.carried} periods left incomplete by the last run first")
+
+        while (job := await scheduler.next()) is not None:
+            period, attempt = job
+            progress.begin(period["label"], attempt)
+            try:
+                # Cards come back as Tools; the raw innerText was dropped batch by batch
+                cards = await scrape_period(pages.page, period, progress, args.prune_dom)
+            except Exception as e:
+                # PeriodFailed, or the tab died mid-scroll: park it and move on
+                delay = scheduler.failed(period, str(e) or type(e).__name__)
+                progress.msg(f"{period['label']}: {e} → " + (f"retry in {delay}s" if delay else "giving up for this run"))
+                await pages.recycle_page()
+                continue
 
-        for period in periods:
-            progress.begin(period["label"])
-            raw = await scrape_period(page, period, progress)
-            
-            # Dedup
+            # Dedup: cards of earlier periods, other sources and the output file are in the crawl state
             new_count = 0
-            for t in raw:
-                # Check against both global NEW tools and EXISTING file tools
-                if t["slug"] not in global_tools and t["slug"] not in seen_slugs:
-                    global_tools[t["slug"]] = t
+            for card in cards:
+                if not state.seen(slug=card.id, url=card.url):
+                    new_tools.append(card)
                     new_count += 1
             progress.done(new_count)
 
             # Auto-save (Merge existing + new)
-            new_parsed = parse_tools(list(global_tools.values()))
-            combined_data = existing_data + new_parsed
-            
-            with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-                json.dump(combined_data, f, indent=2, ensure_ascii=False)
+            save_output(existing_bytes, new_tools)
+
+            # Record after the save so the state never runs ahead of the JSON
+            # (re-sightings just refresh last_seen and content_hash)
+            state.record_many((c.id, c.url, "taaft", to_dict(c)) for c in cards)
+            scheduler.succeeded(period)
+
+            recycled = await pages.after_period()
+            if recycled:
+                print(f"    ♻️  {recycled}")
 
+        await pages.close()
         await browser.close()
+    state.close()
     progress.finish()
+    scheduler.report()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,263 @@
+"""
+Shard Leases — which worker crawls which listing period.
+
+Distributed crawls (scrape.py --worker) split the period list into shards,
+one per period, kept in a shared lease table. A worker claims the next free
+shard with a time-limited lease, extends the lease with heartbeats while it
+scrolls, and hands the shard back with its records (done) or an error
+(pending again after a backoff, failed after too many attempts). A worker
+that dies stops heartbeating; once its lease runs out the shard is claimable
+again, so nobody has to notice the crash.
+
+Two interchangeable backends:
+  SupabaseLeases  the crawl_shards table (migrations/create_crawl_shards.sql);
+                  claims use SELECT ... FOR UPDATE SKIP LOCKED
+  SqliteLeases    the same protocol in a local SQLite file (BEGIN IMMEDIATE),
+                  for tests and for several workers on one host
+
+Usage:
+  leases = open_leases("sqlite:shards.sqlite")   # or "supabase"
+  leases.seed(periods)
+  while (shard := leases.claim(worker)):
+      ...
+      leases.heartbeat(shard["url"], worker)
+      leases.finish(shard["url"], worker, records=[...])
+"""
+
+import json
+import sqlite3
+import time
+
+from supabase_client import get_supabase
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+RETRY_SECONDS = 30     # doubles with every failed attempt
+
+SHARD_FIELDS = ("url", "label", "slug_hint", "position", "status", "worker", "attempts", "last_error", "record_count")
+
+SCHEMA = """
+create table if not exists crawl_shards (
+  id            text primary key,
+  label         text not null,
+  slug_hint     text not null,
+  position      integer not null default 0,
+  status        text not null default 'pending',   -- pending | leased | done | failed
+  worker        text,
+  lease_expires real,
+  attempts      integer not null default 0,
+  last_error    text,
+  output        text,                               -- JSON list of records
+  record_count  integer,
+  updated_at    real not null
+);
+create index if not exists idx_crawl_shards_claim on crawl_shards(status, position);
+"""
+
+
+def open_leases(spec):
+    """'sqlite:PATH' or 'supabase'."""
+    if spec.startswith("sqlite:"):
+        return SqliteLeases(spec.removeprefix("sqlite:"))
+    if spec == "supabase":
+        return SupabaseLeases(get_supabase())
+    raise ValueError(f"unknown lease backend: {spec} (use sqlite:PATH or supabase)")
+
+
+def _shard(row):
+    """Lease-table row -> the period dict scrape.py works with (plus lease bookkeeping)."""
+    shard = {k: row.get(k) for k in SHARD_FIELDS if k != "url"}
+    shard["url"] = row["id"]
+    return shard
+
+
+class SqliteLeases:
+    """
+    Lease table in a SQLite file. Every call opens its own connection, so
+    one instance can be used from worker threads (heartbeats run in
+    asyncio.to_thread) and several processes can share the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.execute("pragma journal_mode=wal")
+            db.executescript(SCHEMA)
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def seed(self, periods, reset=False):
+        """Add periods (in crawl order); reset=True starts a fresh round. Returns rows written."""
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("begin immediate")
+            for pos, p in enumerate(periods):
+                if reset:
+                    db.execute("delete from crawl_shards where id = ?", (p["url"],))
+                db.execute(
+                    "insert into crawl_shards (id, label, slug_hint, position, updated_at) values (?, ?, ?, ?, ?)"
+                    " on conflict(id) do update set position = excluded.position, updated_at = excluded.updated_at",
+                    (p["url"], p["label"], p["slug_hint"], pos, now),
+                )
+            db.execute("commit")
+        finally:
+            db.close()
+        return len(periods)
+
+    def claim(self, worker, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        """Lease the next claimable shard to `worker`; None if nothing is claimable right now."""
+        now = time.time()
+        db = self._connect()
+        try:
+            # The write lock is taken up front, so two workers can't pick the same row
+            db.execute("begin immediate")
+            self._expire(db, now, max_attempts)
+            row = db.execute(
+                "select id from crawl_shards"
+                " where attempts < ? and ((status = 'pending' and (lease_expires is null or lease_expires <= ?))"
+                "   or (status = 'leased' and lease_expires <= ?))"
+                " order by position limit 1",
+                (max_attempts, now, now),
+            ).fetchone()
+            if not row:
+                db.execute("commit")
+                return None
+            db.execute(
+                "update crawl_shards set status = 'leased', worker = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated_at = ? where id = ?",
+                (worker, now + lease_seconds, now, row["id"]),
+            )
+            claimed = db.execute("select * from crawl_shards where id = ?", (row["id"],)).fetchone()
+            db.execute("commit")
+            return _shard(dict(claimed))
+        finally:
+            db.close()
+
+    def _expire(self, db, now, max_attempts):
+        """Expired leases that have used up their attempts become failed instead of claimable."""
+        db.execute(
+            "update crawl_shards set status = 'failed', last_error = coalesce(last_error, 'lease expired'),"
+            " updated_at = ? where status = 'leased' and lease_expires <= ? and attempts >= ?",
+            (now, now, max_attempts),
+        )
+
+    def heartbeat(self, url, worker, lease_seconds=LEASE_SECONDS):
+        """Extend the lease; False if it was lost (expired and taken over)."""
+        now = time.time()
+        db = self._connect()
+        try:
+            cur = db.execute(
+                "update crawl_shards set lease_expires = ?, updated_at = ?"
+                " where id = ? and worker = ? and status = 'leased'",
+                (now + lease_seconds, now, url, worker),
+            )
+            return cur.rowcount == 1
+        finally:
+            db.close()
+
+    def finish(self, url, worker, records=None, error=None, retry_seconds=RETRY_SECONDS,
+               max_attempts=MAX_ATTEMPTS):
+        """Hand the shard back with its records, or with an error. False if the lease was lost."""
+        now = time.time()
+        db = self._connect()
+        try:
+            if error is None:
+                records = records or []
+                cur = db.execute(
+                    "update crawl_shards set status = 'done', output = ?, record_count = ?,"
+                    " lease_expires = null, last_error = null, updated_at = ?"
+                    " where id = ? and worker = ? and status = 'leased'",
+                    (json.dumps(records, ensure_ascii=False), len(records), now, url, worker),
+                )
+            else:
+                cur = db.execute(
+                    "update crawl_shards set"
+                    " status = case when attempts >= ? then 'failed' else 'pending' end,"
+                    " lease_expires = ? + ? * (1 << (attempts - 1)), last_error = ?, updated_at = ?"
+                    " where id = ? and worker = ? and status = 'leased'",
+                    (max_attempts, now, retry_seconds, error, now, url, worker),
+                )
+            return cur.rowcount == 1
+        finally:
+            db.close()
+
+    def status(self):
+        """{"pending": n, "leased": n, "done": n, "failed": n}."""
+        db = self._connect()
+        try:
+            counts = dict.fromkeys(("pending", "leased", "done", "failed"), 0)
+            for status, n in db.execute("select status, count(*) from crawl_shards group by status"):
+                counts[status] = n
+            return counts
+        finally:
+            db.close()
+
+    def shards(self, status=None):
+        """Shard bookkeeping (no outputs) in crawl order."""
+        db = self._connect()
+        try:
+            sql = "select * from crawl_shards"
+            rows = db.execute(sql + (" where status = ?" if status else "") + " order by position",
+                              (status,) if status else ()).fetchall()
+            return [_shard(dict(r)) for r in rows]
+        finally:
+            db.close()
+
+    def output(self, url):
+        db = self._connect()
+        try:
+            row = db.execute("select output from crawl_shards where id = ?", (url,)).fetchone()
+            return json.loads(row["output"]) if row and row["output"] else []
+        finally:
+            db.close()
+
+
+class SupabaseLeases:
+    """Lease table in Supabase; every state change is one RPC (see the migration)."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def seed(self, periods, reset=False):
+        payload = [{"url": p["url"], "label": p["label"], "slug_hint": p["slug_hint"], "position": pos}
+                   for pos, p in enumerate(periods)]
+        return self.client.rpc("seed_crawl_shards", {"payload": payload, "reset": reset}).execute().data
+
+    def claim(self, worker, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        rows = self.client.rpc("claim_crawl_shard", {
+            "worker_id": worker, "lease_seconds": lease_seconds, "max_attempts": max_attempts,
+        }).execute().data
+        return _shard(rows[0]) if rows else None
+
+    def heartbeat(self, url, worker, lease_seconds=LEASE_SECONDS):
+        return bool(self.client.rpc("heartbeat_crawl_shard", {
+            "shard_id": url, "worker_id": worker, "lease_seconds": lease_seconds,
+        }).execute().data)
+
+    def finish(self, url, worker, records=None, error=None, retry_seconds=RETRY_SECONDS,
+               max_attempts=MAX_ATTEMPTS):
+        return bool(self.client.rpc("finish_crawl_shard", {
+            "shard_id": url, "worker_id": worker, "records": records, "error": error,
+            "retry_seconds": retry_seconds, "max_attempts": max_attempts,
+        }).execute().data)
+
+    def status(self):
+        counts = dict.fromkeys(("pending", "leased", "done", "failed"), 0)
+        for row in self.client.table("crawl_shards").select("status").limit(10000).execute().data or []:
+            counts[row["status"]] += 1
+        return counts
+
+    def shards(self, status=None):
+        query = self.client.table("crawl_shards").select(
+            "id, label, slug_hint, position, status, worker, attempts, last_error, record_count")
+        if status:
+            query = query.eq("status", status)
+        return [_shard(r) for r in query.order("position").limit(10000).execute().data or []]
+
+    def output(self, url):
+        rows = self.client.table("crawl_shards").select("output").eq("id", url).execute().data
+        return (rows[0]["output"] or []) if rows else []
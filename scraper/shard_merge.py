@@ -0,0 +1,89 @@
+"""
+Shard Merge — fold a distributed crawl into crawled_tools.json.
+
+Workers (scrape.py --worker) leave each period's records in the lease
+table. This walks the finished shards in crawl order (newest period first,
+like a single-process crawl), keeps the first sighting of every slug, and
+appends the tools the crawl state hasn't seen to crawled_tools.json.
+Re-running it is harmless: merged tools are in the crawl state, so a merge
+after more shards finish only adds their new tools.
+
+Usage:
+  python3 shard_merge.py --leases supabase
+  python3 shard_merge.py --leases sqlite:shards.sqlite [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from crawl_state import CrawlState
+from scrape import OUTPUT_FILE, encode_record, save_output
+from shard_leases import open_leases
+from tool_record import InvalidRecords, from_dict, load_tools, to_dict
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--leases", default="supabase", metavar="BACKEND", help="supabase or sqlite:PATH")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be added, write nothing")
+    args = parser.parse_args()
+
+    leases = open_leases(args.leases)
+    counts = leases.status()
+    print(f"🧩 Shards: {counts['done']} done, {counts['pending']} pending, "
+          f"{counts['leased']} leased, {counts['failed']} failed")
+    for s in leases.shards("failed"):
+        print(f"   ❌ {s['label']:<16} {s['url']}  ({s['attempts']} attempts: {s['last_error']})")
+    if counts["pending"] or counts["leased"]:
+        print("⚠️  Crawl still in progress; merging the finished shards (re-run later for the rest)")
+
+    existing_data = []
+    if os.path.exists(OUTPUT_FILE):
+        try:
+            existing_data = load_tools(OUTPUT_FILE)
+        except InvalidRecords as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    print(f"📂 {len(existing_data)} tools in {os.path.relpath(OUTPUT_FILE)}")
+
+    state = CrawlState()
+    if not len(state) and existing_data:
+        state.record_many((t.id, t.url, "taaft", to_dict(t)) for t in existing_data)
+        print(f"🗂  Seeded crawl state with {len(existing_data)} tools")
+    existing_json = [encode_record(t) for t in existing_data]
+    del existing_data
+
+    t0 = time.time()
+    new_tools = []   # first sightings, in crawl order
+    cards = {}       # slug -> first Tool of this crawl (recorded in the state after the save)
+    records = 0
+    for shard in leases.shards("done"):
+        for r in leases.output(shard["url"]):
+            records += 1
+            card = from_dict(r)
+            if card.id in cards:
+                continue
+            cards[card.id] = card
+            if not state.seen(slug=card.id):
+                new_tools.append(card)
+    print(f"🔀 {records} records from {counts['done']} shards → {len(cards)} distinct, "
+          f"{len(new_tools)} new ({time.time() - t0:.1f}s)")
+
+    if args.dry_run:
+        for card in new_tools[:20]:
+            print(f"   + {card.id:<40} {card.url}")
+        state.close()
+        return
+
+    if new_tools:
+        save_output(existing_json, new_tools)
+        print(f"💾 Saved {len(existing_json) + len(new_tools)} tools to {os.path.relpath(OUTPUT_FILE)}")
+    # Re-sightings refresh last_seen/content_hash, as in a single-process crawl
+    state.record_many((c.id, c.url, "taaft", to_dict(c)) for c in cards.values())
+    state.close()
+
+
+if __name__ == "__main__":
+    main()
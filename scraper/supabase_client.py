@@ -0,0 +1,79 @@
+"""
+Supabase Client — one way for every script to find its credentials.
+
+Scripts used to build a client at import time, each from its own pair of
+environment variables (SUPABASE_URL/SUPABASE_KEY, SUPABASE_SERVICE_KEY,
+NEXT_PUBLIC_SUPABASE_URL/SUPABASE_SERVICE_ROLE_KEY), so even `--help` or a
+dry run needed credentials and paid for importing supabase. get_supabase()
+reads .env.local and connects on first use instead.
+
+The names are the ones the Next.js app reads from .env.local:
+  NEXT_PUBLIC_SUPABASE_URL    project URL
+  SUPABASE_SERVICE_ROLE_KEY   service role key (bypasses RLS)
+SUPABASE_URL, SUPABASE_KEY and SUPABASE_SERVICE_KEY still work, with a warning.
+
+Usage:
+  from supabase_client import get_supabase
+  supabase = get_supabase()
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILE = os.path.join(ROOT_DIR, ".env.local")
+
+URL_VARS = ("NEXT_PUBLIC_SUPABASE_URL", "SUPABASE_URL")
+KEY_VARS = ("SUPABASE_SERVICE_ROLE_KEY", "SUPABASE_SERVICE_KEY", "SUPABASE_KEY")
+ANON_KEY_VAR = "NEXT_PUBLIC_SUPABASE_ANON_KEY"
+
+_client = None
+
+
+def load_env():
+    """Load .env.local (variables already set in the environment win)."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        if os.path.exists(ENV_FILE):
+            print(f"⚠️  python-dotenv not installed, {os.path.relpath(ENV_FILE)} not read", file=sys.stderr)
+        return
+    load_dotenv(dotenv_path=ENV_FILE)
+
+
+def _getenv(names):
+    for name in names:
+        value = os.getenv(name)
+        if value:
+            if name != names[0]:
+                print(f"⚠️  {name} is deprecated, set {names[0]} instead", file=sys.stderr)
+            return value
+    return None
+
+
+def credentials(allow_anon=False):
+    """(url, key) from the environment / .env.local; allow_anon falls back to the anon key."""
+    load_env()
+    url = _getenv(URL_VARS)
+    key = _getenv(KEY_VARS)
+    if not key and allow_anon:
+        key = os.getenv(ANON_KEY_VAR)
+    return url, key
+
+
+def get_supabase(allow_anon=False):
+    """The shared client, created on first call; exits if credentials are missing."""
+    global _client
+    if _client is None:
+        url, key = credentials(allow_anon)
+        if not url or not key:
+            print(f"❌ Error: Missing Supabase credentials. Set {URL_VARS[0]} and {KEY_VARS[0]} "
+                  f"in {os.path.relpath(ENV_FILE)} or the environment.")
+            sys.exit(1)
+        try:
+            from supabase import create_client
+        except ImportError:
+            print("❌ supabase-py not installed. Run: pip install supabase")
+            sys.exit(1)
+        _client = create_client(url, key)
+    return _client
@@ -0,0 +1,417 @@
+"""
+SVG Fingerprint — structural hash of a vector logo.
+
+Two SVGs of the same drawing rarely share bytes: exporters reorder
+elements, switch between relative and absolute commands, wrap groups in
+transforms, change the viewBox scale, pad numbers or add metadata. The
+canonical form keeps only the geometry:
+
+  - one streaming pass (lxml iterparse, no DOM), skipping <defs>,
+    <metadata>, <title>, clip paths and masks
+  - group/element transforms applied, coordinates mapped into the unit
+    viewBox, rounded to 1/1000 of the logo size
+  - every command absolute, H/V written as L, rect/line/polygon/polyline as
+    paths, circles/ellipses as a centre + radii token
+  - styles, ids and colours ignored; shapes sorted, so order doesn't matter
+
+The fingerprint is a hash of that sorted path set. Known placeholders live
+in svg_fingerprints.json ({fingerprint: label}), so checking any vector
+logo is one dict lookup. The index is seeded from PLACEHOLDER_SOURCES, the
+reference copies of the placeholders we know about, on first use.
+
+Usage:
+  python3 svg_fingerprint.py show FILE|URL...              # fingerprint + canonical paths
+  python3 svg_fingerprint.py add FILE|URL --label "..."     # mark as placeholder
+  python3 svg_fingerprint.py seed                          # fingerprint PLACEHOLDER_SOURCES
+  python3 svg_fingerprint.py scan [DIR]                    # check public/logos/**/*.svg
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import sys
+
+from lxml import etree
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_FILE = os.path.join(SCRIPT_DIR, "svg_fingerprints.json")
+MIRROR_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "public", "logos")
+PRECISION = 3
+
+# Reference copies of known placeholder logos (see analyze_visuals.py)
+PLACEHOLDER_SOURCES = {
+    "https://media.theresanaiforthat.com/icons/imagen2-by-google.svg?height=207": "Google Imagen placeholder",
+    "https://media.theresanaiforthat.com/icons/clever-ai-humanizer.svg?height=207": "Clever AI placeholder",
+}
+
+SKIP_SUBTREES = {"defs", "metadata", "title", "desc", "clipPath", "mask", "symbol", "style", "script"}
+SHAPES = {"path", "rect", "circle", "ellipse", "line", "polyline", "polygon"}
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)   # a b c d e f, as in SVG matrix()
+
+_NUM_RE = re.compile(r'[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?')
+_TRANSFORM_RE = re.compile(r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)')
+_PATH_TOKEN_RE = re.compile(r'[MmLlHhVvCcSsQqTtAaZz]|[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?')
+
+
+# ── Transforms ─────────────────────────────────────────────
+def _mul(m, n):
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (a * a2 + c * b2, b * a2 + d * b2, a * c2 + c * d2, b * c2 + d * d2,
+            a * e2 + c * f2 + e, b * e2 + d * f2 + f)
+
+
+def parse_transform(value):
+    m = IDENTITY
+    for name, args in _TRANSFORM_RE.findall(value or ""):
+        v = [float(x) for x in _NUM_RE.findall(args)]
+        if name == "matrix" and len(v) == 6:
+            t = tuple(v)
+        elif name == "translate" and v:
+            t = (1, 0, 0, 1, v[0], v[1] if len(v) > 1 else 0)
+        elif name == "scale" and v:
+            t = (v[0], 0, 0, v[1] if len(v) > 1 else v[0], 0, 0)
+        elif name == "rotate" and v:
+            r = math.radians(v[0])
+            t = (math.cos(r), math.sin(r), -math.sin(r), math.cos(r), 0, 0)
+            if len(v) == 3:
+                t = _mul(_mul((1, 0, 0, 1, v[1], v[2]), t), (1, 0, 0, 1, -v[1], -v[2]))
+        elif name == "skewX" and v:
+            t = (1, 0, math.tan(math.radians(v[0])), 1, 0, 0)
+        elif name == "skewY" and v:
+            t = (1, math.tan(math.radians(v[0])), 0, 1, 0, 0)
+        else:
+            continue
+        m = _mul(m, t)
+    return m
+
+
+def _apply(m, x, y):
+    return m[0] * x + m[2] * y + m[4], m[1] * x + m[3] * y + m[5]
+
+
+def _scale_of(m):
+    return math.sqrt(abs(m[0] * m[3] - m[1] * m[2]))
+
+
+# ── Path data ──────────────────────────────────────────────
+def _path_segments(d):
+    """Absolute (cmd, [x, y, ...]) segments in local coordinates; arcs as (A, [rx, ry, rot, large, sweep, x, y])."""
+    tokens = _PATH_TOKEN_RE.findall(d or "")
+    segs = []
+    i, cmd = 0, None
+    x = y = sx = sy = 0.0
+
+    def nums(k):
+        nonlocal i
+        out = [float(t) for t in tokens[i:i + k]]
+        if len(out) < k or any(t.isalpha() for t in tokens[i:i + k]):
+            raise ValueError("truncated path")
+        i += k
+        return out
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            cmd = tokens[i]
+            i += 1
+            if cmd in "Zz":
+                segs.append(("Z", []))
+                x, y = sx, sy
+                continue
+        elif cmd is None:
+            break
+        rel = cmd.islower()
+        C = cmd.upper()
+        try:
+            if C in "ML":
+                px, py = nums(2)
+                x, y = (x + px, y + py) if rel else (px, py)
+                if C == "M":
+                    sx, sy = x, y
+                    segs.append(("M", [x, y]))
+                    cmd = "l" if rel else "L"   # implicit lineto after moveto
+                else:
+                    segs.append(("L", [x, y]))
+            elif C == "H":
+                (px,) = nums(1)
+                x = x + px if rel else px
+                segs.append(("L", [x, y]))
+            elif C == "V":
+                (py,) = nums(1)
+                y = y + py if rel else py
+                segs.append(("L", [x, y]))
+            elif C in "CSQT":
+                k = {"C": 6, "S": 4, "Q": 4, "T": 2}[C]
+                v = nums(k)
+                if rel:
+                    v = [v[j] + (x if j % 2 == 0 else y) for j in range(k)]
+                segs.append((C, v))
+                x, y = v[-2], v[-1]
+            elif C == "A":
+                rx, ry, rot = nums(3)
+                # Flags may be packed without separators ("a5 5 0 015 5")
+                flags = []
+                while len(flags) < 2:
+                    t = tokens[i]
+                    flags.append(float(t[0]))
+                    tokens[i] = t[1:]
+                    if not tokens[i]:
+                        i += 1
+                px, py = nums(2)
+                x, y = (x + px, y + py) if rel else (px, py)
+                segs.append(("A", [rx, ry, rot, *flags, x, y]))
+            else:
+                break
+        except (ValueError, IndexError):
+            break
+    return segs
+
+
+def _shape_segments(tag, a):
+    """Path segments for basic shapes, in local coordinates."""
+    def f(key):
+        m = _NUM_RE.match((a.get(key) or "0").strip())   # "12px" -> 12
+        return float(m.group(0)) if m else 0.0
+
+    if tag == "path":
+        return _path_segments(a.get("d"))
+    if tag == "rect":
+        x, y, w, h = f("x"), f("y"), f("width"), f("height")
+        return [("M", [x, y]), ("L", [x + w, y]), ("L", [x + w, y + h]), ("L", [x, y + h]), ("Z", [])]
+    if tag == "line":
+        return [("M", [f("x1"), f("y1")]), ("L", [f("x2"), f("y2")])]
+    if tag in ("polyline", "polygon"):
+        v = [float(n) for n in _NUM_RE.findall(a.get("points", ""))]
+        pts = list(zip(v[0::2], v[1::2]))
+        if not pts:
+            return []
+        segs = [("M", list(pts[0]))] + [("L", list(p)) for p in pts[1:]]
+        return segs + [("Z", [])] if tag == "polygon" else segs
+    if tag == "circle":
+        r = f("r")
+        return [("E", [f("cx"), f("cy"), r, r])]
+    if tag == "ellipse":
+        return [("E", [f("cx"), f("cy"), f("rx"), f("ry")])]
+    return []
+
+
+def _transform_segments(segs, m):
+    """Map segments through matrix m; lengths (radii) scale by sqrt|det|."""
+    s = _scale_of(m)
+    out = []
+    for cmd, v in segs:
+        if cmd == "A":
+            rx, ry, rot, large, sweep, x, y = v
+            out.append(("A", [rx * s, ry * s, rot, large, sweep, *_apply(m, x, y)]))
+        elif cmd == "E":
+            cx, cy, rx, ry = v
+            out.append(("E", [*_apply(m, cx, cy), rx * s, ry * s]))
+        else:
+            pts = []
+            for j in range(0, len(v), 2):
+                pts.extend(_apply(m, v[j], v[j + 1]))
+            out.append((cmd, pts))
+    return out
+
+
+# ── Canonical form ─────────────────────────────────────────
+def _local(tag):
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _viewbox_matrix(root_attrs):
+    """Map the viewBox (or width/height) onto the unit square, keeping aspect ratio."""
+    vb = [float(n) for n in _NUM_RE.findall(root_attrs.get("viewBox", ""))]
+    if len(vb) == 4 and vb[2] > 0 and vb[3] > 0:
+        minx, miny, w, h = vb
+    else:
+        w = float((_NUM_RE.findall(root_attrs.get("width", "")) or [0])[0])
+        h = float((_NUM_RE.findall(root_attrs.get("height", "")) or [0])[0])
+        if not (w > 0 and h > 0):
+            return None
+        minx = miny = 0.0
+    s = 1.0 / max(w, h)
+    return (s, 0, 0, s, -minx * s, -miny * s)
+
+
+def _fmt(n):
+    # Half-up on a 10^-PRECISION grid; the inner round() absorbs float noise from
+    # relative->absolute sums, so 0.4675 and 0.46749999999 land on the same step
+    q = math.floor(round(n * 10 ** PRECISION, 4) + 0.5)
+    return f"{q / 10 ** PRECISION:.{PRECISION}f}"
+
+
+def canonical_shapes(data):
+    """Sorted list of canonical shape strings for SVG bytes (streaming parse)."""
+    parser_kw = dict(events=("start", "end"), resolve_entities=False, no_network=True,
+                     huge_tree=False, remove_comments=True, recover=True)
+    stack = []          # transform matrix per open element
+    skip_depth = 0
+    base = None
+    shapes = []
+
+    for event, el in etree.iterparse(io.BytesIO(data), **parser_kw):
+        tag = _local(el.tag)
+        if event == "start":
+            if skip_depth or tag in SKIP_SUBTREES:
+                skip_depth += 1
+                continue
+            parent = stack[-1] if stack else None
+            if parent is None:
+                base = _viewbox_matrix(el.attrib) if tag == "svg" else None
+                parent = base or IDENTITY
+            m = _mul(parent, parse_transform(el.get("transform")))
+            stack.append(m)
+            if tag in SHAPES:
+                segs = _transform_segments(_shape_segments(tag, el.attrib), m)
+                if segs:
+                    shapes.append(segs)
+        else:
+            if skip_depth:
+                skip_depth -= 1
+            else:
+                stack.pop()
+            el.clear()   # streaming: drop what we've seen
+
+    if base is None and shapes:
+        # No viewBox/size: normalise by the drawing's own bounding box
+        xs = [v[j] for segs in shapes for c, v in segs if c not in ("A", "E") for j in range(0, len(v), 2)]
+        ys = [v[j] for segs in shapes for c, v in segs if c not in ("A", "E") for j in range(1, len(v), 2)]
+        if xs and ys:
+            span = max(max(xs) - min(xs), max(ys) - min(ys)) or 1.0
+            norm = (1 / span, 0, 0, 1 / span, -min(xs) / span, -min(ys) / span)
+            shapes = [_transform_segments(segs, norm) for segs in shapes]
+
+    out = []
+    for segs in shapes:
+        parts = []
+        for cmd, v in segs:
+            if cmd == "A":
+                rx, ry, rot, large, sweep, x, y = v
+                parts.append(f"A{_fmt(rx)},{_fmt(ry)},{rot % 360:.0f},{int(large)},{int(sweep)},{_fmt(x)},{_fmt(y)}")
+            else:
+                parts.append(cmd + ",".join(_fmt(n) for n in v))
+        out.append(" ".join(parts))
+    return sorted(out)
+
+
+def fingerprint(data):
+    """Hex fingerprint of an SVG's geometry, or None if it has none / isn't SVG."""
+    try:
+        shapes = canonical_shapes(data)
+    except etree.LxmlError:
+        return None
+    if not shapes:
+        return None
+    return hashlib.blake2b("\n".join(shapes).encode(), digest_size=16).hexdigest()
+
+
+# ── Index of known placeholders ────────────────────────────
+class FingerprintIndex:
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.labels = json.load(f)
+        except FileNotFoundError:
+            self.labels = {}
+
+    def lookup(self, data):
+        """(fingerprint, label or None)."""
+        fp = fingerprint(data)
+        return fp, self.labels.get(fp) if fp else None
+
+    def add(self, fp, label):
+        self.labels[fp] = label
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.labels, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    def seed(self, sources=PLACEHOLDER_SOURCES):
+        """Fingerprint every source whose label isn't indexed yet; returns the labels still missing."""
+        known = set(self.labels.values())
+        missing = []
+        for src, label in sources.items():
+            if label in known:
+                continue
+            try:
+                fp = fingerprint(read_source(src))
+            except Exception as e:
+                print(f"⚠️  Could not fetch {src}: {e}")
+                fp = None
+            if fp:
+                self.add(fp, label)
+                print(f"  📌 Seeded fingerprint {fp} ({label})")
+            else:
+                missing.append(label)
+        return missing
+
+
+def read_source(src):
+    if src.startswith("http"):
+        import requests
+        return requests.get(src, timeout=10, headers={"User-Agent": "Mozilla/5.0"}).content
+    with open(src, "rb") as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_show = sub.add_parser("show", help="Print fingerprint and canonical paths")
+    p_show.add_argument("sources", nargs="+")
+    p_add = sub.add_parser("add", help="Add an SVG to the placeholder index")
+    p_add.add_argument("source")
+    p_add.add_argument("--label", required=True)
+    sub.add_parser("seed", help="Fingerprint the known placeholder sources")
+    p_scan = sub.add_parser("scan", help="Check mirrored SVG logos against the index")
+    p_scan.add_argument("dir", nargs="?", default=MIRROR_DIR)
+    args = parser.parse_args()
+
+    index = FingerprintIndex()
+
+    if args.command == "show":
+        for src in args.sources:
+            data = read_source(src)
+            shapes = canonical_shapes(data)
+            fp, label = index.lookup(data)
+            print(f"{src}\n  fingerprint: {fp}  {'⚠️  ' + label if label else ''}\n  shapes: {len(shapes)}")
+            for s in shapes[:5]:
+                print(f"    {s[:100]}{'...' if len(s) > 100 else ''}")
+
+    elif args.command == "add":
+        fp = fingerprint(read_source(args.source))
+        if not fp:
+            print(f"❌ No SVG geometry in {args.source}")
+            sys.exit(1)
+        index.add(fp, args.label)
+        print(f"✅ {fp} → {args.label}")
+
+    elif args.command == "seed":
+        missing = index.seed()
+        if missing:
+            print(f"❌ Not seeded: {', '.join(missing)}")
+            sys.exit(1)
+        print(f"✅ {len(index.labels)} known placeholders")
+
+    elif args.command == "scan":
+        matches = checked = 0
+        for root, _, files in os.walk(args.dir):
+            for name in files:
+                if not name.endswith(".svg"):
+                    continue
+                checked += 1
+                with open(os.path.join(root, name), "rb") as f:
+                    fp, label = index.lookup(f.read())
+                if label:
+                    matches += 1
+                    print(f"🚨 {name}: {label}")
+        print(f"\n✅ Checked {checked} SVGs against {len(index.labels)} known placeholders, {matches} matches.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,288 @@
+import argparse
 import asyncio
-import json
+import hashlib
+import os
 import random
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse, urlunparse
+
+from card_parser import BACKENDS, parse_cards
+from crawl_state import CrawlState, slugify
+from tool_record import PRICING_LABELS, Tool, encode, iter_jsonl, save_tools, to_dict
 
 # 使用 There's An AI For That 作为替代源
 # 它的结构相对稳定，且反爬措施较少（Cloudflare 拦截较少）
 BASE_URL = "https://theresanaiforthat.com/"
 OUTPUT_FILE = "ai_tools_data.json"
+STREAM_FILE = "ai_tools_data.jsonl"
 MAX_SCROLLS = 10
 TOOLS_TO_SCRAPE = 50
+# 连续多少次滚动没有新卡片就认为 feed 已经到底
+MAX_STALE_SCROLLS = 8
+
+# 只序列化上次之后新加载的卡片，每张卡片只解析一次
+# TAAFT 的列表项通常是 ul.ai_tools > li，fallback 到 li.li
+NEW_CARDS_JS = """(start) => {
+    let cards = document.querySelectorAll('ul.ai_tools > li');
+    if (!cards.length) cards = document.querySelectorAll('li.li');
+    const html = [];
+    for (let i = start; i < cards.length; i++) html.push(cards[i].outerHTML);
+    return { total: cards.length, html: html.join('') };
+}"""
+
+
+def clean_url(url):
+    """Remove query params like ?ref=taaft"""
+    if not url:
+        return url
+    try:
+        parsed = urlparse(url)
+        url = urlunparse((parsed.scheme, parsed.netloc, parsed.path, '', '', ''))
+        return url.rstrip('/')
+    except:
+        return url
+
+
+def build_tool(card):
+    """Turn raw card fields (see card_parser) into a Tool."""
+    # 1. 标题 (Name)
+    name = card["name"]
+    if not name:
+        return None
+
+    # 2. 描述 (Description)
+    description = card["description"]
+
+    # 3. 链接 (URL) — 优先取 data-url
+    url = clean_url(card["url"])
+
+    # 4. Logo
+    logo = card["logo"]
+
+    # 5. 分类 (Category)
+    # 从 data-task 属性获取
+    category_raw = card["task"] or "Productivity"
+    tags = [category_raw]
+
+    category = category_raw # 后续 import 脚本会处理映射
+
+    # 6. Pricing & Features
+    pricing = "freemium"
+    price_detail = card["price_text"] # Save raw text as detail
+
+    if price_detail:
+        p_text = price_detail.lower()
+        if "free" in p_text and "paid" not in p_text:
+            pricing = "free"
+        elif "paid" in p_text:
+            pricing = "paid"
+
+    # Extract features from description or tags
+    # TAAFT doesn't have a clear features list on the card, so we'll infer some from tags/desc
+    features = []
+    if len(description) > 50:
+        # Split description by sentences and take first 3
+        sentences = description.split(". ")
+        features = [s.strip() + "." for s in sentences[:3] if len(s) > 10]
+
+    # 7. Screenshots
+    # Filled in after import by enrich_og.py (og:image of the tool homepage),
+    # so the crawl itself never has to visit every site
+    screenshots = []
+
+    # 8. Visits/Rating (模拟)
+    save_count = 0
+    # 尝试找 save count，如果找不到就随机生成一个看起来真实的数据
+    if card["saves_text"]:
+        try:
+            save_count = int(card["saves_text"].replace(",", ""))
+        except:
+            pass
+
+    if save_count == 0:
+         save_count = random.randint(10, 500)
+
+    visits = (save_count * 50) + random.randint(100, 5000)
+    return Tool(
+        id=card["slug"] or slugify(name),   # same fallback as tool_record.upgrade
+        name=name,
+        description=description,
+        url=url,
+        logo=logo,
+        category=category,
+        category_label=category_raw,
+        tags=tags[:3],
+        pricing=pricing,
+        pricing_label=PRICING_LABELS[pricing],
+        visits=f"{visits:,d}",
+        visits_count=visits,
+        rating=round(4.0 + (random.random() * 1.0), 1),
+        is_new=True,
+        is_trending=save_count > 100,
+        # New fields
+        features=features,
+        price_detail=price_detail,
+        screenshots=screenshots,
+    )
+
+
+class SeenUrls:
+    """URL set that keeps an 8-byte digest per URL instead of the string."""
+
+    def __init__(self):
+        self._hashes = set()
+
+    def add(self, url):
+        """Add url; returns False if it was already seen."""
+        h = int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big")
+        if h in self._hashes:
+            return False
+        self._hashes.add(h)
+        return True
+
+    def __len__(self):
+        return len(self._hashes)
+
+
+class ToolSink:
+    """
+    Builds, dedups and emits tools as card batches arrive.
+
+    stream=True appends one JSON object per line to STREAM_FILE as soon as a
+    card is parsed (resuming dedup from the existing file); otherwise tools
+    are kept in memory and dumped to OUTPUT_FILE once at the end.
+
+    With a crawl state (see crawl_state.py), tools another crawl or loader
+    already knows are skipped, so a full harvest only emits what's new. Emitted
+    tools are recorded into it once they are written out.
+    """
+
+    def __init__(self, stream, max_tools=None, state=None):
+        self.stream = stream
+        self.max_tools = max_tools
+        self.state = state
+        self.seen = SeenUrls()
+        self.count = 0
+        self.tools = []
+        self._f = None
+        if stream:
+            if os.path.exists(STREAM_FILE):
+                for tool in iter_jsonl(STREAM_FILE):
+                    self.seen.add(tool.url or tool.name)
+                print(f"📂 Resuming: {len(self.seen):,d} tools already in {STREAM_FILE}")
+            self._f = open(STREAM_FILE, "ab")
+
+    @property
+    def full(self):
+        return bool(self.max_tools) and self.count >= self.max_tools
+
+    def emit(self, cards):
+        emitted = []
+        for card in cards:
+            if self.full:
+                break
+
+            try:
+                tool = build_tool(card)
+                if not tool: continue
+                if not self.seen.add(tool.url or tool.name): continue
+                # Already known from another crawl/source (loaders record into the state)
+                if self.state and self.state.seen(slug=tool.id, url=tool.url): continue
+
+                if self._f:
+                    self._f.write(encode(tool) + b"\n")
+                else:
+                    self.tools.append(tool)
+                emitted.append(tool)
+                self.count += 1
+                print(f"✅ Scraped: {tool.name}")
+
+            except Exception as e:
+                print(f"❌ Error scraping card: {e}")
+                continue
+
+        if self._f:
+            self._f.flush()
+            self._record(emitted)
+
+    def _record(self, tools):
+        # Only after the tools are on disk, so the state never runs ahead of the output
+        if self.state is not None:   # an empty CrawlState is falsy (__len__)
+            self.state.record_many((t.id, t.url, "taaft-home", to_dict(t)) for t in tools)
+
+    def close(self):
+        if self._f:
+            self._f.close()
+            return STREAM_FILE
+        # 保存数据
+        save_tools(OUTPUT_FILE, self.tools)
+        self._record(self.tools)
+        return OUTPUT_FILE
+
+
+async def scrape_feed(page, url, sink, parse_batch, max_scrolls=None):
+    """Scroll one listing feed, handing each newly loaded batch of cards to the parser."""
+    print(f"🌍 Accessing {url}...")
+    try:
+        await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+    except Exception as e:
+        print(f"⚠️ Page load timeout or error: {e}")
+
+    print(f"Page Title: {await page.title()}")
+
+    # 滚动加载更多内容
+    print("📜 Scrolling to load more tools...")
+    seen_cards = 0
+    stale = 0
+    scrolls = 0
+    while not sink.full:
+        batch = await page.evaluate(NEW_CARDS_JS, seen_cards)
+        if batch["total"] > seen_cards:
+            seen_cards = batch["total"]
+            stale = 0
+            await parse_batch(f'<ul class="ai_tools">{batch["html"]}</ul>')
+        else:
+            stale += 1
+
+        if stale >= MAX_STALE_SCROLLS or (max_scrolls and scrolls >= max_scrolls):
+            break
+
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await page.wait_for_timeout(random.randint(1500, 3000))
+        scrolls += 1
+
+        # 尝试点击 "Load more" 按钮
+        try:
+            load_more = await page.query_selector(".load_more")
+            if load_more:
+                await load_more.click()
+                await page.wait_for_timeout(1000)
+        except:
+            pass
+
+    print(f"📦 {url}: {seen_cards:,d} cards after {scrolls} scrolls")
+
+
+async def scrape_taaft(backend="auto", use_worker=True, stream=False,
+                       feeds=None, max_tools=None, max_scrolls=None):
+    loop = asyncio.get_running_loop()
+    state = CrawlState() if stream else None
+    sink = ToolSink(stream, max_tools, state)
+    # 解析放到独立进程，浏览器滚动的同时解析已加载的卡片
+    pool = ProcessPoolExecutor(max_workers=1) if use_worker else None
+    pending = []
+
+    async def parse_batch(fragment):
+        if not pool:
+            sink.emit(parse_cards(fragment, backend))
+            return
+        pending.append(loop.run_in_executor(pool, parse_cards, fragment, backend))
+        # Emit finished batches in order without waiting on the one just queued
+        while pending and pending[0].done():
+            sink.emit(pending.pop(0).result())
+
+    from playwright.async_api import async_playwright
 
-async def scrape_taaft():
     async with async_playwright() as p:
         # 尝试使用 chromium 替代 firefox，因为 firefox 在某些沙箱环境下可能存在兼容性问题
         browser = await p.chromium.launch(headless=True)
@@ -21,186 +292,50 @@ async def scrape_taaft():
         )
         page = await context.new_page()
 
-        print(f"🌍 Accessing {BASE_URL}...")
-        try:
-            await page.goto(BASE_URL, timeout=60000, wait_until="domcontentloaded")
-        except Exception as e:
-            print(f"⚠️ Page load timeout or error: {e}")
-            
-        print(f"Page Title: {await page.title()}")
-
-        # 滚动加载更多内容
-        print("📜 Scrolling to load more tools...")
-        for i in range(MAX_SCROLLS):
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(random.randint(1500, 3000))
-            
-            # 尝试点击 "Load more" 按钮
-            try:
-                load_more = await page.query_selector(".load_more")
-                if load_more:
-                    await load_more.click()
-                    await page.wait_for_timeout(1000)
-            except:
-                pass
-
-        # 解析页面内容
-        content = await page.content()
-        soup = BeautifulSoup(content, "html.parser")
-        
-        # DEBUG: Print structure of first li
-        first_li = soup.select_one("li.li")
-        if first_li:
-            print("DEBUG: Structure of first li:")
-            print(first_li.prettify()[:1000])
-
-        tools_data = []
-        
-        # 定位工具卡片
-        # TAAFT 的列表项通常是 li.li，但有时候类名会变
-        # 尝试更宽泛的选择器：ul > li
-        tool_cards = soup.select("ul.ai_tools > li")
-        if not tool_cards:
-             tool_cards = soup.select("li.li") # fallback
-        
-        print(f"🔍 Found {len(tool_cards)} potential tool cards. Processing...")
-        
-        for card in tool_cards:
-            if len(tools_data) >= TOOLS_TO_SCRAPE:
+        for feed in feeds or [BASE_URL]:
+            await scrape_feed(page, feed, sink, parse_batch, max_scrolls)
+            # 等待 worker 解析完当前 feed 剩余批次
+            for fut in pending:
+                sink.emit(await fut)
+            pending.clear()
+            if sink.full:
                 break
-                
-            try:
-                # 1. 标题 (Name)
-                name_elem = card.select_one(".ai_link_wrap a span") # 根据 debug 信息调整
-                if not name_elem:
-                    name_elem = card.select_one(".ai_link_name")
-                
-                if not name_elem:
-                     # 再次尝试 data-name 属性
-                    name = card.get("data-name")
-                else:
-                    name = name_elem.get_text(strip=True)
-                
-                if not name: continue
-                
-                # 2. 描述 (Description)
-                desc_elem = card.select_one(".short_desc") # 根据 debug 信息调整
-                if not desc_elem:
-                    desc_elem = card.select_one("p")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                # 3. 链接 (URL)
-                # 优先取 data-url
-                url = card.get("data-url")
-                if not url:
-                    link_elem = card.select_one("a.ai_link")
-                    url = link_elem.get("href") if link_elem else ""
-                    if url and not url.startswith("http"):
-                        url = f"https://theresanaiforthat.com{url}"
-                
-                # Clean URL (remove query params like ?ref=taaft)
-                if url:
-                    try:
-                        from urllib.parse import urlparse, urlunparse
-                        parsed = urlparse(url)
-                        url = urlunparse((parsed.scheme, parsed.netloc, parsed.path, '', '', ''))
-                        url = url.rstrip('/')
-                    except:
-                        pass
-                    
-                # 4. Logo
-                logo = ""
-                img_elem = card.select_one("img.taaft_icon") # 根据 debug 信息调整
-                if not img_elem:
-                    img_elem = card.select_one("img.ai_img")
-                    
-                if img_elem:
-                    logo = img_elem.get("src") or img_elem.get("data-src")
-                    if logo and not logo.startswith("http"):
-                        logo = f"https://theresanaiforthat.com{logo}"
-                
-                # 5. 分类 (Category)
-                # 从 data-task 属性获取
-                category_raw = card.get("data-task") or "Productivity"
-                tags = [category_raw]
-                
-                category = category_raw # 后续 import 脚本会处理映射
-                
-                # 6. Pricing & Features
-                pricing_text = card.select_one(".price_span")
-                pricing = "freemium"
-                price_detail = ""
-                
-                if pricing_text:
-                    p_text = pricing_text.get_text(strip=True).lower()
-                    price_detail = pricing_text.get_text(strip=True) # Save raw text as detail
-                    if "free" in p_text and "paid" not in p_text:
-                        pricing = "free"
-                    elif "paid" in p_text:
-                        pricing = "paid"
-
-                # Extract features from description or tags
-                # TAAFT doesn't have a clear features list on the card, so we'll infer some from tags/desc
-                features = []
-                if len(description) > 50:
-                    # Split description by sentences and take first 3
-                    sentences = description.split(". ")
-                    features = [s.strip() + "." for s in sentences[:3] if len(s) > 10]
-                
-                # 7. Screenshots
-                # Try to visit the target URL to capture OpenGraph Image
-                screenshots = []
-                # To speed up, we don't visit every site in this demo version
-                # But here is the logic:
-                # 1. Visit tool['url']
-                # 2. Get meta[property="og:image"] content
-                # 3. Add to screenshots
-                
-                # 8. Visits/Rating (模拟)
-                save_count = 0
-                # 尝试找 save count，如果找不到就随机生成一个看起来真实的数据
-                save_elem = card.select_one(".save_count")
-                if save_elem:
-                    try:
-                        save_count = int(save_elem.get_text(strip=True).replace(",", ""))
-                    except:
-                        pass
-                
-                if save_count == 0:
-                     save_count = random.randint(10, 500)
-                
-                tool = {
-                    "name": name,
-                    "description": description,
-                    "url": url,
-                    "logo": logo,
-                    "category": category,
-                    "tags": tags[:3],
-                    "pricing": pricing,
-                    "visits": (save_count * 50) + random.randint(100, 5000),
-                    "rating": round(4.0 + (random.random() * 1.0), 1),
-                    "is_new": True,
-                    "is_trending": save_count > 100,
-                    # New fields
-                    "features": features,
-                    "price_detail": price_detail,
-                    "screenshots": screenshots
-                }
-                
-                tools_data.append(tool)
-                print(f"✅ Scraped: {name}")
-                
-            except Exception as e:
-                print(f"❌ Error scraping card: {e}")
-                continue
-        
+
         await browser.close()
-        
-        # 保存数据
-        with open(OUTPUT_FILE, "w") as f:
-            json.dump(tools_data, f, indent=2)
-            
-        print(f"\n🎉 Successfully scraped {len(tools_data)} tools. Saved to {OUTPUT_FILE}")
+
+    if pool:
+        pool.shutdown()
+
+    saved_to = sink.close()
+    if state:
+        state.close()
+    print(f"\n🎉 Successfully scraped {sink.count} tools. Saved to {saved_to}")
+
 
 if __name__ == "__main__":
-    asyncio.run(scrape_taaft())
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--parser", choices=("auto",) + BACKENDS, default="auto",
+                        help="HTML parser backend (auto = fastest installed)")
+    parser.add_argument("--no-worker", action="store_true",
+                        help="Parse inline instead of in a worker process")
+    parser.add_argument("--stream", action="store_true",
+                        help=f"Append tools to {STREAM_FILE} as they are parsed; no caps unless given")
+    parser.add_argument("--feed", action="append", default=None,
+                        help="Listing URL to harvest (repeatable), e.g. a /task/<slug>/ page")
+    parser.add_argument("--max-tools", type=int, default=None,
+                        help=f"Stop after N tools (0 = unlimited; default {TOOLS_TO_SCRAPE}, unlimited with --stream)")
+    parser.add_argument("--max-scrolls", type=int, default=None,
+                        help=f"Scrolls per feed (0 = until exhausted; default {MAX_SCROLLS}, unlimited with --stream)")
+    args = parser.parse_args()
+
+    max_tools = args.max_tools if args.max_tools is not None else (None if args.stream else TOOLS_TO_SCRAPE)
+    max_scrolls = args.max_scrolls if args.max_scrolls is not None else (None if args.stream else MAX_SCROLLS)
+
+    asyncio.run(scrape_taaft(
+        backend=args.parser,
+        use_worker=not args.no_worker,
+        stream=args.stream,
+        feeds=args.feed,
+        max_tools=max_tools or None,
+        max_scrolls=max_scrolls or None,
+    ))
@@ -0,0 +1,91 @@
+"""
+Keyset-paginated Supabase reader.
+
+`select(...).execute()` without a range stops at the PostgREST row cap
+(1000 by default). iter_table() walks the whole table instead, one page at
+a time ordered by a key (`id`, or `created_at` with `id` as tie-breaker),
+and fetches the next page on a background thread while the caller is still
+consuming the current one. Memory stays at ~2 pages whatever the table size.
+
+page_size must not exceed the server's max-rows setting: a short page is
+taken as the end of the table.
+
+Usage:
+  from table_reader import iter_table
+  for row in iter_table(supabase, "tools", "id, name, url"):
+      ...
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+PAGE_SIZE = 1000
+KEYS = ("id", "created_at")
+
+
+def _columns(columns, key):
+    """Make sure the keyset columns are selected."""
+    if columns.strip() == "*":
+        return columns
+    cols = [c.strip() for c in columns.split(",") if c.strip()]
+    for needed in (key, "id"):
+        if needed not in cols:
+            cols.append(needed)
+    return ",".join(cols)
+
+
+def _fetch_page(client, table, columns, key, page_size, after, filters=None):
+    query = client.table(table).select(columns)
+    if filters:
+        query = filters(query)
+    if after is not None:
+        if key == "id":
+            query = query.gt("id", after["id"])
+        else:
+            # created_at isn't unique: (created_at, id) > (last_created_at, last_id)
+            ts, last_id = after[key], after["id"]
+            query = query.or_(f'{key}.gt."{ts}",and({key}.eq."{ts}",id.gt.{last_id})')
+    if key != "id":
+        query = query.order(key)
+    query = query.order("id").limit(page_size)
+    return query.execute().data or []
+
+
+def iter_pages(client, table="tools", columns="*", key="id", page_size=PAGE_SIZE,
+               filters=None, prefetch=True):
+    """
+    Yield lists of rows, page by page, until the table is exhausted.
+
+    `filters` is an optional callable applied to each query builder, e.g.
+    `lambda q: q.eq("category", "video")`.
+    """
+    if key not in KEYS:
+        raise ValueError(f"key must be one of {KEYS}")
+    columns = _columns(columns, key)
+    fetch = partial(_fetch_page, client, table, columns, key, page_size, filters=filters)
+
+    if not prefetch:
+        after = None
+        while True:
+            page = fetch(after)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            after = page[-1]
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        page = fetch(None)
+        while page:
+            # Next request is in flight while the caller works on this page
+            nxt = pool.submit(fetch, page[-1]) if len(page) == page_size else None
+            yield page
+            page = nxt.result() if nxt else []
+
+
+def iter_table(client, table="tools", columns="*", key="id", page_size=PAGE_SIZE,
+               filters=None, prefetch=True):
+    """Yield every row of `table` (see iter_pages)."""
+    for page in iter_pages(client, table, columns, key, page_size, filters, prefetch):
+        yield from page
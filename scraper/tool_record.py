@@ -0,0 +1,268 @@
+"""
+Tool Record — the one schema for tool records, shared by every reader and writer.
+
+Records used to be plain dicts whose shape depended on the script that wrote
+them (`logo` vs `logo_url`, `visits` as "205,308" or 12345, pricing as
+"Free"/"Unknown"/"freemium", `id` vs `slug`). Tool is a msgspec Struct: files
+are decoded straight into typed records, and a record with a missing name, an
+unknown field or a wrongly typed value fails the decode with its position
+("$[812].pricing") instead of surfacing later as a KeyError or a bad row.
+
+Files keep their format: crawled_tools.json style arrays (indent=2, same
+bytes as json.dump(..., indent=2, ensure_ascii=False)) and JSONL streams.
+
+Usage:
+  from tool_record import Tool, load_tools, save_tools
+  tools = load_tools("crawled_tools.json")      # list[Tool], validated
+  save_tools("crawled_tools.json", tools)
+
+  python3 tool_record.py check FILE...         # validate
+  python3 tool_record.py upgrade FILE...       # rewrite legacy shapes in place
+  python3 tool_record.py bench FILE            # msgspec vs json.load + .get()
+
+Migrating legacy files is a separate step: `check` names the files that need
+it, `upgrade` rewrites them, and the result is committed on its own. Note
+that pricing values outside free/freemium/paid ("Unknown", "") become "free",
+the crawler's default, where they used to be loaded as "paid"; upgrade prints
+how many records each such value affected. Records also gain visits_count.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Literal, Optional, Union
+
+import msgspec
+from msgspec import UNSET, UnsetType
+
+from crawl_state import slugify
+from visits import parse_visits
+
+Pricing = Literal["free", "freemium", "paid"]
+PRICING_LABELS = {"free": "Free", "freemium": "Freemium", "paid": "Paid"}
+
+
+class Tool(msgspec.Struct, forbid_unknown_fields=True, gc=False):
+    id: str                                  # slug
+    name: str
+    description: str = ""
+    url: str = ""
+    category: str = "other"
+    category_label: str = "Other"
+    tags: list[str] = []
+    pricing: Pricing = "free"
+    pricing_label: str = "Free"
+    visits: str = "0"                        # as displayed, e.g. "205,308" or "10.5K"
+    visits_count: Optional[int] = None       # parsed from visits when missing
+    rating: float = 0.0
+    logo: str = ""
+    is_new: bool = False
+    is_trending: bool = False
+    launch_date: str = ""
+    # Optional fields, left out of the output when unset: homepage feed
+    # extras (taaft_scraper.py) and resolved destinations (resolve_urls.py)
+    features: Union[list[str], UnsetType] = UNSET
+    price_detail: Union[str, UnsetType] = UNSET
+    screenshots: Union[list[str], UnsetType] = UNSET
+    final_url: Union[str, None, UnsetType] = UNSET
+    final_domain: Union[str, None, UnsetType] = UNSET
+
+    def __post_init__(self):
+        if not self.id or not self.name:
+            raise ValueError("id and name must not be empty")
+        if self.visits_count is None:
+            self.visits_count = parse_visits(self.visits)
+
+
+class InvalidRecords(ValueError):
+    """A tool file that doesn't match the schema (message names the file and the record)."""
+
+
+_ARRAY = msgspec.json.Decoder(list[Tool])
+_ONE = msgspec.json.Decoder(Tool)
+_ENCODER = msgspec.json.Encoder()
+_SORTED_ENCODER = msgspec.json.Encoder(order="sorted")
+
+
+def normalize_pricing(text):
+    """
+    Free-form pricing ("Free", "Free Trial", "$9/mo") -> free | freemium | paid.
+    Nothing recognisable ("Unknown", "") gets the crawler's default, "free"
+    (scrape.py labels cards without a pricing tag the same way), never "paid".
+    """
+    p = (text or "").lower()
+    if "freemium" in p or "free trial" in p:
+        return "freemium"
+    if "paid" in p or "$" in p:
+        return "paid"
+    return "free"
+
+
+def upgrade(record):
+    """A legacy record dict (scraper.py, old taaft_scraper.py output) -> a dict in the Tool schema."""
+    r = {k: v for k, v in record.items() if v is not None}
+    logo_url = r.pop("logo_url", "")
+    r.setdefault("logo", logo_url)
+    slug = r.pop("slug", None)
+    r["id"] = r.get("id") or slug or slugify(r.get("name"))
+    if r.get("pricing") not in PRICING_LABELS:
+        r["pricing"] = normalize_pricing(r.get("pricing"))
+        r.pop("pricing_label", None)
+    r.setdefault("pricing_label", PRICING_LABELS[r["pricing"]])
+    if isinstance(r.get("visits"), (int, float)):
+        r["visits_count"] = int(r["visits"])
+        r["visits"] = f"{int(r['visits']):,d}"
+    return r
+
+
+# ── Decode ─────────────────────────────────────────────
+def decode_tools(data, source="<bytes>"):
+    """JSON array bytes -> list[Tool]."""
+    try:
+        return _ARRAY.decode(data)
+    except msgspec.ValidationError as e:
+        raise InvalidRecords(f"{source}: {e}") from None
+
+
+def iter_jsonl(path):
+    """Yield Tools from a JSONL file, one line at a time."""
+    with open(path, "rb") as f:
+        for n, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield _ONE.decode(line)
+                except msgspec.ValidationError as e:
+                    raise InvalidRecords(f"{path}:{n}: {e}") from None
+
+
+def load_tools(path):
+    """A JSON array or JSONL file -> list[Tool]."""
+    if path.endswith(".jsonl"):
+        return list(iter_jsonl(path))
+    with open(path, "rb") as f:
+        return decode_tools(f.read(), path)
+
+
+def load_records(path):
+    """load_tools() as plain dicts, for code shared with Supabase rows (--input modes)."""
+    return [to_dict(t) for t in load_tools(path)]
+
+
+def from_dict(record):
+    try:
+        return msgspec.convert(record, Tool)
+    except msgspec.ValidationError as e:
+        raise InvalidRecords(f"{record.get('id') or record.get('name')!r}: {e}") from None
+
+
+def to_dict(tool):
+    """Plain dict in field order (unset optional fields left out)."""
+    return msgspec.to_builtins(tool)
+
+
+# ── Encode ─────────────────────────────────────────────
+def encode(tool, sort_keys=False):
+    """One compact JSON line (bytes, no newline)."""
+    return (_SORTED_ENCODER if sort_keys else _ENCODER).encode(tool)
+
+
+def encode_pretty(obj):
+    """Indented JSON text, as json.dumps(obj, indent=2, ensure_ascii=False) writes it."""
+    return msgspec.json.format(_ENCODER.encode(obj), indent=2).decode("utf-8")
+
+
+def save_tools(path, tools):
+    """Write a list of Tools as a JSON array (or JSONL for *.jsonl), atomically."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        if path.endswith(".jsonl"):
+            for t in tools:
+                f.write(_ENCODER.encode(t) + b"\n")
+        else:
+            f.write(msgspec.json.format(_ENCODER.encode(tools), indent=2))
+    os.replace(tmp, path)
+
+
+# ── CLI ────────────────────────────────────────────────
+def _read_raw(path):
+    with open(path, "rb") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def cmd_check(paths):
+    bad = 0
+    for path in paths:
+        try:
+            tools = load_tools(path)
+            print(f"✅ {path}: {len(tools)} records")
+        except InvalidRecords as e:
+            bad += 1
+            print(f"❌ {e}")
+    if bad:
+        print("👉 Legacy files can be converted with: python3 tool_record.py upgrade FILE")
+    return 1 if bad else 0
+
+
+def cmd_upgrade(paths):
+    for path in paths:
+        raw = _read_raw(path)
+        remapped = Counter(r.get("pricing") for r in raw if r.get("pricing") not in PRICING_LABELS)
+        tools = [from_dict(upgrade(r)) for r in raw]
+        save_tools(path, tools)
+        print(f"✅ {path}: {len(tools)} records in the current schema")
+        for value, n in remapped.most_common():
+            print(f"   pricing {value!r} → {normalize_pricing(value)!r}: {n} records")
+    return 0
+
+
+def cmd_bench(path, rounds=5):
+    with open(path, "rb") as f:
+        data = f.read()
+
+    def baseline():
+        out = []
+        for t in json.loads(data):
+            out.append((t.get("id"), t.get("name"), t.get("url", ""), t.get("tags", []), t.get("pricing", "free"),
+                        t.get("visits", "0"), parse_visits(t.get("visits", "0")), t.get("logo", "")))
+        return out
+
+    timings = {}
+    for name, fn in (("json.load + .get()", baseline), ("msgspec Tool decode", lambda: decode_tools(data, path))):
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+        print(f"  {name:<22} {best * 1000:8.1f} ms")
+    a, b = timings.values()
+    print(f"⚡ {a / b:.1f}x faster, {len(data) / 1024:.0f} KB")
+    missing = data.count(b'"visits"') - data.count(b'"visits_count"')
+    if missing > 0:
+        print(f"   {missing} records have no visits_count and parse it while decoding; "
+              f"saving the file once stores it")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("check").add_argument("paths", nargs="+")
+    sub.add_parser("upgrade").add_argument("paths", nargs="+")
+    sub.add_parser("bench").add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        return cmd_check(args.paths)
+    if args.command == "upgrade":
+        return cmd_upgrade(args.paths)
+    return cmd_bench(args.path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Visits — turn the free-text `visits` field into the `visits_count` integer.
+
+Sources disagree on the format: the period crawl keeps the site's "10.5K" /
+"48k" / "1.2M" strings, the homepage scraper produces plain ints, the seeder
+invents "63k". Loaders store both: `visits` for display, `visits_count`
+(bigint, indexed) for sorting and range filters.
+
+Usage:
+  from visits import parse_visits
+  row["visits_count"] = parse_visits(row["visits"])   # "10.5K" -> 10500
+"""
+
+import re
+
+SUFFIXES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+# Suffix on the same line and not the start of a word ("2mo ago", "/month")
+_VISITS_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)[ \t]*([kmb](?![a-z]))?', re.I)
+
+
+def parse_visits(value):
+    """Integer visit count from an int or a string like "10.5K", "1,234", "2M+"; 0 if unparseable."""
+    if isinstance(value, bool) or value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return max(int(value), 0)
+
+    m = _VISITS_RE.search(str(value))
+    if not m:
+        return 0
+    number = float(m.group(1).replace(",", ""))
+    suffix = (m.group(2) or "").lower()
+    return int(round(number * SUFFIXES.get(suffix, 1)))
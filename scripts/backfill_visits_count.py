@@ -0,0 +1,65 @@
+"""
+Backfill tools.visits_count from the free-text visits column
+(migrations/add_visits_count.sql).
+
+Loaders set visits_count at ingest time; this is for rows loaded before the
+column existed. Rows are grouped by their parsed count, so each distinct
+value costs one `update ... where id in (...)` instead of one per row.
+
+Usage:
+  python3 scripts/backfill_visits_count.py            # update changed rows
+  python3 scripts/backfill_visits_count.py --dry-run  # only report
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper"))
+from supabase_client import get_supabase
+from table_reader import iter_table
+from visits import parse_visits
+
+# ids per `in` filter, keeps the request URL well under PostgREST limits
+ID_BATCH = 200
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    args = parser.parse_args()
+    supabase = get_supabase()
+
+    print("🔍 Scanning tools.visits...")
+    ids_by_count = defaultdict(list)
+    total = 0
+    try:
+        for row in iter_table(supabase, "tools", "id, visits, visits_count"):
+            total += 1
+            count = parse_visits(row["visits"])
+            if count != row["visits_count"]:
+                ids_by_count[count].append(row["id"])
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        print("👉 Run migrations/add_visits_count.sql in the Supabase SQL Editor first.")
+        exit(1)
+
+    changed = sum(len(ids) for ids in ids_by_count.values())
+    print(f"📊 {total} tools, {changed} need visits_count updated ({len(ids_by_count)} distinct values)")
+    if args.dry_run or not changed:
+        return
+
+    updated = 0
+    for count, ids in ids_by_count.items():
+        for i in range(0, len(ids), ID_BATCH):
+            batch = ids[i:i + ID_BATCH]
+            supabase.table("tools").update({"visits_count": count}).in_("id", batch).execute()
+            updated += len(batch)
+        print(f"   ✅ {updated}/{changed}", end="\r")
+
+    print(f"\n✅ Backfilled visits_count for {updated} tools.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Build tools.related_tool_ids from TF-IDF similarity (migrations/add_related_tools.sql).
+
+Offline job over the whole catalog:
+  1. vectorise name + tags + description into a sparse TF-IDF matrix
+     (name and tag tokens weighted up, rows L2-normalised)
+  2. cosine similarity = X @ X.T, computed a block of rows at a time so
+     memory stays at BLOCK_SIZE x N instead of N x N
+  3. keep the top-k neighbours per tool (argpartition, same-category bonus)
+  4. write changed rows back in bulk through the set_related_tools() RPC
+
+Usage:
+  python3 scripts/build_related_tools.py [--top-k 8] [--dry-run]
+  python3 scripts/build_related_tools.py --input scraper/crawled_tools.json   # offline check, no DB
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "scraper"))
+from supabase_client import get_supabase
+from table_reader import iter_table
+
+TOP_K = 8
+BLOCK_SIZE = 512
+MIN_SCORE = 0.08        # below this, neighbours are noise rather than related
+CATEGORY_BONUS = 0.05   # tie-breaker towards the same category, only for pairs that share terms
+NAME_WEIGHT = 2
+TAG_WEIGHT = 2
+MAX_DF = 0.3            # terms in more than 30% of tools ("tool", "generator") carry no signal
+BATCH_SIZE = 500
+
+STOPWORDS = set("""
+a an and are as at be by for from has have in into is it its of on or our that the
+their this to with without your you we can all any more most new best using use
+ai app co com io net org dev so gg
+""".split())
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+_NOISE_RE = re.compile(r'^v?\d+$')   # version numbers, years
+
+
+def _numeric():
+    """numpy and scipy.sparse, imported once the job runs so `--help` doesn't load them."""
+    try:
+        import numpy as np
+        import scipy.sparse as sp
+    except ImportError:
+        print("❌ numpy/scipy not installed. Run: pip install numpy scipy")
+        sys.exit(1)
+    return np, sp
+
+
+def tokens(tool):
+    """Weighted bag of terms for one tool; tags also count as whole-phrase terms."""
+    def words(text):
+        return [w for w in _TOKEN_RE.findall((text or "").lower())
+                if len(w) > 1 and w not in STOPWORDS and not _NOISE_RE.match(w)]
+
+    terms = words(tool.get("name")) * NAME_WEIGHT
+    for tag in tool.get("tags") or []:
+        terms += (words(tag) + ["tag:" + tag.lower().strip()]) * TAG_WEIGHT
+    terms += words(tool.get("description"))
+    return terms
+
+
+def tfidf_matrix(tools):
+    """CSR matrix (tools x terms), sublinear tf * smoothed idf, rows L2-normalised."""
+    np, sp = _numeric()
+    vocab = {}
+    indptr, indices, counts = [0], [], []
+    for tool in tools:
+        row = {}
+        for term in tokens(tool):
+            j = vocab.setdefault(term, len(vocab))
+            row[j] = row.get(j, 0) + 1
+        indices.extend(row.keys())
+        counts.extend(row.values())
+        indptr.append(len(indices))
+
+    X = sp.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(tools), len(vocab)),
+    )
+    n = X.shape[0]
+    df = np.bincount(X.indices, minlength=X.shape[1])
+    idf = np.log((1 + n) / (1 + df)).astype(np.float32) + 1
+    idf[(df < 2) | (df > MAX_DF * n)] = 0   # singletons can't link two tools
+
+    X.data = 1 + np.log(X.data)
+    X = X @ sp.diags(idf)
+    X.eliminate_zeros()
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sp.csr_matrix(sp.diags(1 / norms) @ X, dtype=np.float32)
+
+
+def top_k_neighbours(X, categories, k=TOP_K, block_size=BLOCK_SIZE, min_score=MIN_SCORE):
+    """For each row, up to k (index, score) pairs by cosine similarity, best first."""
+    np, _ = _numeric()
+    n = X.shape[0]
+    XT = X.T.tocsc()
+    _, cat_codes = np.unique(np.asarray(categories, dtype=object).astype(str), return_inverse=True)
+    k = min(k, n - 1)
+    result = []
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        S = (X[start:stop] @ XT).toarray()
+        S[np.arange(stop - start), np.arange(start, stop)] = 0           # not related to itself
+        S[(S > 0) & (cat_codes[start:stop, None] == cat_codes[None, :])] += CATEGORY_BONUS
+
+        top = np.argpartition(-S, k, axis=1)[:, :k] if k > 0 else np.empty((stop - start, 0), dtype=int)
+        for i, cols in enumerate(top):
+            scores = S[i, cols]
+            order = np.argsort(-scores)
+            result.append([(int(cols[j]), float(scores[j])) for j in order if scores[j] >= min_score])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE)
+    parser.add_argument("--dry-run", action="store_true", help="Compute and show samples, don't write")
+    parser.add_argument("--input", help="Read tools from a JSON file instead of Supabase (implies --dry-run)")
+    args = parser.parse_args()
+    _numeric()   # fail before fetching anything
+
+    if args.input:
+        from tool_record import load_records
+
+        tools = load_records(args.input)
+        supabase = None
+    else:
+        supabase = get_supabase()
+        tools = list(iter_table(supabase, "tools", "id, name, description, tags, category, related_tool_ids"))
+    print(f"📦 Loaded {len(tools)} tools")
+    if len(tools) < 2:
+        return
+
+    t0 = time.time()
+    X = tfidf_matrix(tools)
+    print(f"🧮 TF-IDF: {X.shape[0]} x {X.shape[1]} terms, {X.nnz} non-zeros ({time.time() - t0:.1f}s)")
+
+    t0 = time.time()
+    neighbours = top_k_neighbours(X, [t.get("category") for t in tools], args.top_k, args.block_size, args.min_score)
+    linked = sum(1 for nb in neighbours if nb)
+    print(f"🔗 Top-{args.top_k} neighbours for {linked}/{len(tools)} tools ({time.time() - t0:.1f}s)")
+
+    for i in range(0, len(tools), max(len(tools) // 5, 1)):
+        names = ", ".join(f"{tools[j]['name']} ({s:.2f})" for j, s in neighbours[i][:4])
+        print(f"   {tools[i]['name']}: {names or '-'}")
+
+    if args.dry_run or supabase is None:
+        return
+
+    payload = []
+    for tool, nb in zip(tools, neighbours):
+        related = [tools[j]["id"] for j, _ in nb]
+        if related != (tool.get("related_tool_ids") or []):
+            payload.append({"id": tool["id"], "related": related})
+    print(f"📝 {len(payload)} tools changed")
+
+    written = 0
+    for i in range(0, len(payload), BATCH_SIZE):
+        batch = payload[i:i + BATCH_SIZE]
+        try:
+            written += supabase.rpc("set_related_tools", {"payload": batch}).execute().data or 0
+            print(f"  ✅ Batch {i // BATCH_SIZE + 1}: {len(batch)} tools")
+        except Exception as e:
+            print(f"  ❌ Error in batch {i // BATCH_SIZE + 1}: {e}")
+            print("👉 Run migrations/add_related_tools.sql in the Supabase SQL Editor first.")
+            exit(1)
+
+    print(f"\n✅ Updated related tools for {written} tools.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,10 @@
 import os
+import sys
 from urllib.parse import urlparse, urlunparse
-from supabase import create_client, Client
-from dotenv import load_dotenv
 
-# Load env
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env.local"))
-
-SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-if not SUPABASE_URL or not SERVICE_KEY:
-    print("❌ Error: Missing Supabase credentials")
-    exit(1)
-
-supabase: Client = create_client(SUPABASE_URL, SERVICE_KEY)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper"))
+from supabase_client import get_supabase
+from table_reader import iter_table
 
 def clean_url(url):
     """Remove query parameters from URL"""
@@ -25,17 +16,14 @@ def clean_url(url):
 
 def main():
     print("🔍 Fetching tools with potential UTM parameters...")
+    supabase = get_supabase()
     
-    # Fetch all tools
-    # Note: In a large DB, we should paginate. For <1000 tools, this is fine.
-    response = supabase.table("tools").select("id, name, url").execute()
-    tools = response.data
+    # Stream all tools in keyset-paginated pages (works past the 1000-row cap)
+    tools = iter_table(supabase, "tools", "id, name, url")
     
     count = 0
     updated_count = 0
     
-    print(f"📦 Scanning {len(tools)} tools...")
-    
     for tool in tools:
         original_url = tool['url']
         if not original_url: continue
@@ -0,0 +1,65 @@
+"""
+Reconcile tools.favorite_count with the favorites table
+(migrations/add_favorite_count.sql).
+
+Triggers keep the column current; this command is for the initial backfill
+and for checking/repairing drift (e.g. after a restore with triggers
+disabled, or bulk edits made with session_replication_role = replica).
+
+Usage:
+  python3 scripts/reconcile_favorite_counts.py           # rebuild, then verify
+  python3 scripts/reconcile_favorite_counts.py --check   # verify only
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper"))
+from supabase_client import get_supabase
+from table_reader import iter_table
+
+
+def find_drift(supabase):
+    """Compare favorite_count with a full count of favorites; returns {tool_id: (stored, actual)}."""
+    actual = Counter(row["tool_id"] for row in iter_table(supabase, "favorites", "id, tool_id"))
+    return {
+        row["id"]: (row["favorite_count"], actual.get(row["id"], 0))
+        for row in iter_table(supabase, "tools", "id, favorite_count")
+        if row["favorite_count"] != actual.get(row["id"], 0)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true", help="Only report drift, don't rebuild")
+    args = parser.parse_args()
+    supabase = get_supabase()
+
+    if not args.check:
+        print("🔄 Rebuilding favorite counts...")
+        try:
+            fixed = supabase.rpc("refresh_favorite_counts").execute().data
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            print("👉 Run migrations/add_favorite_count.sql in the Supabase SQL Editor first.")
+            exit(1)
+        print(f"   Corrected {fixed} tools.")
+
+    print("🔍 Verifying against a full count of favorites...")
+    drift = find_drift(supabase)
+    if not drift:
+        print("✅ favorite_count matches the favorites table.")
+        return
+
+    for tool_id, (stored, actual) in sorted(drift.items())[:20]:
+        print(f"⚠️  {tool_id}: stored {stored}, actual {actual}")
+    if len(drift) > 20:
+        print(f"   ... and {len(drift) - 20} more")
+    print(f"\n❌ {len(drift)} tools drifted. Run without --check to rebuild.")
+    exit(1)
+
+
+if __name__ == "__main__":
+    main()
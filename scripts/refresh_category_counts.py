@@ -0,0 +1,65 @@
+"""
+Maintain the category_counts summary table
+(migrations/create_category_counts_table.sql).
+
+Triggers keep it current; this command is for the initial backfill and
+for checking/repairing drift (e.g. after restoring a backup with triggers
+disabled).
+
+Usage:
+  python3 scripts/refresh_category_counts.py           # rebuild, then verify
+  python3 scripts/refresh_category_counts.py --check   # verify only
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper"))
+from supabase_client import get_supabase
+from table_reader import iter_table
+
+
+def find_drift(supabase):
+    """Compare category_counts with a full count of tools; returns {category: (stored, actual)}."""
+    stored = {row["category"]: row["count"] for row in
+              supabase.table("category_counts").select("category, count").execute().data or []}
+    actual = Counter(row["category"] for row in iter_table(supabase, "tools", "id, category"))
+
+    return {
+        cat: (stored.get(cat, 0), actual.get(cat, 0))
+        for cat in set(stored) | set(actual)
+        if stored.get(cat, 0) != actual.get(cat, 0)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true", help="Only report drift, don't rebuild")
+    args = parser.parse_args()
+    supabase = get_supabase()
+
+    if not args.check:
+        print("🔄 Rebuilding category_counts...")
+        try:
+            supabase.rpc("refresh_category_counts").execute()
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            print("👉 Run migrations/create_category_counts_table.sql in the Supabase SQL Editor first.")
+            exit(1)
+
+    print("🔍 Verifying against a full count of tools...")
+    drift = find_drift(supabase)
+    if not drift:
+        print("✅ category_counts matches the tools table.")
+        return
+
+    for cat, (stored, actual) in sorted(drift.items()):
+        print(f"⚠️  {cat}: stored {stored}, actual {actual}")
+    print(f"\n❌ {len(drift)} categories drifted. Run without --check to rebuild.")
+    exit(1)
+
+
+if __name__ == "__main__":
+    main()
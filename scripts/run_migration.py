@@ -1,22 +1,12 @@
 import os
 import sys
-from supabase import create_client, Client
-from dotenv import load_dotenv
 
-# Load env
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env.local"))
-
-SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-if not SUPABASE_URL or not SERVICE_KEY:
-    print("❌ Error: Missing Supabase credentials")
-    exit(1)
-
-supabase: Client = create_client(SUPABASE_URL, SERVICE_KEY)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper"))
+from supabase_client import get_supabase
 
 def run_migration(sql_file_path):
     print(f"🚀 Running migration: {os.path.basename(sql_file_path)}...")
+    supabase = get_supabase()
     
     try:
         with open(sql_file_path, 'r') as f:
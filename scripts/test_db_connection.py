@@ -1,21 +1,12 @@
 import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import sys
 
-# Load env
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env.local"))
-
-SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-if not SUPABASE_URL or not SERVICE_KEY:
-    print("❌ Error: Missing Supabase credentials")
-    exit(1)
-
-supabase: Client = create_client(SUPABASE_URL, SERVICE_KEY)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper"))
+from supabase_client import get_supabase
 
 def test_connection():
     print("🔌 Testing database connection via 'exec_sql' RPC...")
+    supabase = get_supabase()
     
     # Try a simple query: Get database version
     test_sql = "SELECT version();"
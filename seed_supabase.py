@@ -3,34 +3,19 @@ PickAIHub — Supabase Data Seeder
 Seeds the Supabase 'tools' table from crawled_tools.json.
 
 Usage:
-  export SUPABASE_URL="https://your-project.supabase.co"
-  export SUPABASE_SERVICE_KEY="your-service-role-key"
+  # NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY from .env.local or the environment
   python seed_supabase.py
 """
 
-import json
 import os
 import sys
 import uuid
 import datetime
 
-try:
-    from supabase import create_client, Client
-except ImportError:
-    print("❌ supabase-py not installed. Run: pip install supabase")
-    sys.exit(1)
-
-# ── Config ──────────────────────────────────────────────
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Missing environment variables.")
-    print("   export SUPABASE_URL='https://xxx.supabase.co'")
-    print("   export SUPABASE_SERVICE_KEY='your-service-role-key'")
-    sys.exit(1)
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper"))
+from supabase_client import get_supabase
+from tool_record import InvalidRecords, PRICING_LABELS, Tool, load_tools
+from visits import parse_visits
 
 # ── Category mapping ───────────────────────────────────
 CATEGORIES_MAP = {
@@ -56,37 +41,30 @@ def map_category(tags: list[str]) -> str:
                 return cat
     return "other"
 
-def transform_tool(raw: dict) -> dict:
-    """Transform a crawled tool dict into a Supabase row."""
-    category = map_category(raw.get("tags", []))
+def transform_tool(tool: Tool) -> dict:
+    """Transform a crawled Tool into a Supabase row."""
+    category = map_category(tool.tags)
 
-    pricing = raw.get("pricing", "free").lower()
-    if "free" in pricing and "paid" not in pricing:
-        pricing_val, pricing_label = "free", "Free"
-    elif "freemium" in pricing:
-        pricing_val, pricing_label = "freemium", "Freemium"
-    else:
-        pricing_val, pricing_label = "paid", "Paid"
-
-    name = raw["name"]
+    name = tool.name
     visits = f"{len(name) * 3 + 20}k"
     rating = round(4.0 + (len(name) % 10) / 10.0, 1)
 
     return {
         "id": str(uuid.uuid4()),
         "name": name,
-        "description": raw.get("description", ""),
-        "url": raw.get("url", ""),
+        "description": tool.description,
+        "url": tool.url,
         "category": category,
         "category_label": category.capitalize() if category != "3d" else "3D",
-        "tags": raw.get("tags", []),
-        "pricing": pricing_val,
-        "pricing_label": pricing_label,
+        "tags": tool.tags,
+        "pricing": tool.pricing,
+        "pricing_label": PRICING_LABELS[tool.pricing],
         "visits": visits,
+        "visits_count": parse_visits(visits),
         "rating": rating,
-        "logo": raw.get("logo_url", ""),
-        "is_new": len(raw.get("tags", [])) > 0,
-        "is_trending": len(raw.get("description", "")) > 50,
+        "logo": tool.logo,
+        "is_new": len(tool.tags) > 0,
+        "is_trending": len(tool.description) > 50,
         "launch_date": str(datetime.date.today()),
     }
 
@@ -97,12 +75,16 @@ def main():
         print(f"❌ {data_file} not found in current directory.")
         sys.exit(1)
 
-    with open(data_file, "r", encoding="utf-8") as f:
-        raw_tools = json.load(f)
+    try:
+        tools = load_tools(data_file)
+    except InvalidRecords as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
-    print(f"📦 Loaded {len(raw_tools)} tools from {data_file}")
+    print(f"📦 Loaded {len(tools)} tools from {data_file}")
 
-    rows = [transform_tool(t) for t in raw_tools]
+    rows = [transform_tool(t) for t in tools]
+    supabase = get_supabase()
 
     # Upsert in batches of 50
     BATCH_SIZE = 50
@@ -1,26 +1,29 @@
 import { NextResponse } from "next/server";
 import { getTools } from "@/lib/queries";
+import { encodeCursor, SortType } from "@/lib/cursor";
 
 export async function GET(request: Request) {
   const { searchParams } = new URL(request.url);
-  const page = parseInt(searchParams.get("page") || "1");
   const limit = parseInt(searchParams.get("limit") || "20");
   const search = searchParams.get("q") || "";
   const category = searchParams.get("category") || "all";
-  const sort = (searchParams.get("sort") as "recommended" | "newest" | "popular") || "recommended";
+  const sort = (searchParams.get("sort") as SortType) || "recommended";
+  // Opaque keyset cursor from the previous page's nextCursor (absent = first page)
+  const cursor = searchParams.get("cursor") || undefined;
 
   const tools = await getTools(
     {
       category,
       search,
       sort,
+      cursor,
     },
-    page,
     limit
   );
 
+  const hasMore = tools.length === limit && tools.length > 0;
   return NextResponse.json({
     data: tools,
-    nextPage: tools.length === limit ? page + 1 : null,
+    nextCursor: hasMore ? encodeCursor(sort, tools[tools.length - 1]) : null,
   });
 }
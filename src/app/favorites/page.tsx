@@ -3,7 +3,7 @@ import { redirect } from "next/navigation";
 import Header from "@/components/Header";
 import Footer from "@/components/Footer";
 import ToolList from "@/components/ToolList";
-import { Tool } from "@/lib/types";
+import { Tool, TOOL_COLUMNS } from "@/lib/types";
 
 export const dynamic = "force-dynamic";
 
@@ -20,7 +20,7 @@ export default async function FavoritesPage() {
 
   const { data: favorites, error } = await supabase
     .from("favorites")
-    .select("tool_id, tools(*)")
+    .select(`tool_id, tools(${TOOL_COLUMNS})`)
     .eq("user_id", user.id)
     .order("created_at", { ascending: false });
 
@@ -4,6 +4,7 @@ import Footer from "@/components/Footer";
 import ToolCard from "@/components/ToolCard";
 import ToolActions from "@/components/ToolActions";
 import { getTool, getRelatedTools } from "@/lib/queries";
+import { hasLogo, logoSrc } from "@/lib/logo";
 import { notFound } from "next/navigation";
 import Link from "next/link";
 import Image from "next/image";
@@ -22,7 +23,7 @@ export default async function ToolPage({ params }: ToolPageProps) {
     notFound();
   }
 
-  const relatedTools = await getRelatedTools(tool.category, tool.id, 4);
+  const relatedTools = await getRelatedTools(tool, 4);
 
   // Pricing color map
   const pricingColor: Record<string, string> = {
@@ -55,9 +56,9 @@ export default async function ToolPage({ params }: ToolPageProps) {
             {/* Hero Section */}
             <div className="mb-8 flex flex-col gap-6 sm:flex-row sm:items-start">
               <div className="relative flex h-20 w-20 shrink-0 items-center justify-center rounded-2xl bg-gradient-to-br from-white/10 to-white/5 shadow-inner border border-white/5 overflow-hidden">
-                {tool.logo && tool.logo.startsWith("http") ? (
+                {hasLogo(tool.logo) ? (
                   <Image 
-                    src={tool.logo} 
+                    src={logoSrc(tool.logo, 80)} 
                     alt={tool.name} 
                     fill
                     sizes="80px"
@@ -1,6 +1,7 @@
 "use client";
 
 import { useToolSearch } from "@/hooks/useToolSearch";
+import { encodeCursor } from "@/lib/cursor";
 
 // ... existing imports
 
@@ -30,11 +31,19 @@ export default function HomeClient({
   } = useInfiniteQuery<ToolsResponse>({
     queryKey: ["tools", activeSearch, activeCategory],
     queryFn: fetchTools,
-    initialPageParam: 1,
-    getNextPageParam: (lastPage) => lastPage.nextPage,
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
     initialData: {
-      pages: [{ data: initialTools, nextPage: initialTools.length === 20 ? 2 : null }],
-      pageParams: [1],
+      pages: [
+        {
+          data: initialTools,
+          nextCursor:
+            initialTools.length === 20
+              ? encodeCursor("recommended", initialTools[initialTools.length - 1])
+              : null,
+        },
+      ],
+      pageParams: [null],
     },
     staleTime: 1000 * 60 * 5, // 5 mins
   });
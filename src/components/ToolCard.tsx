@@ -1,6 +1,7 @@
 "use client";
 
 import { Tool } from "@/lib/types";
+import { hasLogo, logoSrc } from "@/lib/logo";
 import Link from "next/link";
 import Image from "next/image";
 import { Heart, Sparkles, ExternalLink, Flame, Star } from "lucide-react";
@@ -88,10 +89,10 @@ export default function ToolCard({ tool }: ToolCardProps) {
         ) : (
           /* Fallback: Gradient or blurred logo */
           <div className="absolute inset-0 flex items-center justify-center bg-gradient-to-br from-violet-900/20 via-[#0a0a12] to-[#0a0a12]">
-             {tool.logo && tool.logo.startsWith("http") ? (
+             {hasLogo(tool.logo) ? (
                <>
                 <Image
-                  src={tool.logo}
+                  src={logoSrc(tool.logo, 48)}
                   alt={tool.name}
                   fill
                   className="object-cover opacity-20 blur-xl scale-150"
@@ -111,9 +112,9 @@ export default function ToolCard({ tool }: ToolCardProps) {
         {/* Floating Logo (Bottom Left of Hero) */}
         <div className="absolute bottom-4 left-4 z-10">
           <div className="relative flex h-12 w-12 items-center justify-center rounded-xl bg-[#12121f] border border-white/10 shadow-lg overflow-hidden">
-             {tool.logo && tool.logo.startsWith("http") ? (
+             {hasLogo(tool.logo) ? (
               <Image 
-                src={tool.logo} 
+                src={logoSrc(tool.logo, 48)} 
                 alt={tool.name} 
                 fill
                 sizes="48px"
@@ -150,8 +151,7 @@ export default function ToolCard({ tool }: ToolCardProps) {
              {tool.is_trending && (
                 <div className="flex shrink-0 items-center gap-1 rounded-full bg-orange-500/10 px-2 py-0.5 text-[10px] font-bold text-orange-400 ring-1 ring-orange-500/20">
                   <Flame className="h-3 w-3 fill-orange-400" />
-                  {/* Mock logic for visits display */}
-                  <span>{(parseInt(tool.visits?.replace(/,/g, '') || '0') / 1000).toFixed(1)}k</span>
+                  <span>{((tool.visits_count || 0) / 1000).toFixed(1)}k</span>
                 </div>
               )}
           </div>
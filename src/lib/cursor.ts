@@ -0,0 +1,53 @@
+import { Tool } from "./types";
+
+export type SortType = "recommended" | "newest" | "popular";
+type CursorMode = SortType | "search";
+
+/**
+ * Sort tuple per listing mode, all descending with id as tie-breaker.
+ * Must match tools_sort_keys() (migrations/create_list_tools.sql, last updated
+ * by migrations/add_favorite_count.sql).
+ */
+export const SORT_KEYS: Record<CursorMode, (keyof Tool)[]> = {
+  recommended: ["is_trending", "rating", "id"],
+  newest: ["launch_date", "id"],
+  popular: ["favorite_count", "visits_count", "id"],
+  search: ["search_rank", "id"],
+};
+
+type CursorKeys = Partial<Record<keyof Tool, unknown>>;
+
+/**
+ * Opaque cursor for the page after `tool`: the sort tuple of the last row
+ * the client saw, base64url-encoded. Ranked search results always use the
+ * search tuple, whatever `sort` was requested.
+ */
+export function encodeCursor(sort: SortType, tool: Tool): string {
+  const mode: CursorMode = tool.search_rank !== undefined ? "search" : sort;
+  const k: CursorKeys = {};
+  for (const key of SORT_KEYS[mode]) {
+    k[key] = tool[key] ?? null;
+  }
+  return btoa(JSON.stringify({ s: mode, k }))
+    .replace(/\+/g, "-")
+    .replace(/\//g, "_")
+    .replace(/=+$/, "");
+}
+
+/**
+ * Decode a cursor for `mode`. Returns null for missing or malformed cursors
+ * and for cursors issued under a different sort (the list restarts).
+ */
+export function decodeCursor(
+  cursor: string | null | undefined,
+  mode: CursorMode
+): CursorKeys | null {
+  if (!cursor) return null;
+  try {
+    const json = atob(cursor.replace(/-/g, "+").replace(/_/g, "/"));
+    const { s, k } = JSON.parse(json);
+    return s === mode && k && typeof k === "object" ? k : null;
+  } catch {
+    return null;
+  }
+}
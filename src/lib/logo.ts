@@ -0,0 +1,28 @@
+/**
+ * Logo URLs.
+ * Logos are either third-party URLs (not mirrored yet) or URLs into the
+ * self-hosted WebP mirror written by scraper/logo_mirror.py (the public
+ * `logos` Storage bucket; older rows may still hold /logos/ paths):
+ *   .../logos/<h[:2]>/<h>-<size>.webp   (square, one file per size)
+ * SVG logos are never mirrored and stay third-party URLs.
+ */
+
+// Keep in sync with SIZES in scraper/logo_mirror.py
+export const LOGO_SIZES = [96, 160];
+
+const MIRRORED_RE = /^(.*\/logos\/[0-9a-f]{2}\/[0-9a-f]+)-\d+\.webp$/;
+
+export function hasLogo(logo?: string | null): logo is string {
+  return !!logo && (logo.startsWith("http") || logo.startsWith("/logos/"));
+}
+
+/**
+ * Best source for a logo displayed at `px` CSS pixels: the smallest mirrored
+ * variant covering 2x density, or the URL unchanged if it isn't a variant.
+ */
+export function logoSrc(logo: string, px: number): string {
+  const m = logo.match(MIRRORED_RE);
+  if (!m) return logo;
+  const size = LOGO_SIZES.find((s) => s >= px * 2) ?? LOGO_SIZES[LOGO_SIZES.length - 1];
+  return `${m[1]}-${size}.webp`;
+}
@@ -1,29 +1,87 @@
 import { createClient } from "./supabase/server";
 import { supabase as supabaseClient } from "./supabase";
-import { Tool, CategoryCount } from "./types";
+import { Tool, CategoryCount, TOOL_COLUMNS } from "./types";
+import { SORT_KEYS, SortType, decodeCursor } from "./cursor";
 
 /**
- * Fetch tools with optional filtering and sorting.
+ * PostgREST `or` filter selecting rows strictly after `k` in the descending
+ * sort tuple `keys`: k1 < v1, or (k1 = v1 and k2 < v2), ...
+ * Used only by the fallback path; list_tools() compares the row directly.
+ */
+function keysetFilter(keys: string[], k: Record<string, unknown>): string {
+  const value = (key: string) => JSON.stringify(k[key]);
+  return keys
+    .map((key, i) => {
+      const eqs = keys.slice(0, i).map((prev) => `${prev}.eq.${value(prev)}`);
+      const lt = `${key}.lt.${value(key)}`;
+      return eqs.length ? `and(${[...eqs, lt].join(",")})` : lt;
+    })
+    .join(",");
+}
+
+/**
+ * Fetch one page of tools with optional filtering and sorting.
  * Runs server-side in Next.js Server Components.
+ *
+ * Pages are keyset-paginated: pass encodeCursor(sort, lastTool) from the
+ * previous page as `cursor` to continue after it. Page N costs the same as
+ * page 1 and rows inserted mid-scroll are never skipped or repeated.
  */
 export async function getTools(
   options?: {
     category?: string;
     search?: string;
-    sort?: "recommended" | "newest" | "popular";
+    sort?: SortType;
+    cursor?: string;
   },
-  page = 1,
   pageSize = 20
 ): Promise<Tool[]> {
   const supabase = await createClient();
-  let query = supabase.from("tools").select("*");
+  const sort = options?.sort || "recommended";
+
+  // Search: ranked full-text RPC backed by a GIN index (results sorted by relevance)
+  if (options?.search) {
+    const after = decodeCursor(options.cursor, "search");
+    const { data, error } = await supabase.rpc("search_tools", {
+      q: options.search,
+      category: options.category || null,
+      result_limit: pageSize,
+      cursor: after ? `${after.search_rank}|${after.id}` : null,
+    });
+
+    if (!error && data) {
+      return data as Tool[];
+    }
+
+    console.warn(
+      "Optimization warning: 'search_tools' RPC function not found or failed. Falling back to ilike search. Please run migrations/create_search_tools.sql in your Supabase SQL Editor."
+    );
+  } else {
+    // Listing: row-comparison keyset RPC served by the composite sort indexes
+    const { data, error } = await supabase.rpc("list_tools", {
+      sort,
+      category: options?.category || null,
+      result_limit: pageSize,
+      cursor: decodeCursor(options?.cursor, sort),
+    });
+
+    if (!error && data) {
+      return data as Tool[];
+    }
+
+    console.warn(
+      "Optimization warning: 'list_tools' RPC function not found or failed. Falling back to the PostgREST keyset query. Please run migrations/create_list_tools.sql in your Supabase SQL Editor."
+    );
+  }
+
+  let query = supabase.from("tools").select(TOOL_COLUMNS);
 
   // Category filter
   if (options?.category && options.category !== "all") {
     query = query.eq("category", options.category);
   }
 
-  // Search filter (name or description)
+  // Search filter (name or description) — fallback when search_tools is missing
   if (options?.search) {
     // Sanitize search input to prevent PostgREST syntax injection
     // Remove special characters that have meaning in PostgREST URL syntax
@@ -33,25 +91,18 @@ export async function getTools(
     );
   }
 
-  // Sorting
-  const sort = options?.sort || "recommended";
-  if (sort === "newest") {
-    query = query.order("launch_date", { ascending: false });
-  } else if (sort === "popular") {
-    query = query.order("rating", { ascending: false });
-  } else {
-    // recommended: trending first, then by rating
-    query = query
-      .order("is_trending", { ascending: false })
-      .order("rating", { ascending: false });
+  // Sorting: full sort tuple, so the order is total and the cursor is exact
+  // (ilike fallback results carry no search_rank and page by `sort` too)
+  const keys = SORT_KEYS[sort] as string[];
+  const after = decodeCursor(options?.cursor, sort);
+  if (after) {
+    query = query.or(keysetFilter(keys, after));
+  }
+  for (const key of keys) {
+    query = query.order(key, { ascending: false });
   }
 
-  // Pagination
-  const from = (page - 1) * pageSize;
-  const to = from + pageSize - 1;
-  query = query.range(from, to);
-
-  const { data, error } = await query;
+  const { data, error } = await query.limit(pageSize);
 
   if (error) {
     console.error("Error fetching tools:", error);
@@ -71,7 +122,7 @@ export async function getTool(idOrName: string): Promise<Tool | null> {
   // 1. Check if it's a valid UUID
   const isUuid = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i.test(idOrName);
 
-  let query = supabase.from("tools").select("*");
+  let query = supabase.from("tools").select(TOOL_COLUMNS);
 
   if (isUuid) {
     query = query.eq("id", idOrName);
@@ -102,7 +153,7 @@ export async function getFeaturedTools(limit = 3): Promise<Tool[]> {
   const supabase = await createClient();
   const { data, error } = await supabase
     .from("tools")
-    .select("*")
+    .select(TOOL_COLUMNS)
     .eq("is_trending", true)
     .order("rating", { ascending: false })
     .limit(limit);
@@ -116,19 +167,33 @@ export async function getFeaturedTools(limit = 3): Promise<Tool[]> {
 }
 
 /**
- * Fetch related tools (same category, excluding current tool).
+ * Fetch related tools.
+ * Uses the TF-IDF neighbours precomputed by scripts/build_related_tools.py
+ * (one primary-key lookup); tools the job hasn't covered yet fall back to
+ * the top-rated tools in the same category.
  */
-export async function getRelatedTools(
-  category: string,
-  excludeId: string,
-  limit = 3
-): Promise<Tool[]> {
+export async function getRelatedTools(tool: Tool, limit = 3): Promise<Tool[]> {
   const supabase = await createClient();
+  const relatedIds = (tool.related_tool_ids || []).slice(0, limit);
+
+  if (relatedIds.length) {
+    const { data, error } = await supabase
+      .from("tools")
+      .select(TOOL_COLUMNS)
+      .in("id", relatedIds);
+
+    if (!error && data && data.length) {
+      // Keep the job's similarity order (the `in` filter doesn't)
+      const byId = new Map((data as Tool[]).map((t) => [t.id, t]));
+      return relatedIds.map((id) => byId.get(id)).filter((t): t is Tool => !!t);
+    }
+  }
+
   const { data, error } = await supabase
     .from("tools")
-    .select("*")
-    .eq("category", category)
-    .neq("id", excludeId)
+    .select(TOOL_COLUMNS)
+    .eq("category", tool.category)
+    .neq("id", tool.id)
     .order("rating", { ascending: false })
     .limit(limit);
 
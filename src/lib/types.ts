@@ -9,6 +9,8 @@ export interface Tool {
   pricing: "free" | "paid" | "freemium";
   pricing_label: string;
   visits: string;
+  visits_count: number;
+  favorite_count: number;
   rating: number;
   logo: string;
   is_new: boolean;
@@ -24,8 +26,24 @@ export interface Tool {
     linkedin?: string;
     github?: string;
   };
+  // Precomputed by scripts/build_related_tools.py, most similar first
+  related_tool_ids?: string[];
+  // Where url ends up after redirects (scraper/resolve_urls.py)
+  final_url?: string | null;
+  final_domain?: string | null;
+  // Present on search_tools() results
+  search_rank?: number;
 }
 
+/**
+ * Columns of Tool, for `select()`. Explicit rather than "*": the tools table
+ * also holds internal columns (search_vector, logo_source) clients never use.
+ */
+export const TOOL_COLUMNS =
+  "id, name, description, url, category, category_label, tags, pricing, pricing_label, " +
+  "visits, visits_count, favorite_count, rating, logo, is_new, is_trending, launch_date, " +
+  "screenshots, features, price_detail, social_links, related_tool_ids, final_url, final_domain";
+
 export interface CategoryCount {
   category: string;
   count: number;
@@ -2,6 +2,18 @@
 -- Run this in the Supabase SQL Editor (Dashboard → SQL Editor → New Query)
 
 -- 1. Create the tools table
+-- Full-text search document (migrations/create_search_tools.sql)
+create or replace function tools_search_document(name text, description text, tags text[])
+returns tsvector
+language sql
+immutable
+parallel safe
+as $$
+  select setweight(to_tsvector('english', coalesce(name, '')), 'A')
+      || setweight(to_tsvector('english', coalesce(array_to_string(tags, ' '), '')), 'B')
+      || setweight(to_tsvector('english', coalesce(description, '')), 'C');
+$$;
+
 create table if not exists tools (
   id             uuid primary key default gen_random_uuid(),
   name           text not null,
@@ -13,19 +25,41 @@ create table if not exists tools (
   pricing        text not null default 'free' check (pricing in ('free','paid','freemium')),
   pricing_label  text not null default 'Free',
   visits         text not null default '0',
+  visits_count   bigint not null default 0,
   rating         real not null default 0,
+  -- Kept in step with favorites by triggers (migrations/add_favorite_count.sql)
+  favorite_count integer not null default 0,
   logo           text not null default '',
+  -- Original remote logo URL once the logo is mirrored (migrations/add_logo_mirror.sql)
+  logo_source    text,
+  -- Detail page (supabase/migrations/20240315_add_details.sql)
+  screenshots    text[] default '{}',
+  features       text[] default '{}',
+  price_detail   text,
+  social_links   jsonb default '{}'::jsonb,
+  -- Precomputed by scripts/build_related_tools.py (migrations/add_related_tools.sql)
+  related_tool_ids uuid[] not null default '{}',
+  final_url      text,
+  final_domain   text,
   is_new         boolean not null default true,
   is_trending    boolean not null default false,
   launch_date    date not null default current_date,
-  created_at     timestamptz not null default now()
+  created_at     timestamptz not null default now(),
+  -- Internal to search_tools(); list_tools() and the app never return it
+  search_vector  tsvector generated always as (tools_search_document(name, description, tags)) stored
 );
 
 -- 2. Create indexes for common queries
+create extension if not exists pg_trgm;
 create index if not exists idx_tools_category on tools(category);
 create index if not exists idx_tools_is_trending on tools(is_trending);
 create index if not exists idx_tools_launch_date on tools(launch_date desc);
+create index if not exists idx_tools_visits_count on tools(visits_count, id);
+create index if not exists idx_tools_favorite_count on tools(favorite_count, visits_count, id);
+create index if not exists idx_tools_category_favorite_count on tools(category, favorite_count, visits_count, id);
+create index if not exists idx_tools_final_domain on tools(final_domain);
 create index if not exists idx_tools_name on tools using gin (name gin_trgm_ops);
+create index if not exists idx_tools_search on tools using gin (search_vector);
 
 -- 3. Enable Row-Level Security
 alter table tools enable row level security;